@@ -1,79 +1,96 @@
+import time
+_INICIO_SCRIPT = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
-from transformers import pipeline
-from coleta import coletar_tweets
+from datetime import date, timedelta
 from preprocessamento import limpar_texto
 
-# Importações de DB, Gráficos e Utilidades
-from db_connector import get_db_connection, fetch_resumo_tecnico, insert_analysis_summary, fetch_analysis_history
-import mysql.connector
-from datetime import datetime
-import re 
-import numpy as np 
-import plotly.express as px
-
-# --- Configurações Iniciais ---
-# Inicializa o modelo (BERTimbau)
-@st.cache_resource
-def load_analyser():
-    # Carrega o pipeline de análise de sentimentos
-    return pipeline("sentiment-analysis", model="neuralmind/bert-base-portuguese-cased")
-
-analisador = load_analyser()
-
+# Importações de DB e Utilidades. transformers/torch, plotly e os módulos que dependem de
+# numpy/sklearn (coleta, cascata, classificadores, aspectos, embeddings, pontuação) são
+# importados sob demanda, nas seções que os usam
+from db_connector import get_db_connection, fetch_resumo_tecnico, insert_analysis_summary, insert_processed_tweets
+from cache_dados import (
+    carregar_historico, invalidar_historico, get_latest_analysis, montar_grafico_distribuicao,
+    carregar_matriz_comparacao, invalidar_comparacao, montar_grafico_comparacao,
+    carregar_versoes_classificadores, carregar_concordancia, invalidar_classificadores,
+    carregar_aspectos, carregar_tabela_aspectos, invalidar_aspectos, montar_grafico_aspectos
+)
+from config import COMPARACAO_JANELA_DIAS
+from classificador import CarregadorModelo
+from cliente_inferencia import ClienteInferencia, BackendLocal
+from metricas import registrar_metrica
+
+_TEMPO_IMPORTS_MS = (time.perf_counter() - _INICIO_SCRIPT) * 1000
+
+# st.set_page_config precisa ser o primeiro comando Streamlit da página
 st.set_page_config(layout="wide")
 st.title("Dashboard de Análise de Sentimentos - Automóveis 🚗")
 
-# --- Conexão DB (Simplificada para Streamlit) ---
-conn = get_db_connection()
+# --- Configurações Iniciais ---
+@st.cache_data(ttl=30, show_spinner=False)
+def servico_inferencia_disponivel():
+    # Verificado a cada 30s: subir ou derrubar o serviço não exige reiniciar o dashboard
+    return ClienteInferencia().disponivel()
+
+@st.cache_resource(show_spinner=False)
+def load_analyser(usar_servico):
+    # Com o serviço de inferência no ar, o modelo não é carregado neste processo; sem ele,
+    # o BERTimbau é carregado em segundo plano, sem bloquear a primeira renderização
+    if usar_servico:
+        return ClienteInferencia()
+    return BackendLocal(CarregadorModelo().iniciar())
+
+usar_servico = servico_inferencia_disponivel()
+backend = load_analyser(usar_servico)
+
+@st.cache_resource(show_spinner=False)
+def registrar_classificadores(usar_servico):
+    # Registro de classificadores; o BERTimbau vem do mesmo backend da análise
+    from classificadores import listar_classificadores
+    return listar_classificadores(backend=load_analyser(usar_servico))
+
+@st.cache_resource(show_spinner=False)
+def criar_estagio_cascata():
+    # Primeiro estágio da cascata (Naive Bayes salvo, ou o léxico se o modelo não existir)
+    from cascata import criar_estagio
+    return criar_estagio()
+
+@st.cache_resource(show_spinner=False)
+def carregar_extrator_aspectos():
+    # Léxico de aspectos compilado uma única vez por processo
+    from aspectos import ExtratorAspectos
+    return ExtratorAspectos()
+
+@st.cache_resource(show_spinner=False)
+def abrir_embeddings():
+    # Armazenamento de embeddings mapeado em memória (compartilhado entre sessões); o índice
+    # IVF é relido quando o arquivo muda, então treiná-lo não exige reiniciar o dashboard
+    from embeddings import EmbeddingStore
+    return EmbeddingStore()
 
 # --- Funções Auxiliares ---
-def analisar_sentimento_e_rotular(texto_limpo):
-    """
-    Função que usa o BERTimbau para classificar, garantindo o mapeamento correto 
-    dos rótulos do modelo para POSITIVO, NEGATIVO e NEUTRO, e aplicando um
-    reforço heurístico para combater o viés negativo/neutro.
-    """
-    if not texto_limpo or len(texto_limpo.split()) < 3:
-        # Mantém neutro para textos vazios/curtos, onde a análise é inviável
-        return 'NEUTRO', 0.5 
-
-    # Classificação do BERTimbau
-    resultado_bert = analisador(texto_limpo)[0]
-    
-    label_bert = resultado_bert['label'].upper()
-    score_bert = resultado_bert['score']
-    
-    # --- Mapeamento Explícito de Rótulos ---
-    # LABEL_2 é o rótulo positivo no BERTimbau para 3 classes
-    if label_bert in ('LABEL_2', 'POSITIVE'):
-        sentimento_padrao = 'POSITIVO'
-    
-    # LABEL_0 é o rótulo negativo
-    elif label_bert in ('LABEL_0', 'NEGATIVE'):
-        sentimento_padrao = 'NEGATIVO'
-    
-    # LABEL_1 é o rótulo neutro, e o fallback
-    else: 
-        sentimento_padrao = 'NEUTRO'
-
-    # --- HEURÍSTICA DE REFORÇO POSITIVO (Para combater o viés negativo do BERTimbau) ---
-    positive_boost_words = [
-        'excelente', 'ótimo', 'perfeito', 'sensacional', 'maravilhoso', 
-        'lindo', 'confortável', 'recomendo', 'adorei', 'top', 'melhor',
-        'sempre', 'incrível', 'funciona'
-    ]
-    
-    # Se o modelo classificou como NEUTRO ou NEGATIVO, mas a mensagem contém palavras de forte elogio, 
-    # forçamos a classificação para POSITIVO.
-    if sentimento_padrao in ('NEUTRO', 'NEGATIVO'):
-        # Verifica se alguma palavra de reforço está presente no texto (case-insensitive)
-        if any(word in texto_limpo.lower() for word in positive_boost_words):
-            sentimento_padrao = 'POSITIVO'
-            # Atribui um score alto para refletir o reforço manual
-            score_bert = 0.9 
-
-    return sentimento_padrao, score_bert
+@st.experimental_fragment(run_every=2)
+def indicador_modelo():
+    """Mostra o estado de carregamento do BERTimbau, atualizando até o modelo ficar pronto."""
+    if isinstance(backend, ClienteInferencia):
+        if backend.pronto():
+            st.caption(f"🟢 Serviço de inferência pronto ({backend.url})")
+        else:
+            st.caption(f"⏳ Serviço de inferência carregando o modelo ({backend.url})...")
+        return
+
+    carregador = backend.carregador
+    if carregador.pronto():
+        st.caption("🟢 Modelo BERTimbau pronto")
+        if not getattr(carregador, 'metrica_registrada', False):
+            # A carga ocorre uma vez por processo, então registra uma única vez
+            registrar_metrica('carga_modelo', carregador.tempo_carga * 1000)
+            carregador.metrica_registrada = True
+    elif carregador.falhou():
+        st.caption(f"🔴 Falha ao carregar o modelo: {carregador.erro}")
+    else:
+        st.caption("⏳ Carregando modelo BERTimbau em segundo plano...")
 
 def get_top_topics(df, sentiment, n=3):
     """Extrai os N principais tópicos (palavras) para um sentimento específico."""
@@ -99,8 +116,8 @@ def get_top_topics(df, sentiment, n=3):
         return "Dados insuficientes para tópicos."
 
     feature_array = vectorizer.get_feature_names_out()
-    # Usa np.argsort para ordenar de forma eficiente
-    tfidf_sorting = np.argsort(-(tfidf_matrix.sum(axis=0).A1))
+    # Ordena os termos pelo peso TF-IDF somado (argsort do próprio array, sem importar numpy)
+    tfidf_sorting = (-tfidf_matrix.sum(axis=0).A1).argsort()
     
     top_n_indices = tfidf_sorting[:n]
     top_terms = [feature_array[i] for i in top_n_indices] 
@@ -110,57 +127,42 @@ def get_top_topics(df, sentiment, n=3):
         
     return " e ".join(top_terms)
 
-def get_latest_analysis(df, modelo):
-    """
-    Filtra o DataFrame de histórico (já com colunas minúsculas) 
-    para obter a análise mais recente de um modelo.
-    """
-    
-    # O DataFrame 'df' já deve vir com colunas minúsculas
-    col_modelo = 'modelo'
-    col_data = 'data_geracao'
-    col_resumo = 'resumo_sentimentos'
-    col_recomendacao = 'recomendacao'
-    
-    if df.empty:
-        return None
-
-    # Filtragem e Ordenação pelo mais recente
-    # Usamos .str.upper() no filtro para garantir que 'hb20' e 'HB20' sejam tratados como o mesmo modelo
-    df_filtered = df[df[col_modelo].str.upper() == modelo.upper()].sort_values(by=col_data, ascending=False)
-    
-    if df_filtered.empty:
-        return None
-        
-    latest = df_filtered.iloc[0]
-    
-    recomendacao_text = latest[col_recomendacao]
-    
-    # Regex para extrair os percentuais (garantido pelo formato 'Distribuição: POSITIVO: X.X%, NEGATIVO: Y.Y%, ...')
-    pos_match = re.search(r'POSITIVO:\s*([\d.]+)', recomendacao_text)
-    neg_match = re.search(r'NEGATIVO:\s*([\d.]+)', recomendacao_text)
-    neu_match = re.search(r'NEUTRO:\s*([\d.]+)', recomendacao_text)
-    
-    return {
-        'Modelo': latest[col_modelo], # Retorna a capitalização exata salva
-        'Síntese': latest[col_resumo].replace('\n', ' ').strip(),
-        'Distribuição': latest[col_recomendacao].replace('\n', ' ').strip(),
-        'Data': latest[col_data].strftime("%d/%m/%Y %H:%M"),
-        # Usa 0.0 se não encontrar a correspondência (evitando erros)
-        'Positivo': float(pos_match.group(1)) if pos_match else 0.0,
-        'Negativo': float(neg_match.group(1)) if neg_match else 0.0,
-        'Neutro': float(neu_match.group(1)) if neu_match else 0.0,
-    }
-
-
 # --- Layout do Dashboard ---
 
 # Entrada do usuário para análise
 modelo_input = st.sidebar.text_input("Modelo para Análise (ex: Onix 2020):", "HB20") 
 limite_tweets = st.sidebar.slider("Limite de Tweets", 50, 500, 500) # Valor padrão ajustado para 500 para testes
 
+with st.sidebar:
+    indicador_modelo()
+
+# Fonte dos sentimentos usados na comparação: o resultado gravado na análise ou uma versão
+# de classificador já pontuada (trocar de classificador não exige nova inferência)
+versoes_classificadores = carregar_versoes_classificadores()
+opcoes_classificador = [(None, None)] + list(versoes_classificadores[['classificador', 'versao']].itertuples(index=False, name=None))
+classificador_resultados, versao_resultados = st.sidebar.selectbox(
+    "Classificador dos resultados",
+    opcoes_classificador,
+    format_func=lambda opcao: "Padrão (gravado na análise)" if opcao[0] is None else f"{opcao[0]} ({opcao[1]})",
+)
+
+# Modo cascata: primeiro estágio barato e BERTimbau apenas para os textos de baixa confiança
+modo_cascata = st.sidebar.toggle("Modo cascata (BERTimbau só quando houver dúvida)")
+if modo_cascata:
+    limiar_cascata = st.sidebar.slider("Limiar de confiança da cascata", 0.0, 1.0, criar_estagio_cascata().limiar_padrao, 0.05)
+
 if st.sidebar.button("⚙️ INICIAR NOVA ANÁLISE"):
+    # --- Conexão DB (aberta apenas quando há escrita; a leitura vem do cache) ---
+    conn = get_db_connection()
     if conn:
+        from coleta import coletar_tweets, datas_para_gravar
+        from aspectos import contar_aspectos
+        from classificadores import CLASSIFICADOR_PADRAO, VERSAO_BERTIMBAU
+        from retencao import criar_particoes_futuras
+
+        # Meses à frente precisam de partição própria antes de receberem tweets (ver retencao.py)
+        criar_particoes_futuras(conn)
+
         FALLBACK_MODE = False 
         
         with st.spinner(f"🔎 Coletando e analisando {limite_tweets} tweets para: {modelo_input}..."):
@@ -173,7 +175,11 @@ if st.sidebar.button("⚙️ INICIAR NOVA ANÁLISE"):
 
             
             # --- 1. Tratamento de Coleta Vazia (FALLBACK) ---
-            if df_raw.empty:
+            if not df_raw.empty and df_raw['demonstracao'].any():
+                # Arquivo de demonstração ou simulação: a análise é exibida, mas nada é gravado por tweet
+                st.info(f"Não há itens coletados para **'{modelo_input}'**; a análise usa dados de demonstração, que não são gravados nos resultados por tweet.")
+                FALLBACK_MODE = True
+            elif df_raw.empty:
                 st.warning(f"A coleta de dados para **'{modelo_input}'** retornou 0 tweets. Gerando dados de **FALLBACK** para simulação de sentimentos. Tente aumentar o limite de tweets.")
                 FALLBACK_MODE = True
                 
@@ -198,9 +204,83 @@ if st.sidebar.button("⚙️ INICIAR NOVA ANÁLISE"):
         
         # 2.1. Pré-processamento e Sentimento
         df_raw['clean'] = df_raw['content'].apply(limpar_texto)
-        df_raw[['sentimento_human', 'score']] = df_raw['clean'].apply(
-            lambda x: pd.Series(analisar_sentimento_e_rotular(x))
-        )
+
+        if modo_cascata:
+            import numpy as np
+            from cascata import ClassificadorCascata
+
+            cascata = ClassificadorCascata(criar_estagio_cascata(), backend, limiar_cascata, versao_bert=VERSAO_BERTIMBAU)
+            classificador_usado, versao_usada = cascata.nome, cascata.versao
+
+            # O modelo só é aguardado se algum texto for escalado para o BERTimbau
+            with st.spinner("🔀 Classificando em cascata..."):
+                inicio_classificacao = time.perf_counter()
+                resultados, com_vetor, vetores_escalados = cascata.classificar_com_detalhes(df_raw['clean'].tolist())
+                tempo_classificacao = time.perf_counter() - inicio_classificacao
+
+            # Apenas os textos escalados têm embedding
+            vetores = np.zeros((len(df_raw), vetores_escalados.shape[1] if vetores_escalados is not None else 0), dtype=np.float32)
+            if vetores_escalados is not None:
+                vetores[com_vetor] = vetores_escalados
+            st.caption(
+                f"Cascata ({cascata.estagio.nome}, limiar {cascata.limiar:g}): {com_vetor.mean() * 100:.1f}% escalados para o BERTimbau, "
+                f"{len(df_raw) / max(tempo_classificacao, 1e-9):.0f} tweets/s."
+            )
+        else:
+            classificador_usado, versao_usada = CLASSIFICADOR_PADRAO, VERSAO_BERTIMBAU
+
+            # Classificação em lote: a mesma passada pelo BERTimbau gera os embeddings dos tweets
+            # (aguarda a carga do modelo, caso ainda não tenha terminado)
+            with st.spinner("⏳ Classificando com o BERTimbau..."):
+                resultados, vetores = backend.classificar_lote(df_raw['clean'].tolist())
+            com_vetor = (df_raw['clean'] != '').to_numpy()
+
+        df_raw['sentimento_human'] = [sentimento for sentimento, _ in resultados]
+        df_raw['score'] = [score for _, score in resultados]
+
+        # 2.1.1. Armazena os resultados por tweet e os embeddings (dados simulados não entram)
+        if not FALLBACK_MODE:
+            # Datas como datetime sem fuso (NaT vira NULL) e usuários ausentes como NULL
+            if 'date' in df_raw:
+                datas = datas_para_gravar(df_raw['date'])
+            else:
+                datas = [None] * len(df_raw)
+            usuarios = [str(u) if pd.notna(u) else None for u in df_raw['user']] if 'user' in df_raw else [None] * len(df_raw)
+            registros = [
+                (modelo_input, data, usuario, linha['content'],
+                 linha['clean'], linha['sentimento_human'], float(linha['score']))
+                for data, usuario, (_, linha) in zip(datas, usuarios, df_raw.iterrows())
+            ]
+            # Menções a aspectos dos tweets de fato inseridos (os já gravados são ignorados),
+            # somadas aos agregados na mesma transação da inserção
+            extrator_aspectos = carregar_extrator_aspectos()
+            inseridos = insert_processed_tweets(
+                conn, registros, classificador=classificador_usado, versao=versao_usada,
+                agregar_aspectos=lambda novos: contar_aspectos(
+                    extrator_aspectos,
+                    [(modelo, data, texto_limpo, sentimento) for modelo, data, _, _, texto_limpo, sentimento, _ in novos]
+                ),
+            )
+            if inseridos is not None:
+                st.caption(f"{inseridos} tweets novos gravados ({len(registros) - inseridos} já estavam no banco).")
+            if inseridos:
+                # A matriz de comparação, as versões de classificadores e os aspectos passam a incluir os novos tweets
+                invalidar_classificadores()
+                invalidar_aspectos()
+
+            metadados = [
+                {
+                    'modelo': modelo_input,
+                    'texto': linha['content'],
+                    'data': str(linha.get('date', '')),
+                    'usuario': str(linha.get('user', '')),
+                    'sentimento': linha['sentimento_human'],
+                    'score': float(linha['score']),
+                }
+                for _, linha in df_raw[com_vetor].iterrows()
+            ]
+            if metadados:
+                abrir_embeddings().adicionar(vetores[com_vetor], metadados)
         
         # 2.2. Geração de Insights e Tópicos
         pos_topics = get_top_topics(df_raw, 'POSITIVO')
@@ -232,7 +312,11 @@ if st.sidebar.button("⚙️ INICIAR NOVA ANÁLISE"):
         resumo_limpo = resumo_sent_texto.replace('\n', ' ').strip()
 
         # 3.2. Salvar Resumo Final
-        insert_analysis_summary(conn, modelo=modelo_input, resumo=sintese_limpa, recomendacao=resumo_limpo)
+        if insert_analysis_summary(conn, modelo=modelo_input, resumo=sintese_limpa, recomendacao=resumo_limpo):
+            # O histórico (e a matriz, que usa as últimas análises) ficaram desatualizados
+            invalidar_historico()
+            invalidar_comparacao()
+        conn.close()
         
         # 3.3. Feedback ao Usuário
         if FALLBACK_MODE:
@@ -245,51 +329,25 @@ if st.sidebar.button("⚙️ INICIAR NOVA ANÁLISE"):
 
 st.header("1. Última Análise Gerada")
 
-# 1. Buscar Histórico
-history_df = fetch_analysis_history(conn)
-
-# --- Padroniza os nomes das colunas para minúsculas para evitar KeyErrors ---
-if not history_df.empty:
-    history_df.columns = [c.lower() for c in history_df.columns]
-
+# 1. Buscar Histórico (em cache, com as últimas análises por modelo já resolvidas)
+latest_analysis = None
+dados_historico = carregar_historico()
+history_df = dados_historico['historico']
 
 if history_df.empty:
     st.info("Nenhuma análise encontrada no histórico. Clique em 'INICIAR NOVA ANÁLISE' na barra lateral.")
 else:
     # Tenta obter a análise mais recente do modelo selecionado pelo usuário
-    latest_analysis = get_latest_analysis(history_df, modelo_input)
+    latest_analysis = get_latest_analysis(dados_historico, modelo_input)
 
     if latest_analysis:
         st.subheader(f"Resultado da Última Análise para {latest_analysis['Modelo']} ({latest_analysis['Data']})")
 
         # --- Gráfico de Distribuição ---
         st.write("#### Distribuição de Sentimentos na Rede Social")
-        
-        data_plot = {
-            'Sentimento': ['POSITIVO', 'NEUTRO', 'NEGATIVO'],
-            'Percentual': [latest_analysis['Positivo'], latest_analysis['Neutro'], latest_analysis['Negativo']]
-        }
-        df_plot = pd.DataFrame(data_plot)
-        
-        color_map = {
-            'POSITIVO': '#10B981',  
-            'NEGATIVO': '#EF4444', 
-            'NEUTRO': '#6B7280'     
-        }
-        
-        fig = px.bar(
-            df_plot,
-            x='Sentimento',
-            y='Percentual',
-            title='Distribuição de Sentimentos (em %)',
-            color='Sentimento', 
-            color_discrete_map=color_map, 
-            text_auto='.1f' 
-        )
-        
-        fig.update_xaxes(categoryorder='array', categoryarray=['POSITIVO', 'NEUTRO', 'NEGATIVO'])
-        
-        st.plotly_chart(fig, use_container_width=True)
+        # O gráfico é preenchido ao final do script, depois que histórico e comparação
+        # já foram exibidos (o import do plotly fica fora do caminho da primeira renderização)
+        grafico_slot = st.empty()
         
         # --- Síntese Integrada ---
         st.write("#### Síntese Integrada de Mercado e Sentimentos")
@@ -309,39 +367,183 @@ if not history_df.empty:
 # --- Seção Comparativo (DINÂMICO) ---
 st.header("3. Comparação de Modelos Selecionados")
 
-if not history_df.empty:
-    
-    # 1. Identifica os modelos únicos na ordem de análise mais recente (necessita da coluna 'modelo' em minúsculo)
-    distinct_models = history_df['modelo'].unique()
-    
-    # 2. Pega os dois modelos distintos mais recentes
-    if len(distinct_models) < 2:
-        st.warning("Execute a análise para pelo menos dois modelos diferentes para exibir a comparação.")
+periodo_comparacao = st.radio(
+    "Período da comparação", ["Todo o período", f"Últimos {COMPARACAO_JANELA_DIAS} dias"], horizontal=True
+)
+desde_comparacao = None if periodo_comparacao == "Todo o período" else date.today() - timedelta(days=COMPARACAO_JANELA_DIAS)
+
+# Matriz de todos os modelos, montada a partir dos agregados (em cache); a seleção só filtra
+matriz_comparacao = carregar_matriz_comparacao(classificador_resultados, versao_resultados, desde_comparacao)
+grafico_comparacao_slot = None
+
+if len(matriz_comparacao) < 2:
+    st.warning("Execute a análise para pelo menos dois modelos diferentes para exibir a comparação.")
+else:
+    # Por padrão, os dois modelos analisados mais recentemente
+    padrao = [m.upper() for m in dados_historico['modelos'] if m.upper() in matriz_comparacao.index][:2]
+    modelos_selecionados = st.multiselect(
+        "Modelos para comparar:",
+        options=list(matriz_comparacao.index),
+        default=padrao or list(matriz_comparacao.index[:2]),
+    )
+
+    if modelos_selecionados:
+        matriz_selecionada = matriz_comparacao.loc[modelos_selecionados]
+        st.dataframe(matriz_selecionada, column_config={
+            "Tweets": st.column_config.NumberColumn(format="%d"),
+            "Positivo (%)": st.column_config.NumberColumn(format="%.1f"),
+            "Neutro (%)": st.column_config.NumberColumn(format="%.1f"),
+            "Negativo (%)": st.column_config.NumberColumn(format="%.1f"),
+            "Índice Líquido (pp)": st.column_config.NumberColumn(format="%+.1f"),
+            "Δ Índice (pp)": st.column_config.NumberColumn(
+                format="%+.1f", help=f"Variação do índice líquido nos últimos {COMPARACAO_JANELA_DIAS} dias em relação ao período anterior."
+            ),
+        }, use_container_width=True)
+        # Preenchido ao final do script, assim como o gráfico da seção 1
+        grafico_comparacao_slot = st.empty()
     else:
-        # Pega os dois primeiros modelos mais recentes do array de distintos
-        modelo_a = distinct_models[0]
-        modelo_b = distinct_models[1]
+        st.info("Selecione ao menos um modelo para comparar.")
 
-        # Busca a análise mais recente para cada um
-        analysis_a = get_latest_analysis(history_df, modelo_a)
-        analysis_b = get_latest_analysis(history_df, modelo_b)
-        
-        # Só exibe se ambos tiverem dados válidos
-        if analysis_a and analysis_b:
-            col_a, col_b = st.columns(2)
-            
-            with col_a:
-                st.markdown(f"**Modelo: {analysis_a['Modelo']}**")
-                st.markdown(f"**Última Análise:** {analysis_a['Data']}")
-                st.info(analysis_a['Distribuição'])
-                st.markdown(f"**Síntese de Sentimentos:**")
-                st.caption(analysis_a['Síntese'])
-
-            with col_b:
-                st.markdown(f"**Modelo: {analysis_b['Modelo']}**")
-                st.markdown(f"**Última Análise:** {analysis_b['Data']}")
-                st.info(analysis_b['Distribuição'])
-                st.markdown(f"**Síntese de Sentimentos:**")
-                st.caption(analysis_b['Síntese'])
+
+# --- Seção Aspectos (lida apenas dos agregados por modelo/aspecto/sentimento/dia) ---
+st.header("4. Aspectos Mencionados por Modelo")
+
+col_modelo_aspectos, col_periodo = st.columns(2)
+periodo_aspectos = col_periodo.radio(
+    "Período", ["Todo o período", f"Últimos {COMPARACAO_JANELA_DIAS} dias"], horizontal=True
+)
+desde_aspectos = None if periodo_aspectos == "Todo o período" else date.today() - timedelta(days=COMPARACAO_JANELA_DIAS)
+modelos_aspectos = sorted(carregar_aspectos(desde_aspectos)['modelo'].unique())
+grafico_aspectos_slot = None
+
+if not modelos_aspectos:
+    st.info("Nenhuma menção a aspectos registrada para o período. Execute uma nova análise.")
+else:
+    modelo_aspectos = col_modelo_aspectos.selectbox(
+        "Modelo",
+        modelos_aspectos,
+        index=modelos_aspectos.index(modelo_input.upper()) if modelo_input.upper() in modelos_aspectos else 0,
+    )
+    tabela_aspectos = carregar_tabela_aspectos(modelo_aspectos, desde_aspectos)
+
+    reclamados = tabela_aspectos[tabela_aspectos['Negativo'] > 0].sort_values('Negativo', ascending=False).index[:3]
+    if len(reclamados):
+        st.markdown(f"**Mais reclamados no {modelo_aspectos}:** {', '.join(reclamados)}")
+    st.dataframe(tabela_aspectos, column_config={
+        "Menções": st.column_config.NumberColumn(format="%d"),
+        "Índice Líquido (pp)": st.column_config.NumberColumn(format="%+.1f"),
+    }, use_container_width=True)
+    # Preenchido ao final do script, assim como os demais gráficos
+    grafico_aspectos_slot = st.empty()
+
+
+# --- Tempo até a primeira renderização (histórico, comparação e aspectos exibidos) ---
+# As seções seguintes só abrem os embeddings e os classificadores ao serem usadas
+if not st.session_state.get('metricas_inicializacao_registradas'):
+    registrar_metrica('imports_app', _TEMPO_IMPORTS_MS)
+    registrar_metrica('primeira_renderizacao', (time.perf_counter() - _INICIO_SCRIPT) * 1000)
+    st.session_state['metricas_inicializacao_registradas'] = True
+
+
+# --- Seção Busca por Similaridade ---
+st.header("5. Busca de Tweets Semelhantes")
+
+with st.form("busca_similares"):
+    consulta = st.text_input("Descreva a reclamação ou elogio (ex: barulho na suspensão):")
+    col_modelo, col_k = st.columns(2)
+    # Modelos do histórico: o armazenamento de embeddings só é aberto ao buscar
+    filtro_modelo = col_modelo.selectbox("Modelo", ["Todos"] + [m.upper() for m in dados_historico['modelos']])
+    top_k = col_k.slider("Quantidade de resultados", 5, 50, 10)
+    buscar = st.form_submit_button("🔍 Buscar")
+
+if buscar and consulta.strip():
+    store = abrir_embeddings()
+    if len(store) == 0:
+        st.info("Nenhum tweet analisado foi armazenado ainda. Execute uma nova análise.")
+    elif not backend.pronto():
+        st.info("O modelo BERTimbau ainda está carregando. Tente novamente em instantes.")
+    else:
+        vetor_consulta = backend.codificar_textos([limpar_texto(consulta)])[0]
+        similares = store.buscar(
+            vetor_consulta,
+            k=top_k,
+            modelo=None if filtro_modelo == "Todos" else filtro_modelo,
+        )
+        if similares:
+            st.dataframe(pd.DataFrame(similares), column_config={
+                "texto": st.column_config.Column(label="Tweet", width="large"),
+                "similaridade": st.column_config.NumberColumn(label="Similaridade", format="%.3f"),
+            }, use_container_width=True)
         else:
-             st.warning(f"Não foi possível buscar a última análise para os modelos '{modelo_a}' e '{modelo_b}'. Tente executar as análises novamente.")
+            st.info("Nenhum tweet semelhante encontrado para o filtro selecionado.")
+
+
+# --- Seção Classificadores (versões, re-pontuação incremental e concordância) ---
+st.header("6. Classificadores e Concordância")
+
+col_pontuar, col_versoes = st.columns([1, 2])
+# O registro carrega o Naive Bayes, a cascata e as heurísticas: só quando o usuário for pontuar
+with col_pontuar:
+    if st.toggle("Pontuar tweets pendentes"):
+        from servico_pontuacao import pontuar_pendentes
+
+        classificadores_registrados = registrar_classificadores(usar_servico)
+        nome_classificador = st.selectbox(
+            "Classificador a pontuar",
+            sorted(classificadores_registrados),
+            format_func=lambda nome: f"{nome} ({classificadores_registrados[nome].versao})",
+        )
+        st.caption(classificadores_registrados[nome_classificador].descricao)
+        if st.button("▶️ Pontuar tweets pendentes"):
+            # Apenas os tweets sem resultado para a versão atual do classificador são processados
+            conn = get_db_connection()
+            if conn:
+                with st.spinner(f"Pontuando tweets pendentes com '{nome_classificador}'..."):
+                    pontuados = pontuar_pendentes(conn, classificadores_registrados[nome_classificador])
+                conn.close()
+                invalidar_classificadores()
+                st.success(f"{pontuados} tweets pontuados com '{nome_classificador}'.")
+                versoes_classificadores = carregar_versoes_classificadores()
+
+with col_versoes:
+    if versoes_classificadores.empty:
+        st.info("Nenhum resultado por classificador gravado ainda.")
+    else:
+        st.dataframe(versoes_classificadores, column_config={
+            "classificador": st.column_config.Column(label="Classificador"),
+            "versao": st.column_config.Column(label="Versão"),
+            "tweets": st.column_config.NumberColumn(label="Tweets", format="%d"),
+            "ultima_classificacao": st.column_config.DatetimeColumn(label="Última Pontuação"),
+        }, use_container_width=True, hide_index=True)
+
+if len(versoes_classificadores) >= 2:
+    pares = list(versoes_classificadores[['classificador', 'versao']].itertuples(index=False, name=None))
+    rotulo = lambda par: f"{par[0]} ({par[1]})"
+    col_a, col_b = st.columns(2)
+    par_a = col_a.selectbox("Classificador A", pares, index=0, format_func=rotulo)
+    par_b = col_b.selectbox("Classificador B", pares, index=1, format_func=rotulo)
+
+    if par_a != par_b:
+        from servico_pontuacao import resumir_concordancia
+
+        matriz_confusao, concordancia, kappa = resumir_concordancia(carregar_concordancia(*par_a, *par_b))
+        if concordancia is None:
+            st.info("Os dois classificadores ainda não têm tweets pontuados em comum.")
+        else:
+            st.markdown(f"**Concordância:** {concordancia:.1f}% · **Kappa de Cohen:** {kappa:.3f}")
+            st.dataframe(
+                matriz_confusao.rename_axis(index=f"A: {par_a[0]}", columns=f"B: {par_b[0]}"),
+                use_container_width=True
+            )
+
+
+# --- Gráfico de Distribuição da Última Análise (renderizado por último) ---
+if latest_analysis:
+    fig = montar_grafico_distribuicao(latest_analysis['Positivo'], latest_analysis['Neutro'], latest_analysis['Negativo'])
+    grafico_slot.plotly_chart(fig, use_container_width=True)
+
+if grafico_comparacao_slot is not None:
+    grafico_comparacao_slot.plotly_chart(montar_grafico_comparacao(matriz_selecionada), use_container_width=True)
+
+if grafico_aspectos_slot is not None:
+    grafico_aspectos_slot.plotly_chart(montar_grafico_aspectos(tabela_aspectos, modelo_aspectos), use_container_width=True)
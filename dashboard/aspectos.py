@@ -0,0 +1,181 @@
+# aspectos.py
+#
+# Extração de aspectos do veículo (motor, suspensão, consumo, acabamento...) a partir do
+# texto limpo, com um léxico configurável compilado uma única vez em uma só expressão
+# regular. As contagens por (modelo, aspecto, sentimento, dia) são gravadas junto com os
+# tweets processados (tabela aspectos_contagens), então o painel de aspectos lê apenas
+# os agregados.
+#
+# Uso: python aspectos.py --reconstruir   (recalcula as contagens após mudar o léxico)
+#
+# A reconstrução só recalcula os dias ainda presentes nas partições ativas: as contagens
+# dos meses arquivados por retencao.py são mantidas (com o léxico com que foram contadas).
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from datetime import date
+
+import pandas as pd
+
+from config import ASPECTOS_LEXICO_PATH
+from db_connector import get_db_connection, fetch_tweets_para_aspectos, insert_aspect_counts
+from retencao import inicio_dados_ativos
+
+# Léxico padrão: termos já no formato de limpar_texto (minúsculas, sem pontuação, então
+# "pós-venda" vira "pósvenda"). Um '*' no final casa qualquer continuação da palavra, e um
+# '-' no início marca uma expressão que não conta: o trecho é ignorado antes da busca (ex.:
+# "central de atendimento" não é a central multimídia, "o seguro" do carro não é segurança).
+ASPECTOS_PADRAO = {
+    'motor': ['motor', 'motores', 'potência', 'potencia', 'potente', 'torque', 'turbo', 'arrancada', 'retomada', 'aceler*', 'cavalos'],
+    'câmbio': ['câmbio', 'cambio', 'marcha*', 'embreagem', 'automático', 'automatico', 'cvt'],
+    'suspensão': ['suspens*', 'amortecedor*', 'mola', 'molas', 'estabilidade'],
+    'consumo': ['consumo', 'econômico', 'economico', 'econômica', 'economica', 'economia', 'beberrão', 'beberrao',
+                'combustível', 'combustivel', 'gasolina', 'etanol', 'autonomia', 'km por litro', 'kml'],
+    'acabamento': ['acabamento', 'plástico*', 'plastico*', 'material', 'materiais', 'rebarba*'],
+    'ruído': ['barulh*', 'ruído*', 'ruido*', 'rangido*', 'rangendo', 'chiado*', 'isolamento'],
+    'conforto': ['conforto', 'confortável', 'confortavel', 'espaço', 'espaco', 'espaçoso', 'espacoso',
+                 'porta malas', 'portamalas', 'bancos', 'ergonomia'],
+    'design': ['design', 'visual', 'aparência', 'aparencia', 'estilo', 'bonito', 'bonita', 'feio', 'feia', 'cor',
+               '-de cor'],
+    'tecnologia': ['multimídia', 'multimidia', 'central', 'tela', 'painel digital', 'android auto', 'carplay',
+                   'bluetooth', 'sistema de som', 'tecnologia',
+                   '-central de atendimento', '-central de relacionamento', '-central do cliente'],
+    'segurança': ['segurança', 'seguranca', 'seguro', 'airbag*', 'freio*', 'frenagem', 'abs',
+                  '-o seguro', '-do seguro', '-no seguro', '-seguro do', '-seguro da', '-seguro de', '-seguro auto*'],
+    'preço': ['preço', 'preco', 'caro', 'barato', 'valor', 'custo benefício', 'custobenefício', 'custo beneficio',
+              'custobeneficio', '-dar valor', '-dá valor', '-valor sentimental'],
+    'manutenção': ['manutenção', 'manutencao', 'revisão', 'revisao', 'concessionária*', 'concessionaria*',
+                   'pós venda', 'pósvenda', 'pos venda', 'posvenda', 'garantia', 'peça', 'peças', 'oficina', 'recall'],
+}
+
+
+def carregar_lexico_aspectos(caminho=ASPECTOS_LEXICO_PATH):
+    """Léxico {aspecto: [termos]} do arquivo JSON configurado, ou o padrão se ele não existir."""
+    if caminho and os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f)
+    return ASPECTOS_PADRAO
+
+
+class ExtratorAspectos:
+    """Mapeia textos limpos para os aspectos do léxico (um texto pode citar vários)."""
+
+    def __init__(self, lexico=None):
+        self.lexico = lexico or carregar_lexico_aspectos()
+
+        # Termos de uma palavra são buscados por token em um dicionário; prefixos e expressões de
+        # várias palavras vão para uma única regex, em que cada termo é um grupo nomeado (t0, t1, ...)
+        self._aspecto_por_palavra = {}
+        self._aspecto_por_grupo = []
+        padroes = []
+        exclusoes = []
+        for aspecto, lista in self.lexico.items():
+            for termo in (termo.strip().lower() for termo in lista):
+                if termo.startswith('-'):
+                    termo = termo[1:].strip()
+                    exclusoes.append(re.escape(termo.rstrip('*')) + (r'\w*' if termo.endswith('*') else ''))
+                elif termo.endswith('*') or ' ' in termo:
+                    sufixo = r'\w*' if termo.endswith('*') else ''
+                    padroes.append(f"(?P<t{len(padroes)}>{re.escape(termo.rstrip('*'))}{sufixo})")
+                    self._aspecto_por_grupo.append(aspecto)
+                else:
+                    self._aspecto_por_palavra.setdefault(termo, aspecto)
+        self._regex = re.compile(r'\b(?:' + '|'.join(padroes) + r')\b') if padroes else None
+        self._regex_exclusao = re.compile(r'\b(?:' + '|'.join(exclusoes) + r')\b') if exclusoes else None
+
+        conteudo = json.dumps(self.lexico, sort_keys=True, ensure_ascii=False)
+        self.versao = f"aspectos-{hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:8]}"
+
+    def aspectos(self, texto_limpo):
+        """Aspectos citados no texto, em ordem alfabética e sem repetição."""
+        if not texto_limpo:
+            return []
+        if self._regex_exclusao is not None:
+            texto_limpo = self._regex_exclusao.sub(' ', texto_limpo)
+        encontrados = {self._aspecto_por_palavra[palavra] for palavra in texto_limpo.split() if palavra in self._aspecto_por_palavra}
+        if self._regex is not None:
+            encontrados.update(self._aspecto_por_grupo[int(match.lastgroup[1:])] for match in self._regex.finditer(texto_limpo))
+        return sorted(encontrados)
+
+
+def contar_aspectos(extrator, tweets):
+    """
+    Agrega tweets (modelo, data, texto_limpo, sentimento) em contagens
+    {(MODELO, aspecto, sentimento, dia): quantidade}. Tweets sem data contam no dia atual.
+    """
+    contagens = Counter()
+    hoje = date.today()
+    for modelo, data, texto_limpo, sentimento in tweets:
+        if not sentimento:
+            continue
+        dia = data.date() if hasattr(data, 'date') else (data or hoje)
+        for aspecto in extrator.aspectos(texto_limpo):
+            contagens[(modelo.upper(), aspecto, sentimento, dia)] += 1
+    return contagens
+
+
+def tabela_aspectos(contagens, modelo):
+    """
+    Tabela de um modelo a partir das contagens (modelo, aspecto, sentimento, quantidade):
+    menções por sentimento e índice líquido de cada aspecto, dos mais citados aos menos.
+    """
+    colunas = ['Menções', 'Positivo', 'Neutro', 'Negativo', 'Índice Líquido (pp)']
+    do_modelo = contagens[contagens['modelo'] == modelo.upper()]
+    if do_modelo.empty:
+        return pd.DataFrame(columns=colunas)
+
+    tabela = (
+        do_modelo.pivot_table(index='aspecto', columns='sentimento', values='quantidade', aggfunc='sum', fill_value=0)
+        .reindex(columns=['POSITIVO', 'NEUTRO', 'NEGATIVO'], fill_value=0)
+        .astype(int)
+        .rename(columns={'POSITIVO': 'Positivo', 'NEUTRO': 'Neutro', 'NEGATIVO': 'Negativo'})
+        .rename_axis(columns=None)
+    )
+    tabela['Menções'] = tabela.sum(axis=1)
+    tabela['Índice Líquido (pp)'] = (tabela['Positivo'] - tabela['Negativo']) / tabela['Menções'] * 100
+    return tabela[colunas].sort_values('Menções', ascending=False).rename_axis('Aspecto')
+
+
+def reconstruir_contagens(conn, extrator, tamanho_lote=5000):
+    """
+    Recalcula aspectos_contagens a partir dos tweets processados (ex.: após mudar o léxico).
+    Se algum mês já foi arquivado, apenas os dias das partições ativas são substituídos.
+    """
+    desde = inicio_dados_ativos(conn)
+    contagens = Counter()
+    ultimo_id = 0
+    while True:
+        lote = fetch_tweets_para_aspectos(conn, ultimo_id, tamanho_lote, desde)
+        if not lote:
+            break
+        contagens.update(contar_aspectos(extrator, [linha[1:] for linha in lote]))
+        ultimo_id = lote[-1][0]
+    if not insert_aspect_counts(conn, contagens, substituir=True, desde=desde):
+        return None
+    return sum(contagens.values())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Índice de aspectos por modelo/sentimento/dia.")
+    parser.add_argument('--reconstruir', action='store_true', help="Recalcula aspectos_contagens dos dias ainda em tweets_processed.")
+    parser.add_argument('--texto', help="Mostra os aspectos encontrados em um texto (já limpo).")
+    args = parser.parse_args()
+
+    extrator = ExtratorAspectos()
+    if args.texto:
+        print(extrator.aspectos(args.texto))
+    if args.reconstruir:
+        conn = get_db_connection()
+        if conn is None:
+            raise SystemExit("❌ Não foi possível conectar ao banco de dados.")
+        try:
+            total = reconstruir_contagens(conn, extrator)
+        finally:
+            conn.close()
+        if total is None:
+            raise SystemExit("❌ Falha ao gravar as contagens de aspectos.")
+        print(f"✅ {total} menções a aspectos recontadas com o léxico {extrator.versao}.")
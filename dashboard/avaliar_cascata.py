@@ -0,0 +1,103 @@
+# avaliar_cascata.py
+#
+# Avalia a cascata em textos rotulados: para cada limiar, mede a taxa de escalonamento para
+# o BERTimbau, a vazão ponta a ponta e a concordância com o baseline (todos os textos no
+# BERTimbau), para escolher o limiar com o maior ganho de velocidade aceitável.
+# Por padrão usa o conjunto de teste gravado junto com o modelo Naive Bayes (textos fora do
+# treino): nos textos de treino as confianças do NB são otimistas, o que subestimaria o
+# escalonamento e superestimaria a concordância.
+#
+# Uso: python avaliar_cascata.py [--estagio auto|naive_bayes|lexico] [--limiares 0.5 0.7 0.9] [--amostra 500]
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from cascata import ClassificadorCascata, criar_estagio
+from cliente_inferencia import obter_backend
+from config import DATA_DIR, MODELO_NB_TESTE_PATH
+from preprocessamento import limpar_texto
+
+ARQUIVO_RESULTADO = os.path.join(DATA_DIR, 'metricas', 'cascata_{estagio}.csv')
+
+# Rótulos heurísticos do CSV simplificados para as 3 classes do dashboard
+MAPEAMENTO_ROTULOS = {
+    'Positivo': 'POSITIVO',
+    'Negativo': 'NEGATIVO',
+    'Neutro/Ruído': 'NEUTRO',
+    'Neutro/Conflito': 'NEUTRO',
+}
+
+
+def avaliar(textos, rotulos_csv, estagio, limiares, backend):
+    """Executa o baseline e a cascata em cada limiar, retornando um DataFrame com as métricas."""
+    # Aquecimento, para que a primeira medição não inclua inicializações do torch
+    backend.classificar_lote(textos[:8])
+
+    inicio = time.perf_counter()
+    baseline = [sentimento for sentimento, _ in backend.classificar_lote(textos)[0]]
+    tempo_baseline = time.perf_counter() - inicio
+    baseline = np.array(baseline)
+
+    linhas = [{
+        'limiar': None,
+        'escalonamento (%)': 100.0,
+        'tempo (s)': tempo_baseline,
+        'tweets/s': len(textos) / tempo_baseline,
+        'speedup': 1.0,
+        'concordância baseline (%)': 100.0,
+        'acurácia rótulo CSV (%)': np.mean(baseline == rotulos_csv) * 100,
+    }]
+
+    for limiar in limiares:
+        cascata = ClassificadorCascata(estagio, backend, limiar)
+        inicio = time.perf_counter()
+        resultados, escalados, _ = cascata.classificar_com_detalhes(textos)
+        tempo = time.perf_counter() - inicio
+        previstos = np.array([sentimento for sentimento, _ in resultados])
+
+        linhas.append({
+            'limiar': limiar,
+            'escalonamento (%)': escalados.mean() * 100,
+            'tempo (s)': tempo,
+            'tweets/s': len(textos) / tempo,
+            'speedup': tempo_baseline / tempo,
+            'concordância baseline (%)': np.mean(previstos == baseline) * 100,
+            'acurácia rótulo CSV (%)': np.mean(previstos == rotulos_csv) * 100,
+        })
+
+    return pd.DataFrame(linhas)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Avalia a cascata (primeiro estágio + BERTimbau) em textos rotulados.")
+    parser.add_argument('--arquivo', default=MODELO_NB_TESTE_PATH,
+                        help="CSV com content e sentiment_label (padrão: teste gravado com o modelo Naive Bayes).")
+    parser.add_argument('--estagio', default='auto', choices=['auto', 'naive_bayes', 'lexico'])
+    parser.add_argument('--limiares', type=float, nargs='+', default=[0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95])
+    parser.add_argument('--amostra', type=int, default=None, help="Usa apenas as N primeiras linhas do CSV.")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.arquivo):
+        raise SystemExit(f"❌ '{args.arquivo}' não encontrado. Treine o modelo (src/analise_sentimento_hb20_onix.py "
+                         "ou src/avaliacao_naive_bayes.py --salvar-melhor), que grava o conjunto de teste.")
+    df = pd.read_csv(args.arquivo, encoding='utf-8').dropna(subset=['content', 'sentiment_label'])
+    if args.amostra:
+        df = df.head(args.amostra)
+    textos = df['content'].astype(str).map(limpar_texto).tolist()
+    rotulos_csv = df['sentiment_label'].map(MAPEAMENTO_ROTULOS).to_numpy()
+
+    estagio = criar_estagio(args.estagio)
+    backend = obter_backend()
+    print(f"--- Avaliando cascata '{estagio.nome}' ({estagio.versao}) em {len(textos)} tweets (BERTimbau: {backend.nome}) ---")
+
+    resultado = avaliar(textos, rotulos_csv, estagio, args.limiares, backend)
+    print(resultado.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+    caminho = ARQUIVO_RESULTADO.format(estagio=estagio.nome)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    resultado.to_csv(caminho, index=False)
+    print(f"\n✅ Resultados salvos em '{caminho}'")
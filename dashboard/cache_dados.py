@@ -0,0 +1,283 @@
+# cache_dados.py
+#
+# Camada de cache do dashboard: o histórico é lido do banco uma única vez por TTL
+# e já é entregue com a última análise de cada modelo resolvida. Interações com
+# widgets que não alteram dados reaproveitam o cache (sem consulta ao DB nem pandas).
+
+import re
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from config import CACHE_TTL_SEGUNDOS, COMPARACAO_JANELA_DIAS, COMPARACAO_TEXTOS_POR_MODELO, COMPARACAO_TOPICOS_DIAS
+from db_connector import (
+    get_db_connection, fetch_analysis_history, fetch_latest_analyses, fetch_sentiment_rollup, fetch_processed_texts,
+    fetch_classifier_versions, fetch_confusion, fetch_aspect_counts
+)
+
+ORDEM_SENTIMENTOS = ['POSITIVO', 'NEUTRO', 'NEGATIVO']
+
+COLOR_MAP = {
+    'POSITIVO': '#10B981',
+    'NEGATIVO': '#EF4444',
+    'NEUTRO': '#6B7280'
+}
+
+
+def extrair_distribuicao(recomendacao_text):
+    """
+    Extrai os percentuais do texto de distribuição
+    (formato 'Distribuição: POSITIVO: X.X%, NEGATIVO: Y.Y%, NEUTRO: Z.Z%.').
+    """
+    pos_match = re.search(r'POSITIVO:\s*([\d.]+)', recomendacao_text)
+    neg_match = re.search(r'NEGATIVO:\s*([\d.]+)', recomendacao_text)
+    neu_match = re.search(r'NEUTRO:\s*([\d.]+)', recomendacao_text)
+
+    # Usa 0.0 se não encontrar a correspondência (evitando erros)
+    return {
+        'Positivo': float(pos_match.group(1)) if pos_match else 0.0,
+        'Negativo': float(neg_match.group(1)) if neg_match else 0.0,
+        'Neutro': float(neu_match.group(1)) if neu_match else 0.0,
+    }
+
+
+def resumir_analise(modelo, resumo, recomendacao, data_geracao):
+    """Monta o dicionário de exibição de uma análise do histórico."""
+    resumo_analise = {
+        'Modelo': modelo, # Retorna a capitalização exata salva
+        'Síntese': resumo.replace('\n', ' ').strip(),
+        'Distribuição': recomendacao.replace('\n', ' ').strip(),
+        'Data': data_geracao.strftime("%d/%m/%Y %H:%M"),
+    }
+    resumo_analise.update(extrair_distribuicao(recomendacao))
+    return resumo_analise
+
+
+def calcular_ultimas_analises(df):
+    """
+    Resolve, em uma única ordenação, a análise mais recente de cada modelo.
+    Retorna o dicionário {MODELO em maiúsculas: análise} e a lista de modelos
+    distintos do mais recente para o mais antigo.
+    """
+    if df.empty:
+        return {}, []
+
+    df_ordenado = df.sort_values(by='data_geracao', ascending=False, kind='stable')
+    # 'hb20' e 'HB20' são tratados como o mesmo modelo
+    chaves = df_ordenado['modelo'].str.upper()
+    df_ultimas = df_ordenado[~chaves.duplicated()]
+
+    ultimas = {}
+    modelos = []
+    for linha in df_ultimas.itertuples(index=False):
+        ultimas[linha.modelo.upper()] = resumir_analise(
+            linha.modelo, linha.resumo_sentimentos, linha.recomendacao, linha.data_geracao
+        )
+        modelos.append(linha.modelo)
+    return ultimas, modelos
+
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def carregar_historico():
+    """
+    Busca o histórico no banco e pré-calcula as últimas análises por modelo (de todos os
+    modelos, não só dos que aparecem nas últimas linhas do histórico exibido).
+    Fica em cache até expirar o TTL ou até invalidar_historico() ser chamado.
+    """
+    conn = get_db_connection()
+    if conn is None:
+        history_df = pd.DataFrame()
+        ultimas_df = pd.DataFrame()
+    else:
+        try:
+            history_df = fetch_analysis_history(conn)
+            ultimas_df = fetch_latest_analyses(conn)
+        finally:
+            conn.close()
+
+    # --- Padroniza os nomes das colunas para minúsculas para evitar KeyErrors ---
+    if not history_df.empty:
+        history_df.columns = [c.lower() for c in history_df.columns]
+
+    ultimas, modelos = calcular_ultimas_analises(ultimas_df)
+    return {'historico': history_df, 'ultimas': ultimas, 'modelos': modelos}
+
+
+def invalidar_historico():
+    """Descarta o histórico em cache (chamado após gravar uma nova análise)."""
+    carregar_historico.clear()
+
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def carregar_matriz_comparacao(classificador=None, versao=None, desde=None):
+    """
+    Monta (uma vez por TTL) a matriz de comparação de todos os modelos a partir das
+    contagens diárias de sentimentos_contagens, completada pelas últimas análises do histórico.
+    Com classificador/versão, usa as contagens dessa versão; com `desde`, apenas o período
+    a partir desse dia (mais a janela anterior, para a tendência).
+    """
+    # comparacao (numpy/scikit-learn) só é importado quando a matriz não está em cache
+    from comparacao import montar_matriz_comparacao, matriz_de_historico, combinar_matrizes
+
+    conn = get_db_connection()
+    if conn is None:
+        rollup = pd.DataFrame(columns=['modelo', 'dia', 'sentimento', 'quantidade'])
+        textos = pd.DataFrame(columns=['modelo', 'sentimento', 'texto_limpo'])
+    else:
+        try:
+            desde_rollup = None if desde is None else desde - timedelta(days=COMPARACAO_JANELA_DIAS)
+            rollup = fetch_sentiment_rollup(conn, classificador, versao, desde_rollup)
+            desde_textos = desde or date.today() - timedelta(days=COMPARACAO_TOPICOS_DIAS)
+            textos = fetch_processed_texts(conn, COMPARACAO_TEXTOS_POR_MODELO, desde_textos, classificador, versao)
+        finally:
+            conn.close()
+
+    matriz = montar_matriz_comparacao(rollup, textos, janela_dias=COMPARACAO_JANELA_DIAS, desde=desde)
+    if classificador is not None:
+        return matriz
+    # O histórico de análises reflete o classificador padrão do dashboard
+    return combinar_matrizes(matriz, matriz_de_historico(carregar_historico()['ultimas']))
+
+
+def invalidar_comparacao():
+    """Descarta a matriz de comparação em cache (chamado após gravar novos tweets)."""
+    carregar_matriz_comparacao.clear()
+
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def carregar_versoes_classificadores():
+    """Versões de classificadores com resultados gravados (e cobertura de cada uma)."""
+    conn = get_db_connection()
+    if conn is None:
+        return pd.DataFrame(columns=['classificador', 'versao', 'tweets', 'ultima_classificacao'])
+    try:
+        return fetch_classifier_versions(conn)
+    finally:
+        conn.close()
+
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def carregar_concordancia(classificador_a, versao_a, classificador_b, versao_b):
+    """Contagens de concordância acumuladas entre duas versões de classificadores."""
+    conn = get_db_connection()
+    if conn is None:
+        return pd.DataFrame(columns=['sentimento_a', 'sentimento_b', 'quantidade'])
+    try:
+        return fetch_confusion(conn, classificador_a, versao_a, classificador_b, versao_b)
+    finally:
+        conn.close()
+
+
+def invalidar_classificadores():
+    """Descarta versões, concordâncias e matrizes em cache (chamado após uma pontuação)."""
+    carregar_versoes_classificadores.clear()
+    carregar_concordancia.clear()
+    carregar_matriz_comparacao.clear()
+
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def carregar_aspectos(desde=None):
+    """Contagens de aspectos de todos os modelos (a partir do dia `desde`), lidas dos agregados."""
+    conn = get_db_connection()
+    if conn is None:
+        return pd.DataFrame(columns=['modelo', 'aspecto', 'sentimento', 'quantidade'])
+    try:
+        return fetch_aspect_counts(conn, desde)
+    finally:
+        conn.close()
+
+
+def carregar_tabela_aspectos(modelo, desde=None):
+    """Tabela de aspectos de um modelo (ver aspectos.tabela_aspectos)."""
+    from aspectos import tabela_aspectos
+    return tabela_aspectos(carregar_aspectos(desde), modelo)
+
+
+def invalidar_aspectos():
+    """Descarta as contagens de aspectos em cache (chamado após gravar novos tweets)."""
+    carregar_aspectos.clear()
+
+
+def get_latest_analysis(dados, modelo):
+    """Retorna a análise mais recente de um modelo a partir do cache (ou None)."""
+    return dados['ultimas'].get(modelo.upper())
+
+
+@st.cache_data(show_spinner=False)
+def montar_grafico_distribuicao(positivo, neutro, negativo):
+    """Gera (uma vez por distribuição) a figura Plotly de distribuição de sentimentos."""
+    import plotly.express as px
+
+    df_plot = pd.DataFrame({
+        'Sentimento': ORDEM_SENTIMENTOS,
+        'Percentual': [positivo, neutro, negativo]
+    })
+
+    fig = px.bar(
+        df_plot,
+        x='Sentimento',
+        y='Percentual',
+        title='Distribuição de Sentimentos (em %)',
+        color='Sentimento',
+        color_discrete_map=COLOR_MAP,
+        text_auto='.1f'
+    )
+
+    fig.update_xaxes(categoryorder='array', categoryarray=ORDEM_SENTIMENTOS)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def montar_grafico_comparacao(matriz):
+    """Gráfico de barras agrupadas da distribuição de sentimentos dos modelos selecionados."""
+    import plotly.express as px
+
+    colunas = {'Positivo (%)': 'POSITIVO', 'Neutro (%)': 'NEUTRO', 'Negativo (%)': 'NEGATIVO'}
+    df_plot = (
+        matriz[list(colunas)]
+        .rename(columns=colunas)
+        .rename_axis('Modelo')
+        .reset_index()
+        .melt(id_vars='Modelo', var_name='Sentimento', value_name='Percentual')
+    )
+
+    fig = px.bar(
+        df_plot,
+        x='Modelo',
+        y='Percentual',
+        title='Distribuição de Sentimentos por Modelo (em %)',
+        color='Sentimento',
+        color_discrete_map=COLOR_MAP,
+        barmode='group',
+        text_auto='.1f'
+    )
+
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def montar_grafico_aspectos(tabela, modelo):
+    """Barras horizontais empilhadas com as menções por sentimento de cada aspecto."""
+    import plotly.express as px
+
+    colunas = {'Positivo': 'POSITIVO', 'Neutro': 'NEUTRO', 'Negativo': 'NEGATIVO'}
+    df_plot = (
+        tabela[list(colunas)]
+        .rename(columns=colunas)
+        .reset_index()
+        .melt(id_vars='Aspecto', var_name='Sentimento', value_name='Menções')
+    )
+
+    fig = px.bar(
+        df_plot,
+        x='Menções',
+        y='Aspecto',
+        orientation='h',
+        title=f'Menções por Aspecto - {modelo}',
+        color='Sentimento',
+        color_discrete_map=COLOR_MAP,
+        category_orders={'Aspecto': list(tabela.index), 'Sentimento': ORDEM_SENTIMENTOS},
+    )
+
+    return fig
@@ -0,0 +1,118 @@
+# cascata.py
+#
+# Classificação em cascata: um primeiro estágio barato (TF-IDF + Naive Bayes persistido,
+# ou o léxico heurístico) classifica todos os textos, e apenas os de baixa confiança
+# (abaixo do limiar) são enviados ao BERTimbau.
+
+import hashlib
+import os
+
+import numpy as np
+
+from config import MODELO_NB_PATH, CASCATA_LIMIAR_PADRAO
+from rotulacao_automatica_heuristica import LEXICO_POS, LEXICO_NEG, contar_polaridade, rotular_texto_heuristica
+
+
+class EstagioNaiveBayes:
+    """
+    Primeiro estágio com o pipeline TF-IDF + MultinomialNB salvo pelo script de src/, treinado
+    na coluna content_limpo (com stopwords), o mesmo texto que limpar_texto entrega aqui.
+    """
+
+    nome = 'naive_bayes'
+    limiar_padrao = CASCATA_LIMIAR_PADRAO
+
+    def __init__(self, caminho=MODELO_NB_PATH):
+        import joblib
+
+        self.caminho = caminho
+        self.modelo = joblib.load(caminho)
+        # Os rótulos do treino ('Positivo', 'Negativo', 'Neutro') viram os do dashboard
+        self.rotulos = np.array([str(classe).upper() for classe in self.modelo.classes_])
+        with open(caminho, 'rb') as f:
+            self.versao = f"nb-{hashlib.sha1(f.read()).hexdigest()[:8]}"
+
+    def pontuar(self, textos_limpos):
+        """Retorna (rótulos, confiança), onde a confiança é a maior probabilidade prevista."""
+        probabilidades = self.modelo.predict_proba(textos_limpos)
+        melhores = probabilidades.argmax(axis=1)
+        return self.rotulos[melhores], probabilidades[np.arange(len(melhores)), melhores]
+
+
+class EstagioLexico:
+    """
+    Primeiro estágio com o léxico heurístico do dashboard. A confiança é a margem entre
+    palavras positivas e negativas, |pos - neg| / (pos + neg + 1): 0 sem evidência e
+    próxima de 1 quando há várias palavras de uma só polaridade.
+    """
+
+    nome = 'lexico'
+    # Uma palavra de vantagem já dá 0.5; com o limiar da probabilidade do NB quase tudo seria escalado
+    limiar_padrao = 0.5
+
+    def __init__(self):
+        conteudo = '|'.join(sorted(LEXICO_POS)) + '\x1f' + '|'.join(sorted(LEXICO_NEG))
+        self.versao = f"lexico-{hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:8]}"
+
+    def pontuar(self, textos_limpos):
+        # O rótulo é o do classificador 'lexico' (rotular_texto_heuristica); a confiança, a margem
+        rotulos, confiancas = [], []
+        for texto in textos_limpos:
+            score_pos, score_neg = contar_polaridade(texto)
+            rotulos.append(rotular_texto_heuristica(texto))
+            confiancas.append(abs(score_pos - score_neg) / (score_pos + score_neg + 1))
+        return np.array(rotulos), np.array(confiancas)
+
+
+def criar_estagio(nome='auto'):
+    """Cria o primeiro estágio pedido; 'auto' usa o Naive Bayes se o modelo salvo existir."""
+    if nome == 'naive_bayes' or (nome == 'auto' and os.path.exists(MODELO_NB_PATH)):
+        return EstagioNaiveBayes()
+    return EstagioLexico()
+
+
+class ClassificadorCascata:
+    """
+    Combina o primeiro estágio com o BERTimbau. O `backend` (cliente_inferencia) só é
+    usado se algum texto precisar ser escalado. Expõe nome/versão/descrição como os
+    classificadores registrados em classificadores.py.
+    """
+
+    nome = 'cascata'
+
+    def __init__(self, estagio, backend, limiar=None, versao_bert=''):
+        self.estagio = estagio
+        self.backend = backend
+        self.limiar = estagio.limiar_padrao if limiar is None else limiar
+        self.versao = f"{estagio.versao}-l{self.limiar:g}+{versao_bert}"
+        self.descricao = f"Cascata: {estagio.nome} e BERTimbau para confiança < {self.limiar:g}"
+
+    def classificar_com_detalhes(self, textos_limpos):
+        """
+        Retorna (resultados, escalados, embeddings): a lista de (sentimento, score), a máscara
+        dos textos enviados ao BERTimbau e os embeddings (n, dim) dos escalados, ou None se
+        nenhum texto foi escalado.
+        """
+        textos_limpos = list(textos_limpos)
+        rotulos, confiancas = self.estagio.pontuar(textos_limpos)
+
+        # Textos vazios/curtos ficam neutros, como no classificador BERTimbau
+        curtos = np.array([len(texto.split()) < 3 for texto in textos_limpos], dtype=bool)
+        escalados = (confiancas < self.limiar) & ~curtos
+
+        resultados = [
+            ('NEUTRO', 0.5) if curto else (str(rotulo), float(confianca))
+            for rotulo, confianca, curto in zip(rotulos, confiancas, curtos)
+        ]
+
+        embeddings = None
+        posicoes = np.flatnonzero(escalados)
+        if len(posicoes):
+            resultados_bert, embeddings = self.backend.classificar_lote([textos_limpos[i] for i in posicoes])
+            for i, resultado in zip(posicoes, resultados_bert):
+                resultados[i] = resultado
+
+        return resultados, escalados, embeddings
+
+    def classificar(self, textos_limpos):
+        return self.classificar_com_detalhes(textos_limpos)[0]
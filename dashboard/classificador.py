@@ -0,0 +1,191 @@
+# classificador.py
+
+import threading
+import time
+
+# Modelo BERTimbau usado pelo dashboard
+MODELO_BERT = "neuralmind/bert-base-portuguese-cased"
+
+# --- HEURÍSTICA DE REFORÇO POSITIVO (Para combater o viés negativo do BERTimbau) ---
+POSITIVE_BOOST_WORDS = [
+    'excelente', 'ótimo', 'perfeito', 'sensacional', 'maravilhoso',
+    'lindo', 'confortável', 'recomendo', 'adorei', 'top', 'melhor',
+    'sempre', 'incrível', 'funciona'
+]
+
+
+def carregar_analisador():
+    """
+    Carrega o pipeline de análise de sentimentos (BERTimbau).
+    O import do transformers (e do torch) é feito aqui dentro para não pesar
+    na inicialização do dashboard.
+    """
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=MODELO_BERT)
+
+
+def mapear_rotulo_bert(label_bert):
+    """Mapeia o rótulo bruto do modelo para POSITIVO, NEGATIVO ou NEUTRO."""
+    label_bert = label_bert.upper()
+
+    # LABEL_2 é o rótulo positivo no BERTimbau para 3 classes
+    if label_bert in ('LABEL_2', 'POSITIVE'):
+        return 'POSITIVO'
+
+    # LABEL_0 é o rótulo negativo
+    if label_bert in ('LABEL_0', 'NEGATIVE'):
+        return 'NEGATIVO'
+
+    # LABEL_1 é o rótulo neutro, e o fallback
+    return 'NEUTRO'
+
+
+def analisar_sentimento_e_rotular(texto_limpo, analisador):
+    """
+    Função que usa o BERTimbau para classificar, garantindo o mapeamento correto
+    dos rótulos do modelo para POSITIVO, NEGATIVO e NEUTRO, e aplicando um
+    reforço heurístico para combater o viés negativo/neutro.
+    """
+    if not texto_limpo or len(texto_limpo.split()) < 3:
+        # Mantém neutro para textos vazios/curtos, onde a análise é inviável
+        return 'NEUTRO', 0.5
+
+    # Classificação do BERTimbau
+    resultado_bert = analisador(texto_limpo)[0]
+
+    sentimento_padrao = mapear_rotulo_bert(resultado_bert['label'])
+    score_bert = resultado_bert['score']
+
+    return aplicar_reforco_positivo(texto_limpo, sentimento_padrao, score_bert)
+
+
+def aplicar_reforco_positivo(texto_limpo, sentimento_padrao, score_bert):
+    """
+    Se o modelo classificou como NEUTRO ou NEGATIVO, mas a mensagem contém palavras de forte elogio,
+    forçamos a classificação para POSITIVO.
+    """
+    if sentimento_padrao in ('NEUTRO', 'NEGATIVO'):
+        # Verifica se alguma palavra de reforço está presente no texto (case-insensitive)
+        if any(word in texto_limpo.lower() for word in POSITIVE_BOOST_WORDS):
+            sentimento_padrao = 'POSITIVO'
+            # Atribui um score alto para refletir o reforço manual
+            score_bert = 0.9
+
+    return sentimento_padrao, score_bert
+
+
+def _executar_modelo(textos, analisador, tamanho_lote=32):
+    """
+    Executa o BERTimbau em lotes, retornando as probabilidades por classe e o
+    embedding de cada texto (média da última camada oculta ponderada pela máscara
+    de atenção), ambos obtidos na mesma passada pelo modelo.
+    """
+    import numpy as np
+    import torch
+
+    tokenizer = analisador.tokenizer
+    modelo = analisador.model
+    modelo.eval()
+
+    probabilidades, embeddings = [], []
+    with torch.no_grad():
+        for inicio in range(0, len(textos), tamanho_lote):
+            lote = textos[inicio:inicio + tamanho_lote]
+            entradas = tokenizer(lote, padding=True, truncation=True, max_length=512, return_tensors='pt').to(modelo.device)
+            saida = modelo(**entradas, output_hidden_states=True)
+
+            ultima_camada = saida.hidden_states[-1]
+            mascara = entradas['attention_mask'].unsqueeze(-1).to(ultima_camada.dtype)
+            media = (ultima_camada * mascara).sum(dim=1) / mascara.sum(dim=1).clamp(min=1e-9)
+
+            probabilidades.append(torch.softmax(saida.logits, dim=-1).cpu().numpy())
+            embeddings.append(media.cpu().numpy())
+
+    return np.concatenate(probabilidades), np.concatenate(embeddings)
+
+
+def classificar_lote(textos_limpos, analisador, tamanho_lote=32):
+    """
+    Versão em lote de analisar_sentimento_e_rotular que também devolve os embeddings.
+    Retorna a lista de (sentimento, score) e uma matriz float32 (n, dim); textos vazios
+    recebem um vetor de zeros.
+    """
+    import numpy as np
+
+    dim = analisador.model.config.hidden_size
+    embeddings = np.zeros((len(textos_limpos), dim), dtype=np.float32)
+    resultados = [('NEUTRO', 0.5)] * len(textos_limpos)
+
+    posicoes = [i for i, texto in enumerate(textos_limpos) if texto]
+    if not posicoes:
+        return resultados, embeddings
+
+    probabilidades, vetores = _executar_modelo([textos_limpos[i] for i in posicoes], analisador, tamanho_lote)
+    embeddings[posicoes] = vetores
+
+    id2label = analisador.model.config.id2label
+    for linha, i in enumerate(posicoes):
+        texto_limpo = textos_limpos[i]
+        # Mantém neutro para textos curtos, onde a análise é inviável
+        if len(texto_limpo.split()) < 3:
+            continue
+        classe = int(probabilidades[linha].argmax())
+        sentimento_padrao = mapear_rotulo_bert(id2label[classe])
+        resultados[i] = aplicar_reforco_positivo(texto_limpo, sentimento_padrao, float(probabilidades[linha, classe]))
+
+    return resultados, embeddings
+
+
+def codificar_textos(textos_limpos, analisador, tamanho_lote=32):
+    """Retorna apenas os embeddings (float32) dos textos, p. ex. para consultas de similaridade."""
+    return _executar_modelo(list(textos_limpos), analisador, tamanho_lote)[1]
+
+
+class CarregadorModelo:
+    """
+    Carrega o modelo em uma thread de fundo, permitindo que o dashboard
+    renderize o histórico do banco enquanto o BERTimbau é inicializado.
+    """
+
+    def __init__(self, fabrica=carregar_analisador):
+        self._fabrica = fabrica
+        self._evento = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.analisador = None
+        self.erro = None
+        self.tempo_carga = None  # segundos
+
+    def iniciar(self):
+        """Dispara o carregamento (apenas uma vez) e retorna o próprio carregador."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._carregar, name="carregador-bertimbau", daemon=True)
+                self._thread.start()
+        return self
+
+    def _carregar(self):
+        inicio = time.perf_counter()
+        try:
+            self.analisador = self._fabrica()
+        except Exception as e:
+            self.erro = e
+        finally:
+            self.tempo_carga = time.perf_counter() - inicio
+            self._evento.set()
+
+    def pronto(self):
+        """True quando o modelo terminou de carregar sem erro."""
+        return self._evento.is_set() and self.erro is None
+
+    def falhou(self):
+        return self._evento.is_set() and self.erro is not None
+
+    def obter(self, timeout=None):
+        """Aguarda o carregamento e retorna o analisador."""
+        self.iniciar()
+        if not self._evento.wait(timeout):
+            raise TimeoutError("O modelo ainda está carregando.")
+        if self.erro is not None:
+            raise RuntimeError(f"Falha ao carregar o modelo: {self.erro}")
+        return self.analisador
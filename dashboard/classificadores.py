@@ -0,0 +1,120 @@
+# classificadores.py
+#
+# Registro dos classificadores de sentimento disponíveis, cada um identificado por
+# (nome, versão). A versão é derivada do que define o comportamento do classificador
+# (modelo, léxicos), então qualquer alteração gera uma nova versão automaticamente.
+
+import hashlib
+import importlib.util
+import os
+
+from cascata import ClassificadorCascata, EstagioNaiveBayes, criar_estagio
+from classificador import MODELO_BERT, POSITIVE_BOOST_WORDS
+from cliente_inferencia import obter_backend
+from config import MODELO_NB_PATH
+from rotulacao_automatica_heuristica import LEXICO_POS, LEXICO_NEG, rotular_texto_heuristica
+
+CAMINHO_HEURISTICA_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'rotulacao_automatica_heuristica.py')
+
+# Rótulos de 4 classes da heurística de src/ simplificados para as 3 classes do dashboard
+MAPEAMENTO_HEURISTICA_SRC = {
+    'Positivo': 'POSITIVO',
+    'Negativo': 'NEGATIVO',
+    'Neutro/Ruído': 'NEUTRO',
+    'Neutro/Conflito': 'NEUTRO',
+}
+
+
+def _assinatura(*partes):
+    """Hash curto e estável do conteúdo que define um classificador."""
+    conteudo = '\x1f'.join(
+        '|'.join(sorted(parte)) if isinstance(parte, (set, frozenset, list, tuple)) else str(parte)
+        for parte in partes
+    )
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:8]
+
+
+class Classificador:
+    """Classificador registrado: recebe textos limpos e retorna uma lista de (sentimento, score)."""
+
+    def __init__(self, nome, versao, funcao_lote, descricao):
+        self.nome = nome
+        self.versao = versao
+        self.descricao = descricao
+        self._funcao_lote = funcao_lote
+
+    def classificar(self, textos_limpos):
+        return self._funcao_lote(list(textos_limpos))
+
+    def __repr__(self):
+        return f"Classificador({self.nome!r}, {self.versao!r})"
+
+
+# Classificador cujo resultado é gravado em tweets_processed.sentimento pelo dashboard
+CLASSIFICADOR_PADRAO = 'bertimbau'
+
+
+def _carregar_heuristica_src():
+    """Importa src/rotulacao_automatica_heuristica.py (mesmo nome do módulo do dashboard) pelo caminho."""
+    spec = importlib.util.spec_from_file_location('heuristica_src', CAMINHO_HEURISTICA_SRC)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+# Versões derivadas do conteúdo (mudou o léxico ou o modelo, mudou a versão)
+VERSAO_BERTIMBAU = f"{MODELO_BERT.split('/')[-1]}+reforco-{_assinatura(POSITIVE_BOOST_WORDS)}"
+VERSAO_LEXICO = f"lexico-{_assinatura(LEXICO_POS, LEXICO_NEG)}"
+
+
+def listar_classificadores(backend=None):
+    """
+    Retorna {nome: Classificador}. O BERTimbau vem do `backend` (serviço de inferência
+    ou modelo local, ver cliente_inferencia) e só é usado quando for de fato classificar.
+    """
+    backend = backend or obter_backend()
+    classificadores = {}
+
+    classificadores['bertimbau'] = Classificador(
+        'bertimbau',
+        VERSAO_BERTIMBAU,
+        lambda textos: backend.classificar_lote(textos, embeddings=False)[0],
+        "BERTimbau com reforço heurístico positivo (dashboard)",
+    )
+
+    classificadores['lexico'] = Classificador(
+        'lexico',
+        VERSAO_LEXICO,
+        lambda textos: [(rotular_texto_heuristica(texto), None) for texto in textos],
+        "Léxico simples (rotulacao_automatica_heuristica do dashboard)",
+    )
+
+    if os.path.exists(CAMINHO_HEURISTICA_SRC):
+        heuristica = _carregar_heuristica_src()
+        classificadores['heuristica_src'] = Classificador(
+            'heuristica_src',
+            f"heuristica-{_assinatura(heuristica.PALAVRAS_POSITIVAS, heuristica.PALAVRAS_NEGATIVAS, heuristica.PALAVRAS_RUIDO)}",
+            lambda textos: [(MAPEAMENTO_HEURISTICA_SRC[heuristica.automatic_labeling(texto)], None) for texto in textos],
+            "Heurística de rotulação do pipeline offline (src/)",
+        )
+
+    if os.path.exists(MODELO_NB_PATH):
+        estagio_nb = EstagioNaiveBayes(MODELO_NB_PATH)
+        classificadores['naive_bayes'] = Classificador(
+            'naive_bayes',
+            estagio_nb.versao,
+            lambda textos: [(str(rotulo), float(confianca)) for rotulo, confianca in zip(*estagio_nb.pontuar(textos))],
+            "TF-IDF + Naive Bayes treinado em src/analise_sentimento_hb20_onix.py",
+        )
+
+    classificadores['cascata'] = criar_cascata(backend)
+
+    return classificadores
+
+
+def criar_cascata(backend=None, limiar=None, estagio='auto'):
+    """
+    Cascata com o primeiro estágio indicado ('auto', 'naive_bayes' ou 'lexico') e o BERTimbau.
+    Sem limiar, usa o padrão do estágio.
+    """
+    return ClassificadorCascata(criar_estagio(estagio), backend or obter_backend(), limiar, versao_bert=VERSAO_BERTIMBAU)
@@ -0,0 +1,101 @@
+# cliente_inferencia.py
+#
+# Acesso ao BERTimbau para o dashboard e os scripts offline. Os dois backends têm a mesma
+# interface (classificar_lote, codificar_textos, pronto): o cliente HTTP do serviço local
+# (servidor_inferencia.py) e o modelo carregado no próprio processo.
+
+import json
+import urllib.error
+import urllib.request
+
+from classificador import CarregadorModelo, classificar_lote, codificar_textos
+from config import INFERENCIA_URL, INFERENCIA_TIMEOUT_SEGUNDOS
+
+
+class ClienteInferencia:
+    """Cliente do serviço de inferência. Os textos enviados já devem estar limpos."""
+
+    nome = 'servico'
+
+    def __init__(self, url=INFERENCIA_URL, timeout=INFERENCIA_TIMEOUT_SEGUNDOS):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def _requisitar(self, caminho, corpo=None, timeout=None):
+        dados = None if corpo is None else json.dumps(corpo).encode('utf-8')
+        requisicao = urllib.request.Request(
+            self.url + caminho, data=dados, method='GET' if corpo is None else 'POST',
+            headers={'Content-Type': 'application/json'},
+        )
+        try:
+            with urllib.request.urlopen(requisicao, timeout=timeout or self.timeout) as resposta:
+                return json.loads(resposta.read())
+        except urllib.error.HTTPError as e:
+            # O serviço responde os erros em JSON: {"erro": "..."}
+            try:
+                mensagem = json.loads(e.read()).get('erro', e.reason)
+            except ValueError:
+                mensagem = e.reason
+            raise RuntimeError(f"Serviço de inferência respondeu {e.code}: {mensagem}") from e
+
+    def disponivel(self, timeout=0.5):
+        """True se o serviço estiver respondendo."""
+        if not self.url:
+            return False
+        try:
+            return self._requisitar('/saude', timeout=timeout).get('status') == 'ok'
+        except (OSError, ValueError, RuntimeError):
+            return False
+
+    def pronto(self):
+        try:
+            return bool(self._requisitar('/saude', timeout=0.5).get('modelo_pronto'))
+        except (OSError, ValueError, RuntimeError):
+            return False
+
+    def classificar(self, texto_limpo):
+        """Classifica um único texto (agrupado em micro-lote pelo serviço). Retorna (sentimento, score)."""
+        resposta = self._requisitar('/classificar', {'texto': texto_limpo, 'limpar': False})
+        return resposta['sentimento'], resposta['score']
+
+    def classificar_lote(self, textos_limpos, embeddings=True):
+        """Retorna (lista de (sentimento, score), embeddings float32 (n, dim) ou None)."""
+        resposta = self._requisitar('/classificar/lote', {'textos': list(textos_limpos), 'limpar': False, 'embeddings': embeddings})
+        resultados = [(item['sentimento'], item['score']) for item in resposta['resultados']]
+        import numpy as np
+        vetores = np.asarray(resposta['embeddings'], dtype=np.float32) if embeddings else None
+        return resultados, vetores
+
+    def codificar_textos(self, textos_limpos):
+        return self.classificar_lote(textos_limpos, embeddings=True)[1]
+
+    def metricas(self):
+        """Percentis de latência e histograma de micro-lotes do serviço."""
+        return self._requisitar('/metricas')
+
+
+class BackendLocal:
+    """BERTimbau carregado no próprio processo (via CarregadorModelo, em segundo plano)."""
+
+    nome = 'local'
+
+    def __init__(self, carregador=None):
+        self.carregador = carregador or CarregadorModelo()
+
+    def pronto(self):
+        return self.carregador.pronto()
+
+    def classificar_lote(self, textos_limpos, embeddings=True):
+        resultados, vetores = classificar_lote(textos_limpos, self.carregador.obter())
+        return resultados, (vetores if embeddings else None)
+
+    def codificar_textos(self, textos_limpos):
+        return codificar_textos(textos_limpos, self.carregador.obter())
+
+
+def obter_backend(carregador=None):
+    """Usa o serviço de inferência se ele estiver no ar; caso contrário, o modelo local."""
+    cliente = ClienteInferencia()
+    if cliente.disponivel():
+        return cliente
+    return BackendLocal(carregador)
@@ -5,12 +5,34 @@ from datetime import datetime, timedelta
 import random
 import os
 
+from coletor import carregar_coletados, chave_modelo
+
+def datas_para_gravar(datas: pd.Series) -> list:
+    """
+    Datas de coletar_tweets como datetime UTC sem fuso, para o banco (None se ausente ou
+    inválida). Os itens coletados vêm em ISO 8601 com fuso; format='ISO8601' lê cada valor
+    por si, sem inferir o formato do primeiro.
+    """
+    datas = pd.to_datetime(datas, format='ISO8601', errors='coerce', utc=True).dt.tz_localize(None)
+    return [d.to_pydatetime() if pd.notna(d) else None for d in datas]
+
 def coletar_tweets(modelo: str, limite: int = 100) -> pd.DataFrame:
     """
-    Tenta carregar o arquivo rotulado local para demonstração.
+    Usa os itens do coletor multi-fonte (coletor.py), se houver para o modelo; senão, tenta
+    carregar o arquivo rotulado local para demonstração.
     Se o arquivo não for encontrado ou não contiver o modelo, recorre à simulação.
+    A coluna 'demonstracao' marca as linhas do arquivo local e da simulação (datas
+    inventadas, os mesmos textos a cada execução), que o dashboard não grava no banco.
     """
-    
+
+    # 0. Itens coletados (X/Twitter, Reclame Aqui), já no esquema date,user,content,source
+    coletados = carregar_coletados()
+    coletados = coletados[coletados['modelo'] == chave_modelo(modelo)]
+    if not coletados.empty:
+        coletados = coletados.sort_values('date', ascending=False).head(limite)
+        print(f"✅ Usando {len(coletados)} itens coletados para '{modelo}' ({', '.join(sorted(coletados['source'].unique()))}).")
+        return coletados[['date', 'user', 'content']].assign(demonstracao=False)
+
     # 1. Tenta carregar o arquivo rotulado local
     FILE_PATH = '../data/raw/tweets_hb20_onix_rotulado.csv'
     
@@ -37,7 +59,7 @@ def coletar_tweets(modelo: str, limite: int = 100) -> pd.DataFrame:
                 if 'date' not in df_filtrado.columns:
                     df_filtrado['date'] = datetime.now() - pd.to_timedelta(range(len(df_filtrado)), unit='h')
                 
-                return df_filtrado[['date', 'user', 'content']].copy()
+                return df_filtrado[['date', 'user', 'content']].assign(demonstracao=True)
             
             print(f"⚠️ Arquivo '{FILE_PATH}' encontrado, mas não contém menções suficientes para '{modelo}'. Recorrendo à simulação.")
         
@@ -72,4 +94,4 @@ def coletar_tweets(modelo: str, limite: int = 100) -> pd.DataFrame:
     df_tweets['date'] = pd.to_datetime(df_tweets['date'])
     
     print(f"Simulação de {len(df_tweets)} tweets para '{modelo}'.")
-    return df_tweets[['date', 'user', 'content']]
\ No newline at end of file
+    return df_tweets[['date', 'user', 'content']].assign(demonstracao=True)
\ No newline at end of file
@@ -0,0 +1,402 @@
+# coletor.py
+#
+# Coleta concorrente de várias fontes (X/Twitter, Reclame Aqui) para vários modelos de
+# veículo. Cada fonte é um conector (conectores.py) com limite de taxa (token bucket),
+# concorrência máxima e novas tentativas com backoff exponencial. Os itens são
+# normalizados no esquema comum date,user,content,source (mais modelo e item_id) e
+# acrescentados a data/coleta/coletados.csv; o checkpoint registra os itens já vistos
+# por (fonte, modelo) e o cursor de cada um, então uma nova execução não busca de novo
+# o que já foi coletado.
+#
+# Respostas podem ser gravadas (--gravar DIR) e reproduzidas (--reproduzir DIR) a partir
+# de arquivos JSONL, para executar a coleta localmente sem acesso às fontes.
+#
+# Uso: python coletor.py --modelos HB20 Onix [--fontes x reclameaqui] [--reproduzir ../data/fixtures/coleta]
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+from datetime import datetime
+
+import pandas as pd
+
+from config import COLETA_DIR, COLETA_FONTES, DATA_DIR
+
+COLUNAS_SAIDA = ['date', 'user', 'content', 'source', 'modelo', 'item_id']
+ARQUIVO_THROUGHPUT = os.path.join(DATA_DIR, 'metricas', 'coleta.csv')
+
+
+class Conector:
+    """
+    Interface de uma fonte. `requisicoes` gera, em ordem, as requisições de um modelo
+    (a coleta do modelo para na primeira página vazia ou sem itens novos); `buscar`
+    executa uma requisição de forma bloqueante (roda em uma thread) e retorna uma
+    resposta serializável em JSON; `extrair` transforma a resposta em itens
+    {item_id, date, user, content}.
+    """
+
+    fonte = None
+
+    def requisicoes(self, modelo, cursor):
+        raise NotImplementedError
+
+    def buscar(self, requisicao):
+        raise NotImplementedError
+
+    def extrair(self, resposta):
+        raise NotImplementedError
+
+    def relevante(self, item, modelo):
+        """Se o item deve ser gravado para o modelo (ex.: a página da empresa cita vários modelos)."""
+        return True
+
+    def atualizar_cursor(self, cursor, itens):
+        """Novo cursor do modelo após gravar `itens` (ex.: o maior id visto)."""
+        return cursor
+
+    def transitorio(self, erro):
+        """Se vale tentar de novo: falhas de rede, timeouts, 429 e 5xx."""
+        if isinstance(erro, urllib.error.HTTPError):
+            return erro.code == 429 or erro.code >= 500
+        return isinstance(erro, (urllib.error.URLError, TimeoutError, ConnectionError))
+
+
+class LimitadorTaxa:
+    """Token bucket: até `rajada` requisições imediatas e `taxa_por_segundo` em regime. Sem taxa, não limita."""
+
+    def __init__(self, taxa_por_segundo=None, rajada=1):
+        self.taxa = taxa_por_segundo
+        self.rajada = rajada
+        self._fichas = float(rajada)
+        self._ultimo = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def aguardar(self):
+        """Aguarda uma ficha; retorna quantos segundos esperou."""
+        if not self.taxa:
+            return 0.0
+        esperado = 0.0
+        async with self._lock:
+            while True:
+                agora = time.monotonic()
+                self._fichas = min(self.rajada, self._fichas + (agora - self._ultimo) * self.taxa)
+                self._ultimo = agora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return esperado
+                espera = (1 - self._fichas) / self.taxa
+                await asyncio.sleep(espera)
+                esperado += espera
+
+
+class Checkpoint:
+    """
+    Itens já vistos por (fonte, modelo), em um arquivo por fonte que só recebe acréscimos,
+    e cursores por (fonte, modelo) em cursores.json (gravado de forma atômica). As gravações
+    rodam em threads (fora do laço de eventos), serializadas por um lock.
+    """
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+        self._lock = threading.Lock()
+        self._vistos = {}
+        self._caminho_cursores = os.path.join(diretorio, 'cursores.json')
+        if os.path.exists(self._caminho_cursores):
+            with open(self._caminho_cursores, encoding='utf-8') as f:
+                self._cursores = json.load(f)
+        else:
+            self._cursores = {}
+
+    def _arquivo_vistos(self, fonte):
+        return os.path.join(self.diretorio, f'vistos_{fonte}.txt')
+
+    def vistos(self, fonte):
+        if fonte not in self._vistos:
+            vistos = set()
+            if os.path.exists(self._arquivo_vistos(fonte)):
+                with open(self._arquivo_vistos(fonte), encoding='utf-8') as f:
+                    vistos = {linha.rstrip('\n') for linha in f}
+            self._vistos[fonte] = vistos
+        return self._vistos[fonte]
+
+    def novos(self, fonte, modelo, itens):
+        """Itens ainda não vistos para (fonte, modelo), sem repetições dentro do próprio lote."""
+        vistos = self.vistos(fonte)
+        novos, chaves = [], set()
+        for item in itens:
+            chave = f"{modelo}\t{item['item_id']}"
+            if chave not in vistos and chave not in chaves:
+                chaves.add(chave)
+                novos.append(item)
+        return novos
+
+    def registrar(self, fonte, modelo, itens):
+        chaves = [f"{modelo}\t{item['item_id']}" for item in itens]
+        with self._lock:
+            with open(self._arquivo_vistos(fonte), 'a', encoding='utf-8') as f:
+                f.writelines(chave + '\n' for chave in chaves)
+            self.vistos(fonte).update(chaves)
+
+    def cursor(self, fonte, modelo):
+        return dict(self._cursores.get(fonte, {}).get(modelo, {}))
+
+    def salvar_cursor(self, fonte, modelo, cursor):
+        with self._lock:
+            self._cursores.setdefault(fonte, {})[modelo] = cursor
+            temporario = self._caminho_cursores + '.tmp'
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(self._cursores, f, ensure_ascii=False, indent=1)
+            os.replace(temporario, self._caminho_cursores)
+
+
+class Cassete:
+    """
+    Gravação e reprodução das respostas brutas, um arquivo JSONL por fonte
+    ({"requisicao": ..., "resposta": ...}). Na reprodução, uma requisição não gravada
+    retorna None (página vazia), encerrando a coleta daquele modelo.
+    """
+
+    def __init__(self, diretorio, modo):
+        self.diretorio = diretorio
+        self.modo = modo
+        self._respostas = {}
+
+    @staticmethod
+    def _chave(requisicao):
+        return json.dumps(requisicao, sort_keys=True, ensure_ascii=False)
+
+    def _carregar(self, fonte):
+        if fonte not in self._respostas:
+            respostas = {}
+            caminho = os.path.join(self.diretorio, f'{fonte}.jsonl')
+            if os.path.exists(caminho):
+                with open(caminho, encoding='utf-8') as f:
+                    for linha in f:
+                        if linha.strip():
+                            registro = json.loads(linha)
+                            respostas[self._chave(registro['requisicao'])] = registro['resposta']
+            self._respostas[fonte] = respostas
+        return self._respostas[fonte]
+
+    def envolver(self, conector):
+        """Função de busca do conector, gravando ou reproduzindo as respostas."""
+        if self.modo == 'reproduzir':
+            respostas = self._carregar(conector.fonte)
+            return lambda requisicao: respostas.get(self._chave(requisicao))
+
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = os.path.join(self.diretorio, f'{conector.fonte}.jsonl')
+
+        def buscar_e_gravar(requisicao):
+            resposta = conector.buscar(requisicao)
+            with open(caminho, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'requisicao': requisicao, 'resposta': resposta}, ensure_ascii=False) + '\n')
+            return resposta
+        return buscar_e_gravar
+
+
+class EstatisticasFonte:
+    """Contadores de uma fonte durante a coleta, para o relatório de vazão."""
+
+    def __init__(self, fonte):
+        self.fonte = fonte
+        self.requisicoes = 0
+        self.retentativas = 0
+        self.falhas = 0
+        self.itens = 0
+        self.novos = 0
+        self.gravados = 0
+        self.espera_taxa_s = 0.0
+        self.inicio = None
+        self.fim = None
+
+    def resumo(self):
+        duracao = (self.fim - self.inicio) if self.inicio is not None and self.fim is not None else 0.0
+        return {
+            'fonte': self.fonte,
+            'requisicoes': self.requisicoes,
+            'retentativas': self.retentativas,
+            'falhas': self.falhas,
+            'itens': self.itens,
+            'novos': self.novos,
+            'gravados': self.gravados,
+            'espera_taxa_s': self.espera_taxa_s,
+            'duracao_s': duracao,
+            'itens/s': self.itens / duracao if duracao > 0 else 0.0,
+            'gravados/s': self.gravados / duracao if duracao > 0 else 0.0,
+        }
+
+
+def chave_modelo(modelo):
+    """Chave do modelo na coleta e no dashboard: o primeiro termo, em maiúsculas (ex.: 'HB20' de 'hb20 sedan')."""
+    return modelo.split()[0].upper()
+
+
+def _data_iso(valor):
+    """Datas das fontes em ISO 8601, sempre em UTC (None se ausente ou inválida); datas sem fuso são tomadas como UTC."""
+    if not valor:
+        return None
+    data = pd.to_datetime(valor, errors='coerce', dayfirst=isinstance(valor, str) and '/' in valor)
+    if pd.isna(data):
+        return None
+    data = data.tz_localize('UTC') if data.tzinfo is None else data.tz_convert('UTC')
+    return data.isoformat()
+
+
+def normalizar(item, fonte, modelo):
+    """Item de um conector no esquema comum de saída."""
+    return {
+        'date': _data_iso(item.get('date')),
+        'user': item.get('user'),
+        'content': ' '.join(str(item.get('content') or '').split()),
+        'source': fonte,
+        'modelo': modelo,
+        'item_id': item['item_id'],
+    }
+
+
+class Coletor:
+    """Orquestra a coleta concorrente de (fonte, modelo), com limites por fonte e checkpoint."""
+
+    def __init__(self, conectores, diretorio=COLETA_DIR, limites=COLETA_FONTES, cassete=None, max_paginas=None,
+                 espera_base=1.0):
+        self.conectores = {conector.fonte: conector for conector in conectores}
+        self.diretorio = diretorio
+        self.checkpoint = Checkpoint(os.path.join(diretorio, 'checkpoint'))
+        self.arquivo_saida = os.path.join(diretorio, 'coletados.csv')
+        self.max_paginas = max_paginas
+        self.espera_base = espera_base
+        self._lock_saida = threading.Lock()
+        self.estatisticas = {fonte: EstatisticasFonte(fonte) for fonte in self.conectores}
+
+        self._buscar = {}
+        self._limitadores = {}
+        self._semaforos = {}
+        self._tentativas = {}
+        for fonte, conector in self.conectores.items():
+            limite = limites.get(fonte, {})
+            self._buscar[fonte] = cassete.envolver(conector) if cassete else conector.buscar
+            # Na reprodução não há servidor remoto a proteger: sem limite de taxa
+            reproduzindo = cassete is not None and cassete.modo == 'reproduzir'
+            self._limitadores[fonte] = LimitadorTaxa(None if reproduzindo else limite.get('taxa_por_segundo'), limite.get('rajada', 1))
+            self._semaforos[fonte] = asyncio.Semaphore(limite.get('concorrencia', 1))
+            self._tentativas[fonte] = limite.get('tentativas', 3)
+
+    async def _buscar_com_tentativas(self, fonte, requisicao):
+        conector = self.conectores[fonte]
+        estatisticas = self.estatisticas[fonte]
+        tentativas = self._tentativas[fonte]
+        for tentativa in range(1, tentativas + 1):
+            estatisticas.espera_taxa_s += await self._limitadores[fonte].aguardar()
+            async with self._semaforos[fonte]:
+                estatisticas.requisicoes += 1
+                try:
+                    return await asyncio.to_thread(self._buscar[fonte], requisicao)
+                except Exception as e:
+                    if tentativa == tentativas or not conector.transitorio(e):
+                        raise
+                    estatisticas.retentativas += 1
+            # Backoff exponencial com jitter, fora do semáforo
+            await asyncio.sleep(self.espera_base * 2 ** (tentativa - 1) * (1 + random.random()))
+
+    def _gravar(self, linhas):
+        # Roda em uma thread; o lock impede que modelos coletados em paralelo intercalem linhas
+        with self._lock_saida:
+            novo_arquivo = not os.path.exists(self.arquivo_saida)
+            with open(self.arquivo_saida, 'a', encoding='utf-8', newline='') as f:
+                escritor = csv.DictWriter(f, fieldnames=COLUNAS_SAIDA)
+                if novo_arquivo:
+                    escritor.writeheader()
+                escritor.writerows(linhas)
+
+    async def _coletar_modelo(self, fonte, modelo):
+        conector = self.conectores[fonte]
+        estatisticas = self.estatisticas[fonte]
+        cursor = self.checkpoint.cursor(fonte, modelo)
+
+        for pagina, requisicao in enumerate(conector.requisicoes(modelo, cursor), start=1):
+            if self.max_paginas and pagina > self.max_paginas:
+                break
+            try:
+                resposta = await self._buscar_com_tentativas(fonte, requisicao)
+            except Exception as e:
+                estatisticas.falhas += 1
+                print(f"❌ {fonte}/{modelo}: falha em {requisicao}: {e}")
+                break
+
+            itens = conector.extrair(resposta) if resposta else []
+            novos = self.checkpoint.novos(fonte, modelo, itens)
+            estatisticas.itens += len(itens)
+            estatisticas.novos += len(novos)
+            if not novos:
+                break
+
+            # Grava a saída antes do checkpoint: uma interrupção entre os dois repete itens, mas não perde nenhum
+            linhas = [normalizar(item, fonte, modelo) for item in novos if conector.relevante(item, modelo)]
+            # Gravações em disco fora do laço de eventos, para não bloquear as demais coletas
+            if linhas:
+                await asyncio.to_thread(self._gravar, linhas)
+            estatisticas.gravados += len(linhas)
+            await asyncio.to_thread(self.checkpoint.registrar, fonte, modelo, novos)
+            cursor = conector.atualizar_cursor(cursor, novos)
+            await asyncio.to_thread(self.checkpoint.salvar_cursor, fonte, modelo, cursor)
+
+    async def _coletar_fonte(self, fonte, modelos):
+        estatisticas = self.estatisticas[fonte]
+        estatisticas.inicio = time.perf_counter()
+        # Carrega os itens já vistos da fonte uma vez, fora do laço de eventos
+        await asyncio.to_thread(self.checkpoint.vistos, fonte)
+        await asyncio.gather(*(self._coletar_modelo(fonte, modelo) for modelo in modelos))
+        estatisticas.fim = time.perf_counter()
+
+    async def coletar(self, modelos):
+        """Coleta todos os modelos em todas as fontes, concorrentemente. Retorna o resumo por fonte."""
+        modelos = list(dict.fromkeys(chave_modelo(modelo) for modelo in modelos))
+        await asyncio.gather(*(self._coletar_fonte(fonte, modelos) for fonte in self.conectores))
+        return pd.DataFrame([estatisticas.resumo() for estatisticas in self.estatisticas.values()])
+
+
+def carregar_coletados(diretorio=COLETA_DIR):
+    """Itens coletados (esquema comum), ou um DataFrame vazio se ainda não houver coleta."""
+    caminho = os.path.join(diretorio, 'coletados.csv')
+    if not os.path.exists(caminho):
+        return pd.DataFrame(columns=COLUNAS_SAIDA)
+    return pd.read_csv(caminho, encoding='utf-8', dtype={'item_id': str, 'user': str})
+
+
+if __name__ == '__main__':
+    from conectores import criar_conectores
+
+    parser = argparse.ArgumentParser(description="Coleta concorrente de várias fontes para vários modelos.")
+    parser.add_argument('--modelos', nargs='+', required=True)
+    parser.add_argument('--fontes', nargs='+', default=sorted(COLETA_FONTES), choices=sorted(COLETA_FONTES))
+    parser.add_argument('--diretorio', default=COLETA_DIR, help="Saída (coletados.csv) e checkpoint.")
+    parser.add_argument('--limite', type=int, default=500, help="Máximo de tweets por modelo em cada execução.")
+    parser.add_argument('--paginas', type=int, default=5, help="Máximo de páginas por modelo (fontes paginadas).")
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument('--gravar', metavar='DIR', help="Grava as respostas brutas em DIR/<fonte>.jsonl.")
+    grupo.add_argument('--reproduzir', metavar='DIR', help="Usa as respostas gravadas em DIR, sem acessar as fontes.")
+    args = parser.parse_args()
+
+    cassete = None
+    if args.gravar:
+        cassete = Cassete(args.gravar, 'gravar')
+    elif args.reproduzir:
+        cassete = Cassete(args.reproduzir, 'reproduzir')
+
+    coletor = Coletor(criar_conectores(args.fontes, limite_tweets=args.limite), args.diretorio, cassete=cassete, max_paginas=args.paginas)
+    print(f"--- Coletando {', '.join(args.modelos)} de {', '.join(args.fontes)}{' (reprodução)' if args.reproduzir else ''} ---")
+    resumo = asyncio.run(coletor.coletar(args.modelos))
+    print(resumo.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+    resumo.insert(0, 'timestamp', datetime.now().isoformat(timespec='seconds'))
+    os.makedirs(os.path.dirname(ARQUIVO_THROUGHPUT), exist_ok=True)
+    resumo.to_csv(ARQUIVO_THROUGHPUT, mode='a', header=not os.path.exists(ARQUIVO_THROUGHPUT), index=False)
+    print(f"\n✅ Itens novos gravados em '{coletor.arquivo_saida}'; vazão registrada em '{ARQUIVO_THROUGHPUT}'")
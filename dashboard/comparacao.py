@@ -0,0 +1,146 @@
+# comparacao.py
+#
+# Motor de comparação entre N modelos de veículo. Trabalha sobre os resultados já
+# armazenados (contagens diárias de sentimentos_contagens), sem nova inferência: a
+# distribuição, a tendência e os tópicos de todos os modelos são calculados de uma
+# vez, e a seleção no dashboard apenas filtra a matriz pronta.
+
+import numpy as np
+import pandas as pd
+
+SENTIMENTOS = ['POSITIVO', 'NEUTRO', 'NEGATIVO']
+
+# Mesmas stopwords usadas em get_top_topics (app.py)
+STOP_WORDS_TOPICOS = ['o', 'a', 'de', 'do', 'da', 'é', 'um', 'uma', 'e', 'para', 'se']
+
+COLUNAS_MATRIZ = [
+    'Tweets', 'Positivo (%)', 'Neutro (%)', 'Negativo (%)',
+    'Índice Líquido (pp)', 'Δ Índice (pp)', 'Tópicos Positivos', 'Tópicos Negativos'
+]
+
+
+def _tabela_sentimentos(rollup, indice):
+    """Pivota as contagens do rollup em uma coluna por sentimento."""
+    return (
+        rollup.pivot_table(index=indice, columns='sentimento', values='quantidade', aggfunc='sum', fill_value=0)
+        .reindex(columns=SENTIMENTOS, fill_value=0)
+    )
+
+
+def distribuicao_por_modelo(rollup):
+    """Total de tweets e percentual de cada sentimento por modelo."""
+    tabela = _tabela_sentimentos(rollup, 'modelo')
+    total = tabela.sum(axis=1)
+    percentuais = tabela.div(total.replace(0, np.nan), axis=0).mul(100).fillna(0.0)
+    return total, percentuais
+
+
+def tendencia_por_modelo(rollup, janela_dias=30, referencia=None):
+    """
+    Variação do índice líquido (% positivo - % negativo, em pontos percentuais) entre
+    os últimos `janela_dias` e a janela imediatamente anterior, contados a partir da
+    data mais recente dos dados. NaN quando algum dos períodos não tem tweets.
+    """
+    dias = pd.to_datetime(rollup['dia'])
+    referencia = dias.max() if referencia is None else pd.Timestamp(referencia)
+    idade = (referencia - dias).dt.days
+
+    periodo = np.select([idade < janela_dias, idade < 2 * janela_dias], ['atual', 'anterior'], default='')
+    no_periodo = periodo != ''
+    if not no_periodo.any():
+        return pd.Series(np.nan, index=pd.Index([], name='modelo'))
+
+    tabela = _tabela_sentimentos(rollup[no_periodo].assign(periodo=periodo[no_periodo]), ['modelo', 'periodo'])
+    liquido = (tabela['POSITIVO'] - tabela['NEGATIVO']) / tabela.sum(axis=1) * 100
+    liquido = liquido.unstack('periodo').reindex(columns=['atual', 'anterior'])
+    return liquido['atual'] - liquido['anterior']
+
+
+def topicos_por_modelo(textos, n=3, max_features=5000):
+    """
+    Principais termos TF-IDF por (modelo, sentimento) em uma única vetorização:
+    a matriz documento x termo é somada por grupo com uma multiplicação esparsa.
+    """
+    colunas = ['Tópicos Positivos', 'Tópicos Negativos']
+    textos = textos[textos['sentimento'].isin(['POSITIVO', 'NEGATIVO'])].dropna(subset=['texto_limpo'])
+    if textos.empty:
+        return pd.DataFrame(columns=colunas)
+
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(max_features=max_features, stop_words=STOP_WORDS_TOPICOS, ngram_range=(1, 2))
+    try:
+        tfidf_matrix = vectorizer.fit_transform(textos['texto_limpo'])
+    except ValueError:
+        return pd.DataFrame(columns=colunas)
+
+    codigos, grupos = pd.factorize(pd.MultiIndex.from_frame(textos[['modelo', 'sentimento']]))
+    indicadora = sparse.csr_matrix(
+        (np.ones(len(codigos)), (codigos, np.arange(len(codigos)))),
+        shape=(len(grupos), len(codigos))
+    )
+    somas = (indicadora @ tfidf_matrix).toarray()
+
+    n = min(n, somas.shape[1])
+    melhores = np.argsort(-somas, axis=1)[:, :n]
+    termos = vectorizer.get_feature_names_out()
+
+    topicos = pd.DataFrame(index=pd.Index(sorted(set(grupos.get_level_values(0))), name='modelo'), columns=colunas)
+    for g, (modelo, sentimento) in enumerate(grupos):
+        top_terms = [termos[j] for j in melhores[g] if somas[g, j] > 0]
+        coluna = 'Tópicos Positivos' if sentimento == 'POSITIVO' else 'Tópicos Negativos'
+        topicos.loc[modelo, coluna] = " e ".join(top_terms) if top_terms else "Nenhuma menção significativa."
+    return topicos
+
+
+def montar_matriz_comparacao(rollup, textos, janela_dias=30, n_topicos=3, desde=None):
+    """
+    Matriz de comparação de todos os modelos presentes nos resultados armazenados. Com
+    `desde`, a distribuição considera apenas os dias a partir dele; a tendência usa todo o
+    rollup recebido (que deve incluir a janela anterior).
+    """
+    no_periodo = rollup if desde is None else rollup[pd.to_datetime(rollup['dia']) >= pd.Timestamp(desde)]
+    if no_periodo.empty:
+        return pd.DataFrame(columns=COLUNAS_MATRIZ, index=pd.Index([], name='modelo'))
+
+    total, percentuais = distribuicao_por_modelo(no_periodo)
+    matriz = pd.DataFrame({
+        'Tweets': total,
+        'Positivo (%)': percentuais['POSITIVO'],
+        'Neutro (%)': percentuais['NEUTRO'],
+        'Negativo (%)': percentuais['NEGATIVO'],
+    })
+    matriz['Índice Líquido (pp)'] = matriz['Positivo (%)'] - matriz['Negativo (%)']
+    matriz['Δ Índice (pp)'] = tendencia_por_modelo(rollup, janela_dias)
+    matriz = matriz.join(topicos_por_modelo(textos, n_topicos))
+    return matriz.reindex(columns=COLUNAS_MATRIZ)
+
+
+def matriz_de_historico(ultimas):
+    """
+    Matriz mínima (só a distribuição) a partir das últimas análises do histórico,
+    para modelos analisados antes de existirem resultados por tweet armazenados.
+    """
+    linhas = {
+        modelo: {
+            'Positivo (%)': analise['Positivo'],
+            'Neutro (%)': analise['Neutro'],
+            'Negativo (%)': analise['Negativo'],
+            'Índice Líquido (pp)': analise['Positivo'] - analise['Negativo'],
+        }
+        for modelo, analise in ultimas.items()
+    }
+    matriz = pd.DataFrame.from_dict(linhas, orient='index').reindex(columns=COLUNAS_MATRIZ)
+    matriz.index.name = 'modelo'
+    return matriz
+
+
+def combinar_matrizes(matriz_resultados, matriz_historico):
+    """Prioriza os resultados por tweet; o histórico completa os modelos que faltam."""
+    faltantes = matriz_historico.drop(index=matriz_resultados.index, errors='ignore')
+    if faltantes.empty:
+        return matriz_resultados
+    if matriz_resultados.empty:
+        return faltantes
+    return pd.concat([matriz_resultados, faltantes])
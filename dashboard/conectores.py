@@ -0,0 +1,132 @@
+# conectores.py
+#
+# Conectores das fontes do coletor (coletor.py): X/Twitter via snscrape (como em
+# notebooks/00_coleta_tweets.ipynb) e Reclame Aqui via HTML da lista de reclamações da
+# empresa (como em notebooks/13_reclameaqui_coleta.ipynb). snscrape e BeautifulSoup são
+# importados só ao buscar/extrair, então a reprodução de respostas gravadas do X não
+# precisa do snscrape.
+
+import hashlib
+import itertools
+import re
+import urllib.request
+
+from coletor import Conector, chave_modelo
+from config import RECLAMEAQUI_EMPRESAS
+
+URL_RECLAMEAQUI = "https://www.reclameaqui.com.br/empresa/{empresa}/lista-reclamacoes/?pagina={pagina}"
+USER_AGENT = "Mozilla/5.0 (compatible; tcc-autos-coletor/1.0)"
+PADRAO_DATA = re.compile(r'\b\d{2}/\d{2}/\d{4}\b')
+
+
+def _termo_modelo(modelo):
+    """Termo usado para buscar/filtrar o modelo (ex.: 'hb20' de 'HB20 2020')."""
+    return chave_modelo(modelo).lower()
+
+
+class ConectorX(Conector):
+    """Tweets em português que citam o modelo; o cursor guarda o maior id já coletado."""
+
+    fonte = 'x'
+
+    def __init__(self, limite_por_modelo=500):
+        self.limite_por_modelo = limite_por_modelo
+
+    def requisicoes(self, modelo, cursor):
+        # Uma busca por modelo: o snscrape pagina internamente até o limite
+        consulta = f'"{_termo_modelo(modelo)}" lang:pt'
+        if cursor.get('ultimo_id'):
+            consulta += f" since_id:{cursor['ultimo_id']}"
+        yield {'consulta': consulta}
+
+    def buscar(self, requisicao):
+        import snscrape.modules.twitter as sntwitter
+
+        tweets = sntwitter.TwitterSearchScraper(requisicao['consulta']).get_items()
+        return [
+            {
+                'id': str(tweet.id),
+                'date': tweet.date.isoformat(),
+                'user': tweet.user.username,
+                'content': getattr(tweet, 'rawContent', None) or tweet.content,
+            }
+            for tweet in itertools.islice(tweets, self.limite_por_modelo)
+        ]
+
+    def extrair(self, resposta):
+        return [
+            {'item_id': tweet['id'], 'date': tweet['date'], 'user': tweet['user'], 'content': tweet['content']}
+            for tweet in resposta
+        ]
+
+    def atualizar_cursor(self, cursor, itens):
+        ids = [int(item['item_id']) for item in itens if str(item['item_id']).isdigit()]
+        if ids:
+            cursor['ultimo_id'] = max(ids + [int(cursor.get('ultimo_id', 0))])
+        return cursor
+
+
+class ConectorReclameAqui(Conector):
+    """
+    Reclamações da página da empresa do modelo, página a página. A página da empresa
+    cita vários modelos, então só as reclamações que mencionam o modelo são gravadas.
+    """
+
+    fonte = 'reclameaqui'
+
+    def __init__(self, empresas=RECLAMEAQUI_EMPRESAS, url=URL_RECLAMEAQUI, timeout=30):
+        self.empresas = {chave_modelo(modelo): empresa for modelo, empresa in empresas.items()}
+        self.url = url
+        self.timeout = timeout
+
+    def requisicoes(self, modelo, cursor):
+        empresa = self.empresas.get(chave_modelo(modelo))
+        if empresa is None:
+            print(f"⚠️ reclameaqui: nenhuma empresa configurada para '{modelo}' (RECLAMEAQUI_EMPRESAS).")
+            return
+        # As reclamações mais recentes vêm primeiro: a coleta para na primeira página sem novidades
+        for pagina in itertools.count(1):
+            yield {'url': self.url.format(empresa=empresa, pagina=pagina)}
+
+    def buscar(self, requisicao):
+        pedido = urllib.request.Request(requisicao['url'], headers={'User-Agent': USER_AGENT})
+        with urllib.request.urlopen(pedido, timeout=self.timeout) as resposta:
+            return resposta.read().decode('utf-8', errors='replace')
+
+    def extrair(self, resposta):
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(resposta, 'html.parser')
+        itens = []
+        # Como no notebook, cada reclamação tem o título em um <h4>; o link, a descrição
+        # e a data (dd/mm/aaaa), quando presentes, ficam no mesmo bloco
+        for titulo in soup.find_all('h4'):
+            texto_titulo = titulo.get_text(' ', strip=True)
+            if not texto_titulo:
+                continue
+            link = titulo.find_parent('a') or titulo.find('a')
+            bloco = (link or titulo).parent
+            descricao = bloco.find('p') if bloco else None
+            conteudo = texto_titulo if descricao is None else f"{texto_titulo}. {descricao.get_text(' ', strip=True)}"
+            data = PADRAO_DATA.search(bloco.get_text(' ', strip=True)) if bloco else None
+            href = link.get('href') if link else None
+
+            itens.append({
+                'item_id': href or hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:16],
+                'date': data.group(0) if data else None,
+                'user': None,  # O Reclame Aqui não expõe o autor na listagem
+                'content': conteudo,
+            })
+        return itens
+
+    def relevante(self, item, modelo):
+        return _termo_modelo(modelo) in item['content'].lower()
+
+
+def criar_conectores(fontes, limite_tweets=500):
+    """Instancia os conectores das fontes pedidas."""
+    fabricas = {
+        'x': lambda: ConectorX(limite_por_modelo=limite_tweets),
+        'reclameaqui': ConectorReclameAqui,
+    }
+    return [fabricas[fonte]() for fonte in fontes]
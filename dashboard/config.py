@@ -1,9 +1,71 @@
 # config.py
 
+import os
+
 DB_CONFIG = {
     "database": "tcc_autos",
     "user": "root",
     "password": "",
     "host": "localhost", # ou o IP do seu servidor
     "port": 3306
-}
\ No newline at end of file
+}
+
+# Diretório base para arquivos gerados localmente (métricas, caches, índices)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+# Arquivo CSV onde são registrados tempos de import, carga do modelo e primeira renderização
+METRICAS_PATH = os.path.join(DATA_DIR, 'metricas', 'inicializacao.csv')
+
+# Tempo de vida (segundos) do histórico em cache no dashboard; gravações feitas
+# pelo próprio dashboard invalidam o cache imediatamente
+CACHE_TTL_SEGUNDOS = 300
+
+# Diretório do armazenamento de embeddings (vetores float16 mapeados em memória)
+EMBEDDINGS_DIR = os.path.join(DATA_DIR, 'embeddings')
+
+# Comparação de modelos: janela (dias) da tendência e textos recentes por modelo usados nos tópicos
+# (300 por modelo mantém a vetorização dos tópicos de 30 modelos abaixo de 0,2s). Sem período
+# selecionado, os tópicos vêm dos últimos COMPARACAO_TOPICOS_DIAS (a consulta lê só essas partições)
+COMPARACAO_JANELA_DIAS = 30
+COMPARACAO_TEXTOS_POR_MODELO = 300
+COMPARACAO_TOPICOS_DIAS = 90
+
+# Modelo TF-IDF + Naive Bayes salvo por src/analise_sentimento_hb20_onix.py (primeiro estágio da cascata)
+MODELO_NB_PATH = os.path.join(DATA_DIR, 'modelos', 'modelo_nb_tfidf.joblib')
+# Textos rotulados deixados fora do treino desse modelo (avaliação da cascata em avaliar_cascata.py)
+MODELO_NB_TESTE_PATH = os.path.join(DATA_DIR, 'modelos', 'modelo_nb_tfidf_teste.csv')
+
+# Cascata: textos com confiança do primeiro estágio abaixo do limiar seguem para o BERTimbau
+CASCATA_LIMIAR_PADRAO = 0.8
+
+# Serviço local de inferência (servidor_inferencia.py). Se o serviço responder em INFERENCIA_URL,
+# o dashboard e os scripts offline classificam por ele em vez de carregar o modelo
+# (INFERENCIA_URL vazia desativa o uso do serviço)
+INFERENCIA_HOST = "127.0.0.1"
+INFERENCIA_PORTA = 8001
+INFERENCIA_URL = os.environ.get("INFERENCIA_URL", f"http://{INFERENCIA_HOST}:{INFERENCIA_PORTA}")
+INFERENCIA_TIMEOUT_SEGUNDOS = 120
+
+# Léxico de aspectos ({"aspecto": ["termo", "prefixo*", "-expressão ignorada", ...]}); sem o arquivo, usa o padrão de aspectos.py
+ASPECTOS_LEXICO_PATH = os.path.join(DATA_DIR, 'aspectos.json')
+
+# Coletor multi-fonte (coletor.py): saída normalizada, checkpoints e limites por fonte
+COLETA_DIR = os.path.join(DATA_DIR, 'coleta')
+COLETA_FONTES = {
+    # taxa_por_segundo/rajada: token bucket por fonte; concorrencia: requisições simultâneas;
+    # tentativas: número máximo de tentativas em erros transitórios (rede, 429, 5xx)
+    'x': {'taxa_por_segundo': 0.5, 'rajada': 1, 'concorrencia': 1, 'tentativas': 3},
+    'reclameaqui': {'taxa_por_segundo': 1.0, 'rajada': 2, 'concorrencia': 2, 'tentativas': 4},
+}
+
+# Empresa (slug da URL no Reclame Aqui) de cada modelo coletado
+RECLAMEAQUI_EMPRESAS = {
+    'HB20': 'hyundai-motor-brasil',
+    'ONIX': 'chevrolet',
+}
+
+# Retenção (retencao.py): meses mantidos nas partições ativas de tweets_raw/tweets_processed;
+# os anteriores são arquivados em ARQUIVO_DIR (CSV gzip); as contagens agregadas são mantidas
+RETENCAO_MESES = 12
+RETENCAO_PARTICOES_FUTURAS = 3
+ARQUIVO_DIR = os.path.join(DATA_DIR, 'arquivo')
@@ -1,6 +1,9 @@
 # db_connector.py (Ajustado para mysql.connector)
 
+import hashlib
 import mysql.connector
+from collections import Counter
+from datetime import date, datetime
 from config import DB_CONFIG
 import pandas as pd
 
@@ -14,20 +17,171 @@ def get_db_connection():
         return None
 
 def insert_processed_tweet(conn, modelo, data, usuario, texto_original, texto_limpo, sentimento, score):
-    """Insere um tweet processado na tabela tweets_processed."""
+    """Insere um tweet processado na tabela tweets_processed (ver insert_processed_tweets)."""
+    insert_processed_tweets(conn, [(modelo, data, usuario, texto_original, texto_limpo, sentimento, score)])
+
+def _somar_contagens_aspectos(cur, contagens):
+    """Soma contagens {(modelo, aspecto, sentimento, dia): quantidade} em aspectos_contagens."""
+    cur.executemany("""
+        INSERT INTO aspectos_contagens (modelo, aspecto, sentimento, dia, quantidade)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE quantidade = quantidade + VALUES(quantidade);
+    """, [(*chave, quantidade) for chave, quantidade in contagens.items()])
+
+def _somar_contagens_sentimentos(cur, contagens):
+    """Soma contagens {(classificador, versao, modelo, dia, sentimento): quantidade} em sentimentos_contagens."""
+    cur.executemany("""
+        INSERT INTO sentimentos_contagens (classificador, versao, modelo, dia, sentimento, quantidade)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE quantidade = quantidade + VALUES(quantidade);
+    """, [(*chave, quantidade) for chave, quantidade in contagens.items()])
+
+def contar_sentimentos(registros, classificador=None, versao=None):
+    """
+    Contagens por (classificador, versao, MODELO, dia, sentimento) de registros de tweets processados,
+    sob ('', '') (sentimento gravado em tweets_processed) e, se informados, sob (classificador, versao).
+    Tweets sem data contam no dia atual, a data com que são gravados.
+    """
+    contagens = Counter()
+    hoje = date.today()
+    fontes = [('', '')] + ([(classificador, versao)] if classificador is not None else [])
+    for modelo, data, _, _, _, sentimento, _ in registros:
+        if not sentimento:
+            continue
+        dia = data.date() if hasattr(data, 'date') else (data or hoje)
+        for fonte in fontes:
+            contagens[(*fonte, modelo.upper(), dia, sentimento)] += 1
+    return contagens
+
+def chave_tweet(modelo, data, texto_original):
+    """
+    Chave de deduplicação de tweets_processed: SHA-1 de (MODELO, texto original, data gravada),
+    a mesma expressão usada para preencher os tweets existentes em db/migracoes/005.
+    """
+    partes = [modelo.upper(), texto_original or '', f"{data:%Y-%m-%d %H:%M:%S}"]
+    return hashlib.sha1('\x1f'.join(partes).encode('utf-8')).hexdigest()
+
+def insert_processed_tweets(conn, registros, classificador=None, versao=None, agregar_aspectos=None):
+    """
+    Insere em lote tweets processados na tabela tweets_processed, ignorando os já gravados
+    (mesma chave_tweet). Cada registro é uma tupla
+    (modelo, data, usuario, texto_original, texto_limpo, sentimento, score).
+    Se classificador/versão forem informados, o resultado dos tweets inseridos (e só deles) também
+    é registrado em tweets_resultados. As contagens diárias de sentimento e, com
+    `agregar_aspectos` (função que recebe os registros inseridos e retorna as contagens de
+    aspectos, ver aspectos.contar_aspectos), as de aspectos desses tweets são somadas na mesma
+    transação. Retorna quantos tweets foram inseridos (None em caso de erro).
+    Tweets sem data são gravados no início do dia atual (a tabela é particionada por data e a
+    data faz parte da chave), e o modelo em maiúsculas, para que as consultas agrupem e filtrem
+    pela coluna (índice (modelo, data)).
+    """
+    hoje = datetime.combine(date.today(), datetime.min.time())
+    try:
+        with conn.cursor() as cur:
+            # Uma linha por vez: o id de cada tweet vem de lastrowid, sem depender de ids
+            # consecutivos no INSERT em lote nem de inserções concorrentes, e rowcount indica
+            # se a linha foi inserida ou já existia
+            ids, inseridos = [], []
+            for registro in registros:
+                # DATETIME sem frações de segundo: a chave usa a data como será gravada
+                data = registro[1].replace(microsecond=0) if registro[1] is not None else hoje
+                modelo, texto_original = registro[0].upper(), registro[3]
+                cur.execute("""
+                    INSERT IGNORE INTO tweets_processed
+                        (chave, modelo, data, usuario, texto_original, texto_limpo, sentimento, score, classificador, versao)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+                """, (chave_tweet(modelo, data, texto_original), modelo, data, *registro[2:], classificador, versao))
+                if cur.rowcount == 1:
+                    ids.append(cur.lastrowid)
+                    inseridos.append((modelo, data, *registro[2:]))
+
+            if classificador is not None and inseridos:
+                cur.executemany("""
+                    INSERT INTO tweets_resultados (tweet_id, classificador, versao, sentimento, score)
+                    VALUES (%s, %s, %s, %s, %s);
+                """, [(tweet_id, classificador, versao, registro[5], registro[6]) for tweet_id, registro in zip(ids, inseridos)])
+
+            contagens_sentimentos = contar_sentimentos(inseridos, classificador, versao)
+            if contagens_sentimentos:
+                _somar_contagens_sentimentos(cur, contagens_sentimentos)
+            contagens_aspectos = agregar_aspectos(inseridos) if agregar_aspectos and inseridos else None
+            if contagens_aspectos:
+                _somar_contagens_aspectos(cur, contagens_aspectos)
+            conn.commit()
+        return len(inseridos)
+    except mysql.connector.Error as e:
+        print(f"Erro ao inserir tweets processados: {e}")
+        conn.rollback()
+        return None
+
+def fetch_tweets_sem_resultado(conn, classificador, versao, limite, apos_id=0):
+    """Busca (id, texto_limpo) de tweets sem resultado para a versão do classificador, em ordem de id."""
     try:
         with conn.cursor() as cur:
             cur.execute("""
-                INSERT INTO tweets_processed (modelo, data, usuario, texto_original, texto_limpo, sentimento, score)
-                VALUES (%s, %s, %s, %s, %s, %s, %s);
-            """, (modelo, data, usuario, texto_original, texto_limpo, sentimento, score))
+                SELECT p.id, p.texto_limpo
+                FROM tweets_processed p
+                LEFT JOIN tweets_resultados r
+                    ON r.tweet_id = p.id AND r.classificador = %s AND r.versao = %s
+                WHERE r.tweet_id IS NULL AND p.id > %s
+                ORDER BY p.id
+                LIMIT %s;
+            """, (classificador, versao, apos_id, limite))
+            return cur.fetchall()
+    except mysql.connector.Error as e:
+        print(f"Erro ao buscar tweets pendentes: {e}")
+        return []
+
+def insert_classifier_results(conn, classificador, versao, resultados):
+    """
+    Grava resultados (tweet_id, sentimento, score) de uma versão de classificador e, na mesma
+    transação, soma as contagens diárias de sentimento da versão e acumula a concordância
+    desses tweets com os demais classificadores.
+    """
+    if not resultados:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.executemany("""
+                INSERT INTO tweets_resultados (tweet_id, classificador, versao, sentimento, score)
+                VALUES (%s, %s, %s, %s, %s);
+            """, [(tweet_id, classificador, versao, sentimento, score) for tweet_id, sentimento, score in resultados])
+
+            marcadores = ', '.join(['%s'] * len(resultados))
+            ids = [tweet_id for tweet_id, _, _ in resultados]
+            cur.execute(f"""
+                INSERT INTO sentimentos_contagens (classificador, versao, modelo, dia, sentimento, quantidade)
+                SELECT r.classificador, r.versao, p.modelo, DATE(p.data), r.sentimento, COUNT(*)
+                FROM tweets_resultados r
+                JOIN tweets_processed p ON p.id = r.tweet_id
+                WHERE r.classificador = %s AND r.versao = %s AND r.sentimento IS NOT NULL AND r.tweet_id IN ({marcadores})
+                GROUP BY r.classificador, r.versao, p.modelo, DATE(p.data), r.sentimento
+                ON DUPLICATE KEY UPDATE quantidade = quantidade + VALUES(quantidade);
+            """, (classificador, versao, *ids))
+
+            cur.execute(f"""
+                INSERT INTO concordancia_classificadores
+                    (classificador_a, versao_a, classificador_b, versao_b, sentimento_a, sentimento_b, quantidade)
+                SELECT novo.classificador, novo.versao, outro.classificador, outro.versao,
+                       novo.sentimento, outro.sentimento, COUNT(*)
+                FROM tweets_resultados novo
+                JOIN tweets_resultados outro
+                    ON outro.tweet_id = novo.tweet_id
+                    AND NOT (outro.classificador = novo.classificador AND outro.versao = novo.versao)
+                WHERE novo.classificador = %s AND novo.versao = %s AND novo.tweet_id IN ({marcadores})
+                GROUP BY novo.classificador, novo.versao, outro.classificador, outro.versao,
+                         novo.sentimento, outro.sentimento
+                ON DUPLICATE KEY UPDATE quantidade = quantidade + VALUES(quantidade);
+            """, (classificador, versao, *ids))
             conn.commit()
+        return True
     except mysql.connector.Error as e:
-        print(f"Erro ao inserir tweet processado: {e}")
+        print(f"Erro ao inserir resultados do classificador: {e}")
         conn.rollback()
+        return False
 
 def insert_analysis_summary(conn, modelo, resumo, recomendacao):
-    """Insere o resumo da análise na tabela analises_finais."""
+    """Insere o resumo da análise na tabela analises_finais. Retorna True se gravou."""
     try:
         with conn.cursor() as cur:
             cur.execute("""
@@ -35,9 +189,11 @@ def insert_analysis_summary(conn, modelo, resumo, recomendacao):
                 VALUES (%s, %s, %s);
             """, (modelo, resumo, recomendacao))
             conn.commit()
+        return True
     except mysql.connector.Error as e:
         print(f"Erro ao inserir resumo da análise: {e}")
         conn.rollback()
+        return False
 
 def fetch_analysis_history(conn):
     """Busca o histórico de análises finais para exibição no dashboard."""
@@ -54,6 +210,25 @@ def fetch_analysis_history(conn):
         print(f"Erro ao buscar histórico: {e}")
         return pd.DataFrame()
     
+def fetch_latest_analyses(conn):
+    """Busca a análise final mais recente de cada modelo ('hb20' e 'HB20' são o mesmo modelo)."""
+    colunas = ['modelo', 'resumo_sentimentos', 'recomendacao', 'data_geracao']
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT modelo, resumo_sentimentos, recomendacao, data_geracao FROM (
+                    SELECT modelo, resumo_sentimentos, recomendacao, data_geracao,
+                           ROW_NUMBER() OVER (PARTITION BY UPPER(modelo) ORDER BY data_geracao DESC) AS ordem
+                    FROM analises_finais
+                ) ultimas
+                WHERE ordem = 1
+                ORDER BY data_geracao DESC;
+            """)
+            return pd.DataFrame(cur.fetchall(), columns=colunas)
+    except mysql.connector.Error as e:
+        print(f"Erro ao buscar últimas análises: {e}")
+        return pd.DataFrame(columns=colunas)
+
 def fetch_resumo_tecnico(conn, modelo):
     """Busca o resumo técnico de vantagens e desvantagens de um modelo."""
     try:
@@ -69,4 +244,151 @@ def fetch_resumo_tecnico(conn, modelo):
             return {"vantagens": "N/A", "desvantagens": "N/A"}
     except mysql.connector.Error as e:
         print(f"Erro ao buscar resumo técnico: {e}")
-        return {"vantagens": "Erro de DB", "desvantagens": "Erro de DB"}
\ No newline at end of file
+        return {"vantagens": "Erro de DB", "desvantagens": "Erro de DB"}
+
+def _filtro_classificador(classificador, versao):
+    """JOIN e parâmetros para ler o sentimento de uma versão de classificador em vez de tweets_processed."""
+    if classificador is None:
+        return "p.sentimento", "", ()
+    juncao = "JOIN tweets_resultados r ON r.tweet_id = p.id AND r.classificador = %s AND r.versao = %s"
+    return "r.sentimento", juncao, (classificador, versao)
+
+def fetch_sentiment_rollup(conn, classificador=None, versao=None, desde=None):
+    """
+    Contagens por modelo, dia e sentimento do classificador padrão (sentimento gravado em
+    tweets_processed) ou de uma versão de classificador, lidas de sentimentos_contagens
+    (a partir do dia `desde`, se informado).
+    """
+    colunas = ['modelo', 'dia', 'sentimento', 'quantidade']
+    filtro, parametros = ("AND dia >= %s", (desde,)) if desde is not None else ("", ())
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT modelo, dia, sentimento, quantidade
+                FROM sentimentos_contagens
+                WHERE classificador = %s AND versao = %s {filtro};
+            """, (classificador or '', versao or '', *parametros))
+            return pd.DataFrame(cur.fetchall(), columns=colunas)
+    except mysql.connector.Error as e:
+        print(f"Erro ao buscar agregados de sentimento: {e}")
+        return pd.DataFrame(columns=colunas)
+
+def fetch_processed_texts(conn, limite_por_modelo, desde, classificador=None, versao=None):
+    """
+    Busca os textos limpos mais recentes de cada modelo a partir de `desde` (para extração de
+    tópicos). O limite de data restringe a leitura às partições mensais do período.
+    """
+    colunas = ['modelo', 'sentimento', 'texto_limpo']
+    coluna_sentimento, juncao, parametros = _filtro_classificador(classificador, versao)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT modelo, sentimento, texto_limpo FROM (
+                    SELECT p.modelo, {coluna_sentimento} AS sentimento, p.texto_limpo,
+                           ROW_NUMBER() OVER (PARTITION BY p.modelo ORDER BY p.data DESC) AS ordem
+                    FROM tweets_processed p
+                    {juncao}
+                    WHERE p.data >= %s
+                ) recentes
+                WHERE ordem <= %s;
+            """, (*parametros, desde, limite_por_modelo))
+            return pd.DataFrame(cur.fetchall(), columns=colunas)
+    except mysql.connector.Error as e:
+        print(f"Erro ao buscar textos processados: {e}")
+        return pd.DataFrame(columns=colunas)
+
+def fetch_classifier_versions(conn):
+    """Lista as versões de classificadores com resultados gravados e quantos tweets cada uma cobre."""
+    colunas = ['classificador', 'versao', 'tweets', 'ultima_classificacao']
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT classificador, versao, COUNT(*), MAX(data_classificacao)
+                FROM tweets_resultados
+                GROUP BY classificador, versao
+                ORDER BY MAX(data_classificacao) DESC;
+            """)
+            return pd.DataFrame(cur.fetchall(), columns=colunas)
+    except mysql.connector.Error as e:
+        print(f"Erro ao buscar versões de classificadores: {e}")
+        return pd.DataFrame(columns=colunas)
+
+def fetch_confusion(conn, classificador_a, versao_a, classificador_b, versao_b):
+    """
+    Matriz de confusão acumulada entre duas versões de classificadores, somando os
+    registros gravados nas duas direções do par (sentimento_a sempre se refere a 'a').
+    """
+    colunas = ['sentimento_a', 'sentimento_b', 'quantidade']
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT sentimento_a, sentimento_b, SUM(quantidade) FROM (
+                    SELECT sentimento_a, sentimento_b, quantidade
+                    FROM concordancia_classificadores
+                    WHERE classificador_a = %s AND versao_a = %s AND classificador_b = %s AND versao_b = %s
+                    UNION ALL
+                    SELECT sentimento_b, sentimento_a, quantidade
+                    FROM concordancia_classificadores
+                    WHERE classificador_a = %s AND versao_a = %s AND classificador_b = %s AND versao_b = %s
+                ) pares
+                GROUP BY sentimento_a, sentimento_b;
+            """, (classificador_a, versao_a, classificador_b, versao_b,
+                  classificador_b, versao_b, classificador_a, versao_a))
+            return pd.DataFrame(cur.fetchall(), columns=colunas)
+    except mysql.connector.Error as e:
+        print(f"Erro ao buscar concordância entre classificadores: {e}")
+        return pd.DataFrame(columns=colunas)
+
+def fetch_tweets_para_aspectos(conn, apos_id, limite, desde=None):
+    """Busca (id, modelo, data, texto_limpo, sentimento) de tweets processados (de `desde` em diante), em ordem de id."""
+    filtro, parametros = ("AND data >= %s", (desde,)) if desde is not None else ("", ())
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT id, modelo, data, texto_limpo, sentimento
+                FROM tweets_processed
+                WHERE id > %s {filtro}
+                ORDER BY id
+                LIMIT %s;
+            """, (apos_id, *parametros, limite))
+            return cur.fetchall()
+    except mysql.connector.Error as e:
+        print(f"Erro ao buscar tweets para aspectos: {e}")
+        return []
+
+def insert_aspect_counts(conn, contagens, substituir=False, desde=None):
+    """
+    Soma contagens de aspectos. Com substituir=True, as contagens (a partir do dia `desde`, se
+    informado) são trocadas por estas, em uma transação.
+    """
+    try:
+        with conn.cursor() as cur:
+            if substituir and desde is not None:
+                cur.execute("DELETE FROM aspectos_contagens WHERE dia >= %s;", (desde,))
+            elif substituir:
+                cur.execute("DELETE FROM aspectos_contagens;")
+            if contagens:
+                _somar_contagens_aspectos(cur, contagens)
+            conn.commit()
+        return True
+    except mysql.connector.Error as e:
+        print(f"Erro ao gravar contagens de aspectos: {e}")
+        conn.rollback()
+        return False
+
+def fetch_aspect_counts(conn, desde=None):
+    """Contagens de menções por modelo, aspecto e sentimento (a partir do dia `desde`, se informado)."""
+    colunas = ['modelo', 'aspecto', 'sentimento', 'quantidade']
+    filtro, parametros = ("WHERE dia >= %s", (desde,)) if desde is not None else ("", ())
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT modelo, aspecto, sentimento, SUM(quantidade)
+                FROM aspectos_contagens
+                {filtro}
+                GROUP BY modelo, aspecto, sentimento;
+            """, parametros)
+            return pd.DataFrame(cur.fetchall(), columns=colunas)
+    except mysql.connector.Error as e:
+        print(f"Erro ao buscar contagens de aspectos: {e}")
+        return pd.DataFrame(columns=colunas)
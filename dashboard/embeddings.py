@@ -0,0 +1,350 @@
+# embeddings.py
+#
+# Armazenamento dos embeddings (BERTimbau) dos tweets analisados em arquivos float16
+# mapeados em memória, com mapa de ids, inserção incremental e busca top-k por
+# similaridade de cosseno. A busca percorre a matriz em blocos (sem carregá-la
+# inteira na RAM) ou, se existir, usa um índice IVF para visitar só parte dela.
+#
+# Uso (linha de comando): python embeddings.py --treinar-indice [--listas 256]
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from config import EMBEDDINGS_DIR
+
+DIM_BERT = 768
+BLOCO_BUSCA = 65536  # linhas da matriz processadas por vez na busca exata
+
+
+def _chave_texto(modelo, texto):
+    """Hash de 64 bits de (modelo, texto), usado para não armazenar o mesmo tweet duas vezes."""
+    digest = hashlib.sha1(f"{modelo.upper()}\x1f{texto}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'little', signed=True)
+
+
+def normalizar(vetores):
+    """Normaliza as linhas (norma L2), para que o produto interno seja o cosseno."""
+    vetores = np.asarray(vetores, dtype=np.float32)
+    normas = np.linalg.norm(vetores, axis=-1, keepdims=True)
+    return vetores / np.maximum(normas, 1e-12)
+
+
+def _atualizar_topk(melhores_ids, melhores_scores, ids, scores, k):
+    """Une o top-k acumulado com os candidatos de um novo bloco."""
+    ids = np.concatenate([melhores_ids, ids])
+    scores = np.concatenate([melhores_scores, scores])
+    if len(scores) > k:
+        selecao = np.argpartition(-scores, k - 1)[:k]
+        ids, scores = ids[selecao], scores[selecao]
+    return ids, scores
+
+
+class EmbeddingStore:
+    """
+    Diretório com os arquivos:
+      vetores.f16      matriz (n, dim) float16 com vetores já normalizados
+      chaves.i64       hash de (modelo, texto) por linha, para deduplicação
+      modelos.i32      código do modelo de veículo por linha (filtro na busca)
+      offsets.i64      fim de cada linha em metadados.jsonl (mapa id -> metadados)
+      metadados.jsonl  modelo, texto, data, sentimento etc. de cada linha
+      info.json        dimensão e tabela de códigos dos modelos
+    O número de linhas válidas é dado por offsets.i64, gravado por último em cada inserção.
+    """
+
+    ARQ_VETORES = 'vetores.f16'
+    ARQ_CHAVES = 'chaves.i64'
+    ARQ_MODELOS = 'modelos.i32'
+    ARQ_OFFSETS = 'offsets.i64'
+    ARQ_METADADOS = 'metadados.jsonl'
+    ARQ_INFO = 'info.json'
+    ARQ_INDICE = 'indice_ivf.npz'
+
+    def __init__(self, diretorio=EMBEDDINGS_DIR, dim=DIM_BERT):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self.dim = dim
+        self._modelos = []
+        self._recarregar_info()
+
+        self._indice = None
+        self._versao_indice = None
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+    @property
+    def indice(self):
+        """
+        Índice IVF salvo, relido quando o arquivo muda: um índice treinado depois de abrir o
+        armazenamento (ex.: por `python embeddings.py --treinar-indice`) passa a ser usado.
+        """
+        caminho = self._caminho(self.ARQ_INDICE)
+        try:
+            estado = os.stat(caminho)
+            versao = (estado.st_mtime_ns, estado.st_size)
+        except FileNotFoundError:
+            versao = None
+        if versao != self._versao_indice:
+            self._indice = IndiceIVF.carregar(caminho)
+            self._versao_indice = versao
+        return self._indice
+
+    def _recarregar_info(self):
+        """Relê info.json (outro processo pode ter inserido novos modelos)."""
+        if not os.path.exists(self._caminho(self.ARQ_INFO)):
+            return
+        with open(self._caminho(self.ARQ_INFO), encoding='utf-8') as f:
+            info = json.load(f)
+        if info['dim'] != self.dim:
+            raise ValueError(f"Dimensão {self.dim} incompatível com o armazenamento existente ({info['dim']}).")
+        self._modelos = info['modelos']
+
+    def __len__(self):
+        caminho = self._caminho(self.ARQ_OFFSETS)
+        return os.path.getsize(caminho) // 8 if os.path.exists(caminho) else 0
+
+    def _mapear(self, nome, dtype, n, largura=None):
+        """Abre (somente leitura) as n primeiras linhas de um arquivo como memmap."""
+        forma = (n, largura) if largura else (n,)
+        if n == 0:
+            return np.zeros(forma, dtype=dtype)
+        return np.memmap(self._caminho(nome), dtype=dtype, mode='r', shape=forma)
+
+    def vetores(self, n=None):
+        n = len(self) if n is None else n
+        return self._mapear(self.ARQ_VETORES, np.float16, n, self.dim)
+
+    def modelos(self):
+        """Modelos de veículo presentes no armazenamento."""
+        self._recarregar_info()
+        return list(self._modelos)
+
+    def _salvar_info(self):
+        with open(self._caminho(self.ARQ_INFO), 'w', encoding='utf-8') as f:
+            json.dump({'dim': self.dim, 'modelos': self._modelos}, f, ensure_ascii=False)
+
+    def _truncar(self, n):
+        """Descarta bytes de uma inserção anterior interrompida após a linha n."""
+        offsets = self._mapear(self.ARQ_OFFSETS, np.int64, n)
+        fim_metadados = int(offsets[-1]) if n else 0
+        tamanhos = {
+            self.ARQ_VETORES: n * self.dim * 2,
+            self.ARQ_CHAVES: n * 8,
+            self.ARQ_MODELOS: n * 4,
+            self.ARQ_METADADOS: fim_metadados,
+        }
+        for nome, tamanho in tamanhos.items():
+            caminho = self._caminho(nome)
+            if os.path.exists(caminho) and os.path.getsize(caminho) != tamanho:
+                with open(caminho, 'r+b') as f:
+                    f.truncate(tamanho)
+
+    def adicionar(self, vetores, metadados):
+        """
+        Acrescenta vetores (n, dim) e seus metadados (dicts com ao menos 'modelo' e 'texto').
+        Tweets já armazenados para o mesmo modelo são ignorados. Retorna quantos foram inseridos.
+        """
+        vetores = normalizar(vetores)
+        if vetores.ndim != 2 or vetores.shape[1] != self.dim or len(vetores) != len(metadados):
+            raise ValueError("Vetores e metadados com formatos incompatíveis.")
+        if len(metadados) == 0:
+            return 0
+
+        with self._lock:
+            self._recarregar_info()
+            n = len(self)
+            chaves = np.array([_chave_texto(m['modelo'], m['texto']) for m in metadados], dtype=np.int64)
+
+            # Ignora o que já existe e repetições dentro do próprio lote
+            novos = ~np.isin(chaves, self._mapear(self.ARQ_CHAVES, np.int64, n))
+            primeiros = np.zeros(len(chaves), dtype=bool)
+            primeiros[np.unique(chaves, return_index=True)[1]] = True
+            novos &= primeiros
+            if not novos.any():
+                return 0
+
+            codigos = []
+            for m in metadados:
+                modelo = m['modelo'].upper()
+                if modelo not in self._modelos:
+                    self._modelos.append(modelo)
+                codigos.append(self._modelos.index(modelo))
+            self._salvar_info()
+
+            self._truncar(n)
+            linhas = [json.dumps(m, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+                      for m, novo in zip(metadados, novos) if novo]
+            with open(self._caminho(self.ARQ_METADADOS), 'ab') as f:
+                inicio = f.tell()
+                f.write(b''.join(linhas))
+            offsets = inicio + np.cumsum([len(linha) for linha in linhas], dtype=np.int64)
+
+            with open(self._caminho(self.ARQ_VETORES), 'ab') as f:
+                f.write(vetores[novos].astype(np.float16).tobytes())
+            with open(self._caminho(self.ARQ_CHAVES), 'ab') as f:
+                f.write(chaves[novos].tobytes())
+            with open(self._caminho(self.ARQ_MODELOS), 'ab') as f:
+                f.write(np.asarray(codigos, dtype=np.int32)[novos].tobytes())
+            # Os offsets confirmam a inserção
+            with open(self._caminho(self.ARQ_OFFSETS), 'ab') as f:
+                f.write(offsets.tobytes())
+
+            return int(novos.sum())
+
+    def metadados(self, ids):
+        """Lê do disco apenas os metadados das linhas pedidas."""
+        offsets = self._mapear(self.ARQ_OFFSETS, np.int64, len(self))
+        resultado = []
+        with open(self._caminho(self.ARQ_METADADOS), 'rb') as f:
+            for i in ids:
+                inicio = int(offsets[i - 1]) if i > 0 else 0
+                f.seek(inicio)
+                resultado.append(json.loads(f.read(int(offsets[i]) - inicio)))
+        return resultado
+
+    def buscar(self, consulta, k=10, modelo=None, usar_indice=True, n_sondas=8, bloco=BLOCO_BUSCA):
+        """
+        Retorna os k tweets mais similares ao vetor de consulta, como lista de dicts
+        (metadados + 'similaridade'), do mais para o menos similar.
+        """
+        n = len(self)
+        if n == 0:
+            return []
+
+        q = normalizar(np.asarray(consulta).reshape(-1))
+        vetores = self.vetores(n)
+        codigos = self._mapear(self.ARQ_MODELOS, np.int32, n)
+
+        codigo_modelo = None
+        if modelo is not None:
+            self._recarregar_info()
+            if modelo.upper() not in self._modelos:
+                return []
+            codigo_modelo = self._modelos.index(modelo.upper())
+
+        melhores_ids = np.zeros(0, dtype=np.int64)
+        melhores_scores = np.zeros(0, dtype=np.float32)
+
+        indice = self.indice if usar_indice else None
+        if indice is not None:
+            # Linhas das listas sondadas, mais as inseridas após o treino do índice
+            candidatos = indice.candidatos(q, n_sondas)
+            candidatos = np.concatenate([candidatos, np.arange(indice.n_indexado, n, dtype=np.int64)])
+            if codigo_modelo is not None:
+                candidatos = candidatos[codigos[candidatos] == codigo_modelo]
+            for inicio in range(0, len(candidatos), bloco):
+                ids = candidatos[inicio:inicio + bloco]
+                scores = vetores[ids].astype(np.float32) @ q
+                melhores_ids, melhores_scores = _atualizar_topk(melhores_ids, melhores_scores, ids, scores, k)
+        else:
+            for inicio in range(0, n, bloco):
+                fim = min(inicio + bloco, n)
+                scores = vetores[inicio:fim].astype(np.float32) @ q
+                ids = np.arange(inicio, fim, dtype=np.int64)
+                if codigo_modelo is not None:
+                    filtro = codigos[inicio:fim] == codigo_modelo
+                    ids, scores = ids[filtro], scores[filtro]
+                melhores_ids, melhores_scores = _atualizar_topk(melhores_ids, melhores_scores, ids, scores, k)
+
+        ordem = np.argsort(-melhores_scores)
+        melhores_ids, melhores_scores = melhores_ids[ordem], melhores_scores[ordem]
+
+        resultado = self.metadados(melhores_ids)
+        for item, score in zip(resultado, melhores_scores):
+            item['similaridade'] = float(score)
+        return resultado
+
+    def treinar_indice(self, n_listas=256, amostra=50000, iteracoes=10, seed=42):
+        """Treina e salva o índice IVF sobre as linhas atuais."""
+        IndiceIVF.treinar(self.vetores(), n_listas, amostra, iteracoes, seed).salvar(self._caminho(self.ARQ_INDICE))
+        return self.indice
+
+
+class IndiceIVF:
+    """
+    Índice de arquivo invertido: os vetores são agrupados por k-means (esférico)
+    e a busca visita apenas as listas dos centróides mais próximos da consulta.
+    """
+
+    def __init__(self, centroides, ordem, inicios, n_indexado):
+        self.centroides = centroides  # (n_listas, dim) float32
+        self.ordem = ordem            # ids das linhas agrupados por lista
+        self.inicios = inicios        # início de cada lista em 'ordem' (n_listas + 1)
+        self.n_indexado = n_indexado  # linhas cobertas pelo índice
+
+    @staticmethod
+    def _atribuir(vetores, centroides, bloco=BLOCO_BUSCA):
+        atribuicoes = np.empty(len(vetores), dtype=np.int32)
+        for inicio in range(0, len(vetores), bloco):
+            parte = vetores[inicio:inicio + bloco].astype(np.float32)
+            atribuicoes[inicio:inicio + bloco] = np.argmax(parte @ centroides.T, axis=1)
+        return atribuicoes
+
+    @classmethod
+    def treinar(cls, vetores, n_listas=256, amostra=50000, iteracoes=10, seed=42):
+        n = len(vetores)
+        if n == 0:
+            raise ValueError("Não há vetores para treinar o índice.")
+        rng = np.random.default_rng(seed)
+        n_listas = min(n_listas, n)
+
+        linhas_amostra = np.sort(rng.choice(n, size=min(amostra, n), replace=False))
+        dados = vetores[linhas_amostra].astype(np.float32)
+        centroides = dados[rng.choice(len(dados), size=n_listas, replace=False)]
+
+        for _ in range(iteracoes):
+            atribuicoes = np.argmax(dados @ centroides.T, axis=1)
+            somas = np.zeros_like(centroides)
+            np.add.at(somas, atribuicoes, dados)
+            vazios = np.bincount(atribuicoes, minlength=n_listas) == 0
+            # Listas vazias mantêm o centróide anterior
+            somas[vazios] = centroides[vazios]
+            centroides = normalizar(somas)
+
+        atribuicoes = cls._atribuir(vetores, centroides)
+        ordem = np.argsort(atribuicoes, kind='stable').astype(np.int64)
+        inicios = np.concatenate([[0], np.cumsum(np.bincount(atribuicoes, minlength=n_listas))]).astype(np.int64)
+        return cls(centroides, ordem, inicios, n)
+
+    def candidatos(self, q, n_sondas=8):
+        """Ids das linhas nas n_sondas listas mais próximas da consulta (em ordem crescente)."""
+        n_sondas = min(n_sondas, len(self.centroides))
+        listas = np.argpartition(-(self.centroides @ q), n_sondas - 1)[:n_sondas]
+        partes = [self.ordem[self.inicios[l]:self.inicios[l + 1]] for l in listas]
+        # Ordenar os ids melhora a localidade de leitura no memmap
+        return np.sort(np.concatenate(partes))
+
+    def salvar(self, caminho):
+        # Via arquivo temporário: dashboards abertos releem o índice assim que ele muda
+        temporario = caminho + '.tmp'
+        with open(temporario, 'wb') as f:
+            np.savez(f, centroides=self.centroides, ordem=self.ordem,
+                     inicios=self.inicios, n_indexado=np.int64(self.n_indexado))
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        if not os.path.exists(caminho):
+            return None
+        with np.load(caminho) as dados:
+            return cls(dados['centroides'], dados['ordem'], dados['inicios'], int(dados['n_indexado']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Manutenção do armazenamento de embeddings.")
+    parser.add_argument('--treinar-indice', action='store_true', help="Treina o índice IVF sobre os vetores atuais.")
+    parser.add_argument('--listas', type=int, default=256, help="Número de listas (centróides) do índice IVF.")
+    args = parser.parse_args()
+
+    store = EmbeddingStore()
+    print(f"Armazenamento '{store.diretorio}': {len(store)} vetores, modelos: {store.modelos()}")
+    if args.treinar_indice:
+        indice = store.treinar_indice(n_listas=args.listas)
+        print(f"✅ Índice IVF treinado com {len(indice.centroides)} listas sobre {indice.n_indexado} vetores.")
@@ -0,0 +1,46 @@
+# medir_inicializacao.py
+#
+# Mede o tempo de import "a frio" (processo novo) dos módulos usados pelo dashboard
+# e registra os valores no CSV de métricas, para acompanhar a inicialização entre versões.
+# Uso: python medir_inicializacao.py
+
+import subprocess
+import sys
+
+from metricas import registrar_metrica
+
+# Módulos no caminho da primeira renderização e módulos pesados carregados sob demanda
+MODULOS = [
+    'streamlit',
+    'pandas',
+    'db_connector',
+    'cache_dados',
+    'cliente_inferencia',
+    'classificador',
+    'numpy',
+    'plotly.express',
+    'transformers',
+]
+
+CODIGO_MEDICAO = "import time; t = time.perf_counter(); import {modulo}; print((time.perf_counter() - t) * 1000)"
+
+
+def medir_import(modulo):
+    """Retorna o tempo (ms) para importar o módulo em um interpretador novo, ou None se falhar."""
+    resultado = subprocess.run(
+        [sys.executable, '-c', CODIGO_MEDICAO.format(modulo=modulo)],
+        capture_output=True, text=True
+    )
+    if resultado.returncode != 0:
+        return None
+    return float(resultado.stdout.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    for modulo in MODULOS:
+        tempo_ms = medir_import(modulo)
+        if tempo_ms is None:
+            print(f"❌ {modulo}: não foi possível importar.")
+            continue
+        print(f"{modulo:<20} {tempo_ms:>10.1f} ms")
+        registrar_metrica(f'import_{modulo}', tempo_ms)
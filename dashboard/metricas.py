@@ -0,0 +1,24 @@
+# metricas.py
+
+import csv
+import os
+from datetime import datetime
+
+from config import METRICAS_PATH
+
+
+def registrar_metrica(nome, valor_ms, caminho=METRICAS_PATH):
+    """
+    Acrescenta uma medição (em milissegundos) ao arquivo CSV de métricas,
+    permitindo acompanhar a evolução dos tempos entre versões.
+    """
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        novo = not os.path.exists(caminho)
+        with open(caminho, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if novo:
+                writer.writerow(['timestamp', 'metrica', 'valor_ms'])
+            writer.writerow([datetime.now().isoformat(timespec='seconds'), nome, f"{valor_ms:.1f}"])
+    except OSError as e:
+        print(f"Erro ao registrar métrica '{nome}': {e}")
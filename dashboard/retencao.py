@@ -0,0 +1,347 @@
+# retencao.py
+#
+# Retenção e compactação de tweets_raw/tweets_processed, particionadas por mês (ver
+# db/db_schema.sql). Cada partição mais antiga que RETENCAO_MESES é trocada (EXCHANGE
+# PARTITION, instantâneo) por uma tabela de lote vazia; o lote e os resultados de seus
+# tweets em tweets_resultados são arquivados em CSV gzip em data/arquivo/ e removidos.
+# As contagens já agregadas (sentimentos_contagens, aspectos_contagens e a concordância
+# entre classificadores) são somadas na gravação e não dependem dos tweets arquivados; em
+# bancos anteriores a elas, a migração 004 precisa ter preenchido sentimentos_contagens, e a
+# retenção se recusa a arquivar uma partição de tweets_processed com dias sem contagem.
+# As partições esvaziadas são unidas a p_antigo, e novos meses são separados de p_futuro
+# antes de começarem.
+#
+# O esquema cria partições mensais até 2026-12; depois disso, sem novos meses, tudo cairia
+# em p_futuro. O dashboard cria as que faltam antes de gravar tweets (criar_particoes_futuras),
+# e a retenção deve ser agendada, por exemplo no cron:
+#     0 3 * * *  cd /caminho/dashboard && python retencao.py --apenas-particoes
+#     30 3 1 * * cd /caminho/dashboard && python retencao.py
+#
+# A troca não perde tweets gravados durante a retenção: linhas que chegam depois dela
+# ficam na partição (ou em p_antigo) e entram na próxima execução. Um lote interrompido
+# é retomado na execução seguinte; retencao_compactacoes registra os lotes já arquivados.
+#
+# Uso: python retencao.py [--meses 12] [--futuras 3] [--simular | --apenas-particoes]
+
+import argparse
+import csv
+import gzip
+import os
+import time
+from datetime import date, datetime
+
+import mysql.connector
+
+from config import ARQUIVO_DIR, RETENCAO_MESES, RETENCAO_PARTICOES_FUTURAS
+from db_connector import get_db_connection
+
+TABELAS_PARTICIONADAS = ['tweets_processed', 'tweets_raw']
+PARTICAO_ANTIGA = 'p_antigo'
+PARTICAO_FUTURA = 'p_futuro'
+TAMANHO_LOTE_ARQUIVO = 5000
+
+
+def _somar_meses(dia, meses):
+    """Primeiro dia do mês `meses` meses depois (ou antes) do mês de `dia`."""
+    anos, mes = divmod(dia.month - 1 + meses, 12)
+    return date(dia.year + anos, mes + 1, 1)
+
+
+def nome_particao(mes):
+    return f"p{mes:%Y%m}"
+
+
+def corte_retencao(hoje, meses):
+    """Partições cujo limite superior é até esta data (primeiro dia de um mês) são compactadas."""
+    return _somar_meses(hoje, -meses)
+
+
+def listar_particoes(conn, tabela):
+    """Partições da tabela em ordem: [(nome, limite superior ou None para MAXVALUE, linhas estimadas)]."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION;
+        """, (tabela,))
+        particoes = []
+        for nome, descricao, linhas in cur.fetchall():
+            limite = None if descricao == 'MAXVALUE' else date.fromisoformat(descricao.strip("'")[:10])
+            particoes.append((nome, limite, linhas or 0))
+        return particoes
+
+
+def inicio_dados_ativos(conn, tabela='tweets_processed'):
+    """
+    Primeiro dia mantido nas partições ativas (limite de p_antigo) se algum mês já foi
+    arquivado, ou None: tweets anteriores a ele só existem nos arquivos e nos agregados.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM retencao_compactacoes WHERE tabela = %s LIMIT 1;", (tabela,))
+        if cur.fetchone() is None:
+            return None
+    for nome, limite, _ in listar_particoes(conn, tabela):
+        if nome == PARTICAO_ANTIGA:
+            return limite
+    return None
+
+
+def particoes_a_compactar(particoes, corte):
+    """Partições inteiramente anteriores ao corte (inclusive p_antigo, que recebe atrasados)."""
+    return [(nome, limite) for nome, limite, _ in particoes if limite is not None and limite <= corte]
+
+
+def particoes_a_criar(particoes, hoje, futuras):
+    """Meses (nome, limite) que faltam para haver partições até `futuras` meses à frente."""
+    limites = [limite for _, limite, _ in particoes if limite is not None]
+    if not limites:
+        return []
+    novas = []
+    mes = max(limites)
+    alvo = _somar_meses(hoje, futuras + 1)
+    while mes < alvo:
+        novas.append((nome_particao(mes), _somar_meses(mes, 1)))
+        mes = _somar_meses(mes, 1)
+    return novas
+
+
+def dias_sem_contagem(conn, origem):
+    """
+    (modelo, dia) com sentimento em `origem` (partição ou lote de tweets_processed, com alias
+    p) sem a linha correspondente em sentimentos_contagens, do sentimento gravado ou de
+    tweets_resultados. Depois do arquivamento, esses dias não podem mais ser contados.
+    """
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            SELECT p.modelo, DATE(p.data) FROM {origem}
+            WHERE p.sentimento IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM sentimentos_contagens c
+                WHERE c.classificador = '' AND c.versao = '' AND c.modelo = p.modelo
+                  AND c.dia = DATE(p.data) AND c.sentimento = p.sentimento)
+            UNION
+            SELECT p.modelo, DATE(p.data) FROM {origem}
+            JOIN tweets_resultados r ON r.tweet_id = p.id
+            WHERE r.sentimento IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM sentimentos_contagens c
+                WHERE c.classificador = r.classificador AND c.versao = r.versao AND c.modelo = p.modelo
+                  AND c.dia = DATE(p.data) AND c.sentimento = r.sentimento)
+            ORDER BY 2, 1;
+        """)
+        return cur.fetchall()
+
+
+def _conferir_contagens(conn, origem, descricao):
+    """Interrompe a retenção se arquivar `origem` apagaria tweets ainda não contados."""
+    faltando = dias_sem_contagem(conn, origem)
+    if faltando:
+        modelo, dia = faltando[0]
+        raise RuntimeError(
+            f"{descricao} tem {len(faltando)} dia(s) sem contagens em sentimentos_contagens "
+            f"(o primeiro: {modelo} em {dia}); aplique db/migracoes/004_contagens_sentimentos.sql "
+            f"antes de arquivar."
+        )
+
+
+def _tem_linhas(cur, tabela, particao):
+    cur.execute(f"SELECT 1 FROM {tabela} PARTITION ({particao}) LIMIT 1;")
+    return cur.fetchone() is not None
+
+
+def _lotes_pendentes(cur, tabela):
+    """Tabelas de lote de execuções interrompidas ({tabela}_arq_{particao}_{carimbo})."""
+    cur.execute("""
+        SELECT TABLE_NAME FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME LIKE %s
+        ORDER BY TABLE_NAME;
+    """, (tabela.replace('_', r'\_') + r'\_arq\_%',))
+    return [linha[0] for linha in cur.fetchall()]
+
+
+def destacar_particao(conn, tabela, particao):
+    """Troca a partição por uma tabela de lote vazia e retorna o nome do lote."""
+    lote = f"{tabela}_arq_{particao}_{datetime.now():%Y%m%d%H%M%S}"
+    with conn.cursor() as cur:
+        cur.execute(f"CREATE TABLE {lote} LIKE {tabela};")
+        cur.execute(f"ALTER TABLE {lote} REMOVE PARTITIONING;")
+        cur.execute(f"ALTER TABLE {tabela} EXCHANGE PARTITION {particao} WITH TABLE {lote};")
+    return lote
+
+
+def arquivar_consulta(conn, consulta, caminho):
+    """Grava o resultado da consulta em CSV gzip (via arquivo temporário). Retorna o número de linhas."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = caminho + '.tmp'
+    linhas = 0
+    with conn.cursor() as cur:
+        cur.execute(consulta)
+        with gzip.open(temporario, 'wt', newline='', encoding='utf-8') as f:
+            escritor = csv.writer(f)
+            escritor.writerow(cur.column_names)
+            while True:
+                bloco = cur.fetchmany(TAMANHO_LOTE_ARQUIVO)
+                if not bloco:
+                    break
+                escritor.writerows(bloco)
+                linhas += len(bloco)
+    os.replace(temporario, caminho)
+    return linhas
+
+
+def finalizar_lote(conn, tabela, lote, diretorio=ARQUIVO_DIR):
+    """
+    Arquiva uma tabela de lote (e os resultados de seus tweets) e a descarta. Lotes já
+    registrados em retencao_compactacoes (retenção interrompida antes do descarte) são
+    apenas descartados.
+    """
+    particao = lote[len(tabela) + len('_arq_'):].rsplit('_', 1)[0]
+    with conn.cursor() as cur:
+        cur.execute("SELECT linhas FROM retencao_compactacoes WHERE lote = %s;", (lote,))
+        registro = cur.fetchone()
+    if registro is not None:
+        linhas = registro[0]
+    else:
+        arquivo = os.path.join(diretorio, f"{lote}.csv.gz")
+        linhas = arquivar_consulta(conn, f"SELECT * FROM {lote} ORDER BY id;", arquivo)
+        if tabela == 'tweets_processed':
+            arquivar_consulta(
+                conn,
+                f"SELECT r.* FROM tweets_resultados r JOIN {lote} s ON s.id = r.tweet_id ORDER BY r.tweet_id;",
+                os.path.join(diretorio, f"{lote}_resultados.csv.gz"),
+            )
+        try:
+            with conn.cursor() as cur:
+                if tabela == 'tweets_processed':
+                    cur.execute(f"DELETE r FROM tweets_resultados r JOIN {lote} s ON s.id = r.tweet_id;")
+                cur.execute("""
+                    INSERT INTO retencao_compactacoes (lote, tabela, particao, linhas, arquivo)
+                    VALUES (%s, %s, %s, %s, %s);
+                """, (lote, tabela, particao, linhas, os.path.basename(arquivo)))
+                conn.commit()
+        except mysql.connector.Error:
+            conn.rollback()
+            raise
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE {lote};")
+    return linhas
+
+
+def reorganizar_particoes(conn, tabela, compactadas, novas):
+    """Une as partições compactadas (já vazias) a p_antigo e separa os novos meses de p_futuro."""
+    with conn.cursor() as cur:
+        if compactadas:
+            nomes = [PARTICAO_ANTIGA] + [nome for nome, _ in compactadas if nome != PARTICAO_ANTIGA]
+            limite = max(limite for _, limite in compactadas)
+            if len(nomes) > 1:
+                cur.execute(f"""
+                    ALTER TABLE {tabela} REORGANIZE PARTITION {', '.join(nomes)}
+                    INTO (PARTITION {PARTICAO_ANTIGA} VALUES LESS THAN ('{limite:%Y-%m-%d}'));
+                """)
+        if novas:
+            definicoes = [f"PARTITION {nome} VALUES LESS THAN ('{limite:%Y-%m-%d}')" for nome, limite in novas]
+            definicoes.append(f"PARTITION {PARTICAO_FUTURA} VALUES LESS THAN (MAXVALUE)")
+            cur.execute(f"""
+                ALTER TABLE {tabela} REORGANIZE PARTITION {PARTICAO_FUTURA}
+                INTO ({', '.join(definicoes)});
+            """)
+
+
+def criar_particoes_futuras(conn, futuras=RETENCAO_PARTICOES_FUTURAS, hoje=None):
+    """
+    Separa de p_futuro, nas tabelas particionadas, os meses que faltam até `futuras` meses à
+    frente; sem meses a criar, só consulta o information_schema. Retorna [(tabela, partição)]
+    criadas, ou None em caso de erro.
+    """
+    hoje = hoje or date.today()
+    criadas = []
+    try:
+        for tabela in TABELAS_PARTICIONADAS:
+            novas = particoes_a_criar(listar_particoes(conn, tabela), hoje, futuras)
+            reorganizar_particoes(conn, tabela, [], novas)
+            criadas.extend((tabela, nome) for nome, _ in novas)
+    except mysql.connector.Error as e:
+        print(f"❌ Erro ao criar partições futuras: {e}")
+        return None
+    return criadas
+
+
+def aplicar_retencao(conn, tabela, meses=RETENCAO_MESES, futuras=RETENCAO_PARTICOES_FUTURAS,
+                     diretorio=ARQUIVO_DIR, simular=False, hoje=None):
+    """
+    Aplica a retenção a uma tabela particionada. Retorna [(partição ou lote, linhas arquivadas,
+    segundos)]. Levanta RuntimeError, antes de arquivar, se uma partição de tweets_processed
+    tiver dias sem contagem em sentimentos_contagens.
+    """
+    hoje = hoje or date.today()
+    particoes = listar_particoes(conn, tabela)
+    compactadas = particoes_a_compactar(particoes, corte_retencao(hoje, meses))
+    novas = particoes_a_criar(particoes, hoje, futuras)
+
+    contadas = tabela == 'tweets_processed'
+
+    if simular:
+        estimativas = {nome: linhas for nome, _, linhas in particoes}
+        for nome, limite in compactadas:
+            print(f"  {tabela}: arquivar {nome} (< {limite}, ~{estimativas[nome]} linhas)")
+            faltando = dias_sem_contagem(conn, f"{tabela} PARTITION ({nome}) p") if contadas else []
+            if faltando:
+                print(f"  ⚠️ {nome}: {len(faltando)} dia(s) sem contagens; aplique a migração 004 antes de arquivar")
+        for nome, limite in novas:
+            print(f"  {tabela}: criar {nome} (< {limite})")
+        return []
+
+    relatorio = []
+    with conn.cursor() as cur:
+        pendentes = _lotes_pendentes(cur, tabela)
+    for lote in pendentes:
+        if contadas:
+            _conferir_contagens(conn, f"{lote} p", f"O lote {lote}")
+        inicio = time.perf_counter()
+        relatorio.append((lote, finalizar_lote(conn, tabela, lote, diretorio), time.perf_counter() - inicio))
+
+    for nome, _ in compactadas:
+        with conn.cursor() as cur:
+            if not _tem_linhas(cur, tabela, nome):
+                continue
+        if contadas:
+            _conferir_contagens(conn, f"{tabela} PARTITION ({nome}) p", f"A partição {tabela}.{nome}")
+        inicio = time.perf_counter()
+        lote = destacar_particao(conn, tabela, nome)
+        relatorio.append((nome, finalizar_lote(conn, tabela, lote, diretorio), time.perf_counter() - inicio))
+
+    reorganizar_particoes(conn, tabela, compactadas, novas)
+    return relatorio
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Retenção e compactação das tabelas de tweets particionadas por mês.")
+    parser.add_argument('--meses', type=int, default=RETENCAO_MESES, help="Meses completos mantidos nas partições ativas.")
+    parser.add_argument('--futuras', type=int, default=RETENCAO_PARTICOES_FUTURAS, help="Meses futuros com partição criada.")
+    parser.add_argument('--diretorio', default=ARQUIVO_DIR, help="Destino dos arquivos CSV gzip.")
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument('--simular', action='store_true', help="Apenas mostra o que seria feito.")
+    modo.add_argument('--apenas-particoes', action='store_true',
+                      help="Apenas cria as partições dos próximos meses (execução diária, sem arquivar).")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if conn is None:
+        raise SystemExit("❌ Não foi possível conectar ao banco de dados.")
+    try:
+        if args.apenas_particoes:
+            criadas = criar_particoes_futuras(conn, args.futuras)
+            if criadas is None:
+                raise SystemExit("❌ Falha ao criar as partições futuras.")
+            for tabela, nome in criadas:
+                print(f"✅ {tabela}: partição {nome} criada")
+        else:
+            for tabela in TABELAS_PARTICIONADAS:
+                print(f"--- {tabela} ---")
+                try:
+                    relatorio = aplicar_retencao(conn, tabela, args.meses, args.futuras, args.diretorio, args.simular)
+                except (mysql.connector.Error, RuntimeError) as e:
+                    raise SystemExit(f"❌ Erro na retenção de {tabela}: {e}")
+                for origem, linhas, segundos in relatorio:
+                    print(f"✅ {origem}: {linhas} linhas arquivadas em {segundos:.1f}s")
+    finally:
+        conn.close()
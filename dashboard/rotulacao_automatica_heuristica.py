@@ -1,5 +1,27 @@
 # Arquivo: rotulacao_automatica_heuristica.py
 
+# 💡 LÉXICO SIMPLES EM PORTUGUÊS (montado uma única vez, no import)
+
+# Palavras Positivas Comuns
+LEXICO_POS = frozenset([
+    'bom', 'boa', 'ótimo', 'excelente', 'fantástico', 'perfeito',
+    'lindo', 'confortável', 'econômico', 'eficiente', 'agradável',
+    'top', 'sensacional', 'incrível', 'gostei', 'recomendo', 'melhor'
+])
+
+# Palavras Negativas Comuns
+LEXICO_NEG = frozenset([
+    'ruim', 'péssimo', 'lento', 'quebra', 'defeito', 'problema',
+    'caro', 'barulho', 'terrível', 'odeio', 'triste', 'decepcionado',
+    'pior', 'péssima', 'gasto', 'fraco', 'horrível', 'lamentável'
+])
+
+def contar_polaridade(texto_limpo):
+    """Quantidade de palavras positivas e negativas do texto limpo: (score_pos, score_neg)."""
+    palavras = texto_limpo.split()
+    return (sum(1 for palavra in palavras if palavra in LEXICO_POS),
+            sum(1 for palavra in palavras if palavra in LEXICO_NEG))
+
 def rotular_texto_heuristica(texto_limpo):
     """
     Rotula o sentimento de um texto limpo (sem stopwords) usando uma abordagem heurística
@@ -11,28 +33,9 @@ def rotular_texto_heuristica(texto_limpo):
     Returns:
         str: 'POSITIVO', 'NEGATIVO', ou 'NEUTRO'.
     """
-    
-    # 💡 LÉXICO SIMPLES EM PORTUGUÊS
-    
-    # Palavras Positivas Comuns
-    lexico_pos = set([
-        'bom', 'boa', 'ótimo', 'excelente', 'fantástico', 'perfeito', 
-        'lindo', 'confortável', 'econômico', 'eficiente', 'agradável', 
-        'top', 'sensacional', 'incrível', 'gostei', 'recomendo', 'melhor'
-    ])
-
-    # Palavras Negativas Comuns
-    lexico_neg = set([
-        'ruim', 'péssimo', 'lento', 'quebra', 'defeito', 'problema', 
-        'caro', 'barulho', 'terrível', 'odeio', 'triste', 'decepcionado',
-        'pior', 'péssima', 'gasto', 'fraco', 'horrível', 'lamentável'
-    ])
-    
-    palavras = texto_limpo.split()
-    
-    score_pos = sum(1 for palavra in palavras if palavra in lexico_pos)
-    score_neg = sum(1 for palavra in palavras if palavra in lexico_neg)
-    
+
+    score_pos, score_neg = contar_polaridade(texto_limpo)
+
     # Decisão
     if score_pos > score_neg and score_pos > 0:
         return 'POSITIVO'
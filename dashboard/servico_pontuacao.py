@@ -0,0 +1,96 @@
+# servico_pontuacao.py
+#
+# Serviço de (re)pontuação incremental: para uma versão de classificador, classifica
+# apenas os tweets de tweets_processed que ainda não têm resultado dessa versão.
+# A concordância com os demais classificadores é acumulada a cada lote gravado.
+#
+# Uso: python servico_pontuacao.py --classificador lexico
+#      python servico_pontuacao.py --todos
+
+import argparse
+import time
+
+import numpy as np
+
+from db_connector import get_db_connection, fetch_tweets_sem_resultado, insert_classifier_results
+
+SENTIMENTOS = ['POSITIVO', 'NEUTRO', 'NEGATIVO']
+
+
+def pontuar_pendentes(conn, classificador, tamanho_lote=500, limite=None, progresso=None):
+    """
+    Pontua, em lotes, os tweets sem resultado para (classificador.nome, classificador.versao).
+    Retorna quantos tweets foram pontuados. `progresso`, se informado, recebe o total a cada lote.
+    """
+    total = 0
+    ultimo_id = 0
+    while limite is None or total < limite:
+        tamanho = tamanho_lote if limite is None else min(tamanho_lote, limite - total)
+        pendentes = fetch_tweets_sem_resultado(conn, classificador.nome, classificador.versao, tamanho, ultimo_id)
+        if not pendentes:
+            break
+
+        ids = [tweet_id for tweet_id, _ in pendentes]
+        textos = [texto or '' for _, texto in pendentes]
+        resultados = classificador.classificar(textos)
+
+        registros = [(tweet_id, sentimento, score) for tweet_id, (sentimento, score) in zip(ids, resultados)]
+        if not insert_classifier_results(conn, classificador.nome, classificador.versao, registros):
+            break
+
+        total += len(registros)
+        ultimo_id = ids[-1]
+        if progresso:
+            progresso(total)
+    return total
+
+
+def resumir_concordancia(confusao):
+    """
+    A partir das contagens (sentimento_a, sentimento_b, quantidade), retorna a matriz de
+    confusão 3x3, a concordância simples (%) e o kappa de Cohen.
+    """
+    matriz = (
+        confusao.pivot_table(index='sentimento_a', columns='sentimento_b', values='quantidade', aggfunc='sum', fill_value=0)
+        .reindex(index=SENTIMENTOS, columns=SENTIMENTOS, fill_value=0)
+        .astype(int)
+    )
+    total = matriz.to_numpy().sum()
+    if total == 0:
+        return matriz, None, None
+
+    observada = np.trace(matriz.to_numpy()) / total
+    esperada = (matriz.sum(axis=1).to_numpy() @ matriz.sum(axis=0).to_numpy()) / total ** 2
+    kappa = (observada - esperada) / (1 - esperada) if esperada < 1 else 1.0
+    return matriz, observada * 100, kappa
+
+
+if __name__ == '__main__':
+    # O registro (Naive Bayes, cascata, heurísticas) só é carregado pela linha de comando;
+    # o dashboard importa este módulo apenas para pontuar e resumir a concordância
+    from classificadores import listar_classificadores
+
+    classificadores = listar_classificadores()
+
+    parser = argparse.ArgumentParser(description="Pontua tweets sem resultado para a versão atual de um classificador.")
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument('--classificador', choices=sorted(classificadores))
+    grupo.add_argument('--todos', action='store_true', help="Pontua com todos os classificadores registrados.")
+    parser.add_argument('--lote', type=int, default=500)
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if conn is None:
+        raise SystemExit("❌ Não foi possível conectar ao banco de dados.")
+
+    nomes = sorted(classificadores) if args.todos else [args.classificador]
+    try:
+        for nome in nomes:
+            classificador = classificadores[nome]
+            inicio = time.perf_counter()
+            total = pontuar_pendentes(conn, classificador, tamanho_lote=args.lote)
+            duracao = time.perf_counter() - inicio
+            taxa = total / duracao if duracao > 0 else 0.0
+            print(f"✅ {nome} ({classificador.versao}): {total} tweets pontuados em {duracao:.1f}s ({taxa:.0f} tweets/s).")
+    finally:
+        conn.close()
@@ -0,0 +1,298 @@
+# servidor_inferencia.py
+#
+# Serviço local de inferência (ASGI) com a mesma semântica de classificação do dashboard
+# (limpar_texto + BERTimbau + reforço positivo). O modelo é carregado uma única vez e as
+# requisições individuais concorrentes são agrupadas em micro-lotes dinâmicos, limitados
+# por tamanho máximo e por um prazo máximo de espera.
+#
+# Rotas:
+#   POST /classificar       {"texto": "..."}                     -> {"sentimento", "score", "texto_limpo"}
+#   POST /classificar/lote  {"textos": [...], "embeddings": bool} -> {"resultados": [...], "embeddings": [[...]]}
+#   (com "limpar": false, os textos já chegam limpos e limpar_texto não é reaplicado)
+#   GET  /saude                                                   -> {"status", "modelo_pronto"}
+#   GET  /metricas                                                -> percentis de latência e histograma de lotes
+#
+# Uso: python servidor_inferencia.py [--host 127.0.0.1] [--porta 8001] [--lote-max 32] [--espera-max-ms 10]
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from classificador import CarregadorModelo, classificar_lote
+from config import INFERENCIA_HOST, INFERENCIA_PORTA
+from preprocessamento import limpar_texto
+from rotulacao_automatica_heuristica import rotular_texto_heuristica
+
+# Requisições em lote são quebradas em partes deste tamanho, para que as
+# individuais possam ser intercaladas entre elas
+TAMANHO_PARTE_LOTE = 256
+
+
+class MetricasServico:
+    """Latências por rota (janela deslizante) e histograma dos tamanhos de micro-lote."""
+
+    FAIXAS_LOTE = [(1, 1), (2, 2), (3, 4), (5, 8), (9, 16), (17, 32), (33, 64), (65, 128)]
+
+    def __init__(self, janela=10000):
+        self.latencias = defaultdict(lambda: deque(maxlen=janela))
+        self.tamanhos_lote = Counter()
+        self.requisicoes = Counter()
+        self.inicio = time.time()
+
+    def registrar_latencia(self, rota, segundos):
+        self.requisicoes[rota] += 1
+        self.latencias[rota].append(segundos * 1000)
+
+    def registrar_lote(self, tamanho):
+        self.tamanhos_lote[tamanho] += 1
+
+    def resumo(self):
+        latencias = {}
+        for rota, valores in self.latencias.items():
+            if not valores:
+                continue
+            p50, p90, p99 = np.percentile(np.fromiter(valores, dtype=float), [50, 90, 99])
+            latencias[rota] = {'p50': float(p50), 'p90': float(p90), 'p99': float(p99), 'max': max(valores), 'amostras': len(valores)}
+
+        histograma = {}
+        for minimo, maximo in self.FAIXAS_LOTE:
+            rotulo = str(minimo) if minimo == maximo else f"{minimo}-{maximo}"
+            histograma[rotulo] = sum(n for tamanho, n in self.tamanhos_lote.items() if minimo <= tamanho <= maximo)
+        maior = self.FAIXAS_LOTE[-1][1]
+        histograma[f">{maior}"] = sum(n for tamanho, n in self.tamanhos_lote.items() if tamanho > maior)
+
+        total_lotes = sum(self.tamanhos_lote.values())
+        total_itens = sum(tamanho * n for tamanho, n in self.tamanhos_lote.items())
+        return {
+            'uptime_s': time.time() - self.inicio,
+            'requisicoes': dict(self.requisicoes),
+            'latencia_ms': latencias,
+            'micro_lotes': {
+                'total': total_lotes,
+                'tamanho_medio': total_itens / total_lotes if total_lotes else 0.0,
+                'histograma': histograma,
+            },
+        }
+
+
+class Coalescedor:
+    """
+    Agrupa textos enviados individualmente em micro-lotes: o lote fecha quando atinge
+    `tamanho_max` ou quando `espera_max_ms` se passam desde a chegada do primeiro texto.
+    Enquanto um lote roda no executor, os novos textos se acumulam para o próximo.
+    """
+
+    def __init__(self, funcao_lote, executor, metricas, tamanho_max=32, espera_max_ms=10):
+        self._funcao_lote = funcao_lote
+        self._executor = executor
+        self._metricas = metricas
+        self.tamanho_max = tamanho_max
+        self.espera_max = espera_max_ms / 1000
+        self._fila = None
+        self._tarefa = None
+
+    def iniciar(self):
+        self._fila = asyncio.Queue()
+        self._tarefa = asyncio.create_task(self._laco())
+
+    async def encerrar(self):
+        if self._tarefa:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+
+    async def submeter(self, texto):
+        futuro = asyncio.get_running_loop().create_future()
+        await self._fila.put((texto, futuro))
+        return await futuro
+
+    async def _laco(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._fila.get()]
+            prazo = loop.time() + self.espera_max
+            while len(lote) < self.tamanho_max:
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._fila.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            self._metricas.registrar_lote(len(lote))
+            try:
+                resultados = await loop.run_in_executor(self._executor, self._funcao_lote, [texto for texto, _ in lote])
+            except Exception as e:
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+
+            for (_, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+
+class ErroRequisicao(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class ServicoInferencia:
+    """Aplicação ASGI do serviço de inferência."""
+
+    def __init__(self, tamanho_lote_max=32, espera_max_ms=10, simulado=False):
+        self.metricas = MetricasServico()
+        # Um único worker: o modelo é usado por uma thread de cada vez
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inferencia')
+        self._carregador = None if simulado else CarregadorModelo()
+        self._simulado = simulado
+        self._coalescedor = Coalescedor(
+            lambda textos: self._classificar(textos, embeddings=False)[0],
+            self._executor, self.metricas, tamanho_lote_max, espera_max_ms
+        )
+
+    def _classificar(self, textos_limpos, embeddings):
+        """Executa a classificação (na thread do executor). Retorna (resultados, embeddings ou None)."""
+        if self._simulado:
+            # Modo para testes de carga sem o BERTimbau: custo fixo por lote + custo por texto
+            time.sleep(0.005 + 0.001 * len(textos_limpos))
+            resultados = [(rotular_texto_heuristica(texto), 1.0) for texto in textos_limpos]
+            return resultados, (np.zeros((len(textos_limpos), 8), dtype=np.float32) if embeddings else None)
+
+        resultados, vetores = classificar_lote(textos_limpos, self._carregador.obter())
+        return resultados, (vetores if embeddings else None)
+
+    async def iniciar(self):
+        if self._carregador is not None:
+            self._carregador.iniciar()
+        self._coalescedor.iniciar()
+
+    async def encerrar(self):
+        await self._coalescedor.encerrar()
+        self._executor.shutdown(wait=False)
+
+    def modelo_pronto(self):
+        return self._simulado or self._carregador.pronto()
+
+    # --- Rotas ---
+
+    async def _rota_classificar(self, corpo):
+        texto = corpo.get('texto')
+        if not isinstance(texto, str):
+            raise ErroRequisicao(400, "Campo 'texto' (string) é obrigatório.")
+        texto_limpo = limpar_texto(texto) if corpo.get('limpar', True) else texto
+        sentimento, score = await self._coalescedor.submeter(texto_limpo)
+        return {'sentimento': sentimento, 'score': score, 'texto_limpo': texto_limpo}
+
+    async def _rota_classificar_lote(self, corpo):
+        textos = corpo.get('textos')
+        if not isinstance(textos, list) or not all(isinstance(texto, str) for texto in textos):
+            raise ErroRequisicao(400, "Campo 'textos' (lista de strings) é obrigatório.")
+        com_embeddings = bool(corpo.get('embeddings', False))
+        textos_limpos = [limpar_texto(texto) for texto in textos] if corpo.get('limpar', True) else textos
+
+        loop = asyncio.get_running_loop()
+        resultados, vetores = [], []
+        for inicio in range(0, len(textos_limpos), TAMANHO_PARTE_LOTE):
+            parte = textos_limpos[inicio:inicio + TAMANHO_PARTE_LOTE]
+            resultados_parte, vetores_parte = await loop.run_in_executor(self._executor, self._classificar, parte, com_embeddings)
+            resultados.extend(resultados_parte)
+            if com_embeddings:
+                vetores.append(vetores_parte)
+
+        resposta = {
+            'resultados': [
+                {'sentimento': sentimento, 'score': score, 'texto_limpo': texto_limpo}
+                for (sentimento, score), texto_limpo in zip(resultados, textos_limpos)
+            ]
+        }
+        if com_embeddings:
+            resposta['embeddings'] = np.concatenate(vetores).tolist() if vetores else []
+        return resposta
+
+    async def tratar(self, metodo, caminho, corpo_bruto):
+        """Roteia a requisição e retorna (status, payload)."""
+        if metodo == 'GET' and caminho == '/saude':
+            return 200, {'status': 'ok', 'modelo_pronto': self.modelo_pronto()}
+        if metodo == 'GET' and caminho == '/metricas':
+            return 200, self.metricas.resumo()
+
+        rotas = {'/classificar': self._rota_classificar, '/classificar/lote': self._rota_classificar_lote}
+        if caminho not in rotas:
+            return 404, {'erro': f"Rota '{caminho}' não encontrada."}
+        if metodo != 'POST':
+            return 405, {'erro': "Use POST."}
+
+        inicio = time.perf_counter()
+        try:
+            corpo = json.loads(corpo_bruto or b'{}')
+            if not isinstance(corpo, dict):
+                raise ErroRequisicao(400, "O corpo deve ser um objeto JSON.")
+            resposta = await rotas[caminho](corpo)
+        except json.JSONDecodeError:
+            return 400, {'erro': "JSON inválido."}
+        except ErroRequisicao as e:
+            return e.status, {'erro': str(e)}
+        except Exception as e:
+            return 500, {'erro': f"Falha na classificação: {e}"}
+        self.metricas.registrar_latencia(caminho, time.perf_counter() - inicio)
+        return 200, resposta
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                mensagem = await receive()
+                if mensagem['type'] == 'lifespan.startup':
+                    await self.iniciar()
+                    await send({'type': 'lifespan.startup.complete'})
+                elif mensagem['type'] == 'lifespan.shutdown':
+                    await self.encerrar()
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+
+        if scope['type'] != 'http':
+            return
+
+        corpo = b''
+        mais = True
+        while mais:
+            mensagem = await receive()
+            corpo += mensagem.get('body', b'')
+            mais = mensagem.get('more_body', False)
+
+        status, payload = await self.tratar(scope['method'], scope['path'], corpo)
+        dados = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json; charset=utf-8'),
+                (b'content-length', str(len(dados)).encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': dados})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serviço local de inferência de sentimentos (BERTimbau).")
+    parser.add_argument('--host', default=INFERENCIA_HOST)
+    parser.add_argument('--porta', type=int, default=INFERENCIA_PORTA)
+    parser.add_argument('--lote-max', type=int, default=32, help="Tamanho máximo de um micro-lote.")
+    parser.add_argument('--espera-max-ms', type=float, default=10, help="Espera máxima para completar um micro-lote.")
+    parser.add_argument('--simulado', action='store_true', help="Usa um classificador simulado (testes de carga sem o modelo).")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = ServicoInferencia(args.lote_max, args.espera_max_ms, simulado=args.simulado)
+    uvicorn.run(app, host=args.host, port=args.porta, log_level='warning')
@@ -0,0 +1,142 @@
+# teste_carga_inferencia.py
+#
+# Teste de carga local do serviço de inferência: N clientes concorrentes enviam textos
+# individuais para /classificar e o script relata vazão e percentis de latência (lado do
+# cliente), além do histograma de micro-lotes reportado pelo serviço (/metricas).
+#
+# Com --iniciar-servidor, sobe o serviço em um subprocesso para cada --lote-max informado
+# (ex.: 1 = sem coalescência, 32) e compara as configurações.
+#
+# Uso: python teste_carga_inferencia.py --iniciar-servidor --simulado --lote-max 1 32 --concorrencia 32 --requisicoes 2000
+#      python teste_carga_inferencia.py --url http://127.0.0.1:8001   (serviço já em execução)
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cliente_inferencia import ClienteInferencia
+from config import DATA_DIR, INFERENCIA_HOST, INFERENCIA_URL
+
+ARQUIVO_TEXTOS = os.path.join(DATA_DIR, 'raw', 'tweets_hb20_onix_rotulado.csv')
+ARQUIVO_RESULTADO = os.path.join(DATA_DIR, 'metricas', 'carga_inferencia.csv')
+
+TEXTOS_PADRAO = [
+    "o motor é muito bom e econômico",
+    "acabamento ruim e barulho na suspensão",
+    "pensando em trocar de carro no ano que vem",
+    "o consumo na estrada surpreendeu demais",
+]
+
+
+def carregar_textos(caminho, quantidade):
+    """Textos do CSV rotulado (ou exemplos fixos, se ele não existir), repetidos até a quantidade pedida."""
+    if os.path.exists(caminho):
+        textos = pd.read_csv(caminho, encoding='utf-8')['content'].dropna().astype(str).tolist()
+    else:
+        textos = TEXTOS_PADRAO
+    return [textos[i % len(textos)] for i in range(quantidade)]
+
+
+def executar_carga(cliente, textos, concorrencia):
+    """Envia os textos com `concorrencia` clientes simultâneos. Retorna (latências em ms, erros, duração)."""
+    def enviar(texto):
+        inicio = time.perf_counter()
+        try:
+            cliente.classificar(texto)
+        except Exception:
+            return None
+        return (time.perf_counter() - inicio) * 1000
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        latencias = list(executor.map(enviar, textos))
+    duracao = time.perf_counter() - inicio
+
+    validas = np.array([latencia for latencia in latencias if latencia is not None])
+    return validas, len(latencias) - len(validas), duracao
+
+
+def resumir(rotulo, latencias, erros, duracao, metricas_servico):
+    micro_lotes = metricas_servico.get('micro_lotes', {})
+    p50, p90, p99 = np.percentile(latencias, [50, 90, 99]) if len(latencias) else (np.nan,) * 3
+    return {
+        'configuracao': rotulo,
+        'requisicoes': len(latencias) + erros,
+        'erros': erros,
+        'req/s': len(latencias) / duracao if duracao > 0 else 0.0,
+        'p50 (ms)': p50,
+        'p90 (ms)': p90,
+        'p99 (ms)': p99,
+        'lote médio': micro_lotes.get('tamanho_medio', np.nan),
+        'histograma lotes': ' '.join(f"{faixa}:{n}" for faixa, n in micro_lotes.get('histograma', {}).items() if n),
+    }
+
+
+def aguardar_servico(cliente, processo, timeout=600):
+    """Aguarda o serviço responder e o modelo ficar pronto."""
+    limite = time.time() + timeout
+    while time.time() < limite:
+        if processo.poll() is not None:
+            raise SystemExit("❌ O serviço de inferência terminou durante a inicialização.")
+        if cliente.pronto():
+            return
+        time.sleep(0.5)
+    raise SystemExit("❌ O serviço de inferência não ficou pronto a tempo.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Teste de carga local do serviço de inferência.")
+    parser.add_argument('--url', default=INFERENCIA_URL)
+    parser.add_argument('--iniciar-servidor', action='store_true', help="Sobe o serviço localmente para cada --lote-max.")
+    parser.add_argument('--porta', type=int, default=8011, help="Porta do serviço iniciado pelo teste.")
+    parser.add_argument('--lote-max', type=int, nargs='+', default=[1, 32])
+    parser.add_argument('--espera-max-ms', type=float, default=10)
+    parser.add_argument('--simulado', action='store_true', help="Serviço com classificador simulado (sem o BERTimbau).")
+    parser.add_argument('--concorrencia', type=int, default=32)
+    parser.add_argument('--requisicoes', type=int, default=2000)
+    parser.add_argument('--arquivo', default=ARQUIVO_TEXTOS)
+    args = parser.parse_args()
+
+    textos = carregar_textos(args.arquivo, args.requisicoes)
+    linhas = []
+
+    if not args.iniciar_servidor:
+        cliente = ClienteInferencia(args.url)
+        if not cliente.disponivel():
+            raise SystemExit(f"❌ Serviço de inferência indisponível em {args.url}.")
+        print(f"--- {len(textos)} requisições, {args.concorrencia} clientes, serviço em {args.url} ---")
+        latencias, erros, duracao = executar_carga(cliente, textos, args.concorrencia)
+        linhas.append(resumir(args.url, latencias, erros, duracao, cliente.metricas()))
+    else:
+        caminho_servidor = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'servidor_inferencia.py')
+        for lote_max in args.lote_max:
+            comando = [
+                sys.executable, caminho_servidor, '--host', INFERENCIA_HOST, '--porta', str(args.porta),
+                '--lote-max', str(lote_max), '--espera-max-ms', str(args.espera_max_ms),
+            ] + (['--simulado'] if args.simulado else [])
+            processo = subprocess.Popen(comando)
+            cliente = ClienteInferencia(f"http://{INFERENCIA_HOST}:{args.porta}")
+            try:
+                aguardar_servico(cliente, processo)
+                # Aquecimento, fora da medição
+                executar_carga(cliente, textos[:args.concorrencia], args.concorrencia)
+
+                print(f"--- lote máx. {lote_max}: {len(textos)} requisições, {args.concorrencia} clientes ---")
+                latencias, erros, duracao = executar_carga(cliente, textos, args.concorrencia)
+                linhas.append(resumir(f"lote_max={lote_max}", latencias, erros, duracao, cliente.metricas()))
+            finally:
+                processo.terminate()
+                processo.wait()
+
+    resultado = pd.DataFrame(linhas)
+    print(resultado.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+
+    os.makedirs(os.path.dirname(ARQUIVO_RESULTADO), exist_ok=True)
+    resultado.to_csv(ARQUIVO_RESULTADO, index=False)
+    print(f"\n✅ Resultados salvos em '{ARQUIVO_RESULTADO}'")
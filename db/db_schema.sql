@@ -1,28 +1,192 @@
 -- Criar banco
-CREATE DATABASE tcc_autos;
+CREATE DATABASE IF NOT EXISTS tcc_autos;
 
 -- Conectar no banco criado
-\c tcc_autos;
+USE tcc_autos;
+
+-- Tweets brutos e processados são particionados por mês (RANGE COLUMNS sobre `data`): consultas
+-- por período só leem as partições do intervalo, e a retenção (dashboard/retencao.py) arquiva e
+-- remove meses inteiros sem varrer a tabela. Como toda chave única precisa conter a coluna de
+-- particionamento, a chave primária é (id, data) e `data` não pode ser nula. `modelo` é gravado
+-- em maiúsculas, para que as consultas por modelo e período usem o índice (modelo, data).
+-- p_antigo recebe tudo que é anterior ao primeiro mês mantido; p_futuro é dividida em novos
+-- meses antes que eles comecem, pelo dashboard antes de gravar tweets e pela retenção agendada
+-- (`retencao.py --apenas-particoes`, ver o cabeçalho de retencao.py). As partições abaixo
+-- cobrem apenas até 2026-12.
 
 -- Tabela de tweets coletados (dados brutos)
 CREATE TABLE tweets_raw (
-    id SERIAL PRIMARY KEY,
+    id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
     modelo VARCHAR(50),
-    data TIMESTAMP,
+    data DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     usuario VARCHAR(100),
-    texto_original TEXT
+    texto_original TEXT,
+    PRIMARY KEY (id, data),
+    INDEX idx_raw_modelo_data (modelo, data)
+)
+PARTITION BY RANGE COLUMNS (data) (
+    PARTITION p_antigo VALUES LESS THAN ('2024-01-01'),
+    PARTITION p202401 VALUES LESS THAN ('2024-02-01'),
+    PARTITION p202402 VALUES LESS THAN ('2024-03-01'),
+    PARTITION p202403 VALUES LESS THAN ('2024-04-01'),
+    PARTITION p202404 VALUES LESS THAN ('2024-05-01'),
+    PARTITION p202405 VALUES LESS THAN ('2024-06-01'),
+    PARTITION p202406 VALUES LESS THAN ('2024-07-01'),
+    PARTITION p202407 VALUES LESS THAN ('2024-08-01'),
+    PARTITION p202408 VALUES LESS THAN ('2024-09-01'),
+    PARTITION p202409 VALUES LESS THAN ('2024-10-01'),
+    PARTITION p202410 VALUES LESS THAN ('2024-11-01'),
+    PARTITION p202411 VALUES LESS THAN ('2024-12-01'),
+    PARTITION p202412 VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
 );
 
--- Tabela de tweets processados (com sentimento)
+-- Tabela de tweets processados (com sentimento). `chave` (SHA-1 de modelo, texto original e
+-- data, ver db_connector.chave_tweet) impede que o mesmo tweet seja gravado, e contado nos
+-- agregados, mais de uma vez; a chave única inclui `data` por causa do particionamento
 CREATE TABLE tweets_processed (
-    id SERIAL PRIMARY KEY,
+    id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    chave CHAR(40) NOT NULL,
     modelo VARCHAR(50),
-    data TIMESTAMP,
+    data DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- tweets sem data: início do dia da gravação
     usuario VARCHAR(100),
     texto_original TEXT,
     texto_limpo TEXT,
     sentimento VARCHAR(20),
-    score FLOAT
+    score FLOAT,
+    classificador VARCHAR(50),  -- classificador que produziu 'sentimento'
+    versao VARCHAR(100),        -- versão desse classificador
+    PRIMARY KEY (id, data),
+    UNIQUE KEY uk_processed_chave (chave, data),
+    INDEX idx_processed_modelo_data (modelo, data)
+)
+PARTITION BY RANGE COLUMNS (data) (
+    PARTITION p_antigo VALUES LESS THAN ('2024-01-01'),
+    PARTITION p202401 VALUES LESS THAN ('2024-02-01'),
+    PARTITION p202402 VALUES LESS THAN ('2024-03-01'),
+    PARTITION p202403 VALUES LESS THAN ('2024-04-01'),
+    PARTITION p202404 VALUES LESS THAN ('2024-05-01'),
+    PARTITION p202405 VALUES LESS THAN ('2024-06-01'),
+    PARTITION p202406 VALUES LESS THAN ('2024-07-01'),
+    PARTITION p202407 VALUES LESS THAN ('2024-08-01'),
+    PARTITION p202408 VALUES LESS THAN ('2024-09-01'),
+    PARTITION p202409 VALUES LESS THAN ('2024-10-01'),
+    PARTITION p202410 VALUES LESS THAN ('2024-11-01'),
+    PARTITION p202411 VALUES LESS THAN ('2024-12-01'),
+    PARTITION p202412 VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
+);
+
+-- Resultados por (tweet, classificador, versão), permitindo comparar classificadores
+-- e re-pontuar apenas os tweets sem resultado para uma nova versão
+CREATE TABLE tweets_resultados (
+    tweet_id BIGINT UNSIGNED NOT NULL,
+    classificador VARCHAR(50) NOT NULL,
+    versao VARCHAR(100) NOT NULL,
+    sentimento VARCHAR(20),
+    score FLOAT,
+    data_classificacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (tweet_id, classificador, versao),
+    INDEX idx_resultados_versao (classificador, versao, tweet_id)
+);
+
+-- Matriz de confusão acumulada entre pares de classificadores (atualizada incrementalmente
+-- a cada lote pontuado; o par (a, b) registra os tweets em que 'b' já tinha resultado quando 'a' foi pontuado)
+CREATE TABLE concordancia_classificadores (
+    classificador_a VARCHAR(50) NOT NULL,
+    versao_a VARCHAR(100) NOT NULL,
+    classificador_b VARCHAR(50) NOT NULL,
+    versao_b VARCHAR(100) NOT NULL,
+    sentimento_a VARCHAR(20) NOT NULL,
+    sentimento_b VARCHAR(20) NOT NULL,
+    quantidade BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (classificador_a, versao_a, classificador_b, versao_b, sentimento_a, sentimento_b)
+);
+
+-- Tweets por classificador/versão, modelo, dia e sentimento, somados na mesma transação em que
+-- os resultados são gravados (insert_processed_tweets e insert_classifier_results); a matriz de
+-- comparação do dashboard lê apenas esta tabela. classificador/versao vazios = sentimento
+-- gravado em tweets_processed
+CREATE TABLE sentimentos_contagens (
+    classificador VARCHAR(50) NOT NULL DEFAULT '',
+    versao VARCHAR(100) NOT NULL DEFAULT '',
+    modelo VARCHAR(50) NOT NULL,   -- em maiúsculas
+    dia DATE NOT NULL,
+    sentimento VARCHAR(20) NOT NULL,
+    quantidade BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (classificador, versao, modelo, dia, sentimento),
+    INDEX idx_sentimentos_dia (classificador, versao, dia)
+);
+
+-- Menções a aspectos do veículo por modelo, aspecto, sentimento e dia (ver dashboard/aspectos.py),
+-- somadas a cada inserção em tweets_processed; o painel de aspectos lê apenas esta tabela
+CREATE TABLE aspectos_contagens (
+    modelo VARCHAR(50) NOT NULL,   -- em maiúsculas, como nos agregados de comparação
+    aspecto VARCHAR(50) NOT NULL,
+    sentimento VARCHAR(20) NOT NULL,
+    dia DATE NOT NULL,
+    quantidade BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (modelo, aspecto, sentimento, dia),
+    INDEX idx_aspectos_dia (dia)
+);
+
+-- Lotes arquivados pela retenção (dashboard/retencao.py); gravado na mesma transação que
+-- remove os resultados dos tweets do lote, para que uma retenção interrompida seja retomada
+CREATE TABLE retencao_compactacoes (
+    lote VARCHAR(64) PRIMARY KEY,   -- tabela de lote: {tabela}_arq_{partição}_{carimbo}
+    tabela VARCHAR(64) NOT NULL,
+    particao VARCHAR(64) NOT NULL,
+    linhas BIGINT NOT NULL,
+    arquivo VARCHAR(255),
+    data_execucao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Tabela de resumos técnicos (vantagens/desvantagens)
@@ -34,10 +198,11 @@ CREATE TABLE resumos_tecnicos (
 
 -- Tabela de análises finais (integração de sentimentos + resumo)
 CREATE TABLE analises_finais (
-    id SERIAL PRIMARY KEY,
+    id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
     modelo VARCHAR(50),
     resumo_sentimentos TEXT,
     recomendacao TEXT,
-    data_geracao TIMESTAMP DEFAULT NOW()
+    data_geracao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_analises_modelo_data (modelo, data_geracao)
 );
 
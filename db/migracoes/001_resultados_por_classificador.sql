@@ -0,0 +1,30 @@
+-- Migração para bancos criados antes dos resultados por classificador/versão.
+-- Em instalações novas, db_schema.sql já contém estas alterações.
+
+USE tcc_autos;
+
+ALTER TABLE tweets_processed
+    ADD COLUMN classificador VARCHAR(50),
+    ADD COLUMN versao VARCHAR(100);
+
+CREATE TABLE IF NOT EXISTS tweets_resultados (
+    tweet_id BIGINT UNSIGNED NOT NULL,
+    classificador VARCHAR(50) NOT NULL,
+    versao VARCHAR(100) NOT NULL,
+    sentimento VARCHAR(20),
+    score FLOAT,
+    data_classificacao TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (tweet_id, classificador, versao),
+    INDEX idx_resultados_versao (classificador, versao, tweet_id)
+);
+
+CREATE TABLE IF NOT EXISTS concordancia_classificadores (
+    classificador_a VARCHAR(50) NOT NULL,
+    versao_a VARCHAR(100) NOT NULL,
+    classificador_b VARCHAR(50) NOT NULL,
+    versao_b VARCHAR(100) NOT NULL,
+    sentimento_a VARCHAR(20) NOT NULL,
+    sentimento_b VARCHAR(20) NOT NULL,
+    quantidade BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (classificador_a, versao_a, classificador_b, versao_b, sentimento_a, sentimento_b)
+);
@@ -0,0 +1,17 @@
+-- Migração para bancos criados antes do índice de aspectos.
+-- Em instalações novas, db_schema.sql já contém esta tabela. Depois de criá-la,
+-- preencha as contagens dos tweets existentes com: python dashboard/aspectos.py --reconstruir
+
+USE tcc_autos;
+
+-- Menções a aspectos do veículo por modelo, aspecto, sentimento e dia (ver dashboard/aspectos.py),
+-- somadas a cada inserção em tweets_processed; o painel de aspectos lê apenas esta tabela
+CREATE TABLE IF NOT EXISTS aspectos_contagens (
+    modelo VARCHAR(50) NOT NULL,   -- em maiúsculas, como nos agregados de comparação
+    aspecto VARCHAR(50) NOT NULL,
+    sentimento VARCHAR(20) NOT NULL,
+    dia DATE NOT NULL,
+    quantidade BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (modelo, aspecto, sentimento, dia),
+    INDEX idx_aspectos_dia (dia)
+);
@@ -0,0 +1,131 @@
+-- Migração para bancos criados antes do particionamento mensal e da retenção.
+-- Em instalações novas, db_schema.sql já contém estas alterações.
+--
+-- Toda chave única de uma tabela particionada precisa conter a coluna de particionamento:
+-- a chave primária passa a ser (id, data), e o índice único `id` criado por SERIAL é
+-- removido (se o banco foi criado sem ele, retire as linhas DROP INDEX id). Tweets sem
+-- data recebem a data da migração, e os modelos passam a maiúsculas. Reescrever as
+-- tabelas pode demorar em bancos grandes.
+
+USE tcc_autos;
+
+UPDATE tweets_raw SET data = CURRENT_TIMESTAMP WHERE data IS NULL;
+UPDATE tweets_processed SET data = CURRENT_TIMESTAMP WHERE data IS NULL;
+
+-- Modelos em maiúsculas, como passam a ser gravados (as consultas agrupam pela coluna)
+UPDATE tweets_raw SET modelo = UPPER(modelo) WHERE BINARY modelo <> UPPER(modelo);
+UPDATE tweets_processed SET modelo = UPPER(modelo) WHERE BINARY modelo <> UPPER(modelo);
+
+ALTER TABLE tweets_raw
+    MODIFY id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    MODIFY data DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP INDEX id,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, data),
+    ADD INDEX idx_raw_modelo_data (modelo, data);
+
+ALTER TABLE tweets_raw
+PARTITION BY RANGE COLUMNS (data) (
+    PARTITION p_antigo VALUES LESS THAN ('2024-01-01'),
+    PARTITION p202401 VALUES LESS THAN ('2024-02-01'),
+    PARTITION p202402 VALUES LESS THAN ('2024-03-01'),
+    PARTITION p202403 VALUES LESS THAN ('2024-04-01'),
+    PARTITION p202404 VALUES LESS THAN ('2024-05-01'),
+    PARTITION p202405 VALUES LESS THAN ('2024-06-01'),
+    PARTITION p202406 VALUES LESS THAN ('2024-07-01'),
+    PARTITION p202407 VALUES LESS THAN ('2024-08-01'),
+    PARTITION p202408 VALUES LESS THAN ('2024-09-01'),
+    PARTITION p202409 VALUES LESS THAN ('2024-10-01'),
+    PARTITION p202410 VALUES LESS THAN ('2024-11-01'),
+    PARTITION p202411 VALUES LESS THAN ('2024-12-01'),
+    PARTITION p202412 VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
+);
+
+ALTER TABLE tweets_processed
+    MODIFY id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    MODIFY data DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP INDEX id,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, data),
+    ADD INDEX idx_processed_modelo_data (modelo, data);
+
+ALTER TABLE tweets_processed
+PARTITION BY RANGE COLUMNS (data) (
+    PARTITION p_antigo VALUES LESS THAN ('2024-01-01'),
+    PARTITION p202401 VALUES LESS THAN ('2024-02-01'),
+    PARTITION p202402 VALUES LESS THAN ('2024-03-01'),
+    PARTITION p202403 VALUES LESS THAN ('2024-04-01'),
+    PARTITION p202404 VALUES LESS THAN ('2024-05-01'),
+    PARTITION p202405 VALUES LESS THAN ('2024-06-01'),
+    PARTITION p202406 VALUES LESS THAN ('2024-07-01'),
+    PARTITION p202407 VALUES LESS THAN ('2024-08-01'),
+    PARTITION p202408 VALUES LESS THAN ('2024-09-01'),
+    PARTITION p202409 VALUES LESS THAN ('2024-10-01'),
+    PARTITION p202410 VALUES LESS THAN ('2024-11-01'),
+    PARTITION p202411 VALUES LESS THAN ('2024-12-01'),
+    PARTITION p202412 VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
+);
+
+ALTER TABLE analises_finais
+    ADD INDEX idx_analises_modelo_data (modelo, data_geracao);
+
+-- Lotes arquivados pela retenção (dashboard/retencao.py); gravado na mesma transação que
+-- remove os resultados dos tweets do lote, para que uma retenção interrompida seja retomada
+CREATE TABLE IF NOT EXISTS retencao_compactacoes (
+    lote VARCHAR(64) PRIMARY KEY,   -- tabela de lote: {tabela}_arq_{partição}_{carimbo}
+    tabela VARCHAR(64) NOT NULL,
+    particao VARCHAR(64) NOT NULL,
+    linhas BIGINT NOT NULL,
+    arquivo VARCHAR(255),
+    data_execucao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,33 @@
+-- Migração para bancos criados antes das contagens diárias de sentimento.
+-- Em instalações novas, db_schema.sql já contém esta tabela. As contagens são preenchidas a
+-- partir dos tweets existentes; aplique-a antes de arquivar meses com dashboard/retencao.py.
+
+USE tcc_autos;
+
+-- Tweets por classificador/versão, modelo, dia e sentimento, somados na mesma transação em que
+-- os resultados são gravados (insert_processed_tweets e insert_classifier_results); a matriz de
+-- comparação do dashboard lê apenas esta tabela. classificador/versao vazios = sentimento
+-- gravado em tweets_processed
+CREATE TABLE IF NOT EXISTS sentimentos_contagens (
+    classificador VARCHAR(50) NOT NULL DEFAULT '',
+    versao VARCHAR(100) NOT NULL DEFAULT '',
+    modelo VARCHAR(50) NOT NULL,   -- em maiúsculas
+    dia DATE NOT NULL,
+    sentimento VARCHAR(20) NOT NULL,
+    quantidade BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (classificador, versao, modelo, dia, sentimento),
+    INDEX idx_sentimentos_dia (classificador, versao, dia)
+);
+
+INSERT INTO sentimentos_contagens (classificador, versao, modelo, dia, sentimento, quantidade)
+SELECT '', '', modelo, DATE(data), sentimento, COUNT(*)
+FROM tweets_processed
+WHERE sentimento IS NOT NULL
+GROUP BY modelo, DATE(data), sentimento;
+
+INSERT INTO sentimentos_contagens (classificador, versao, modelo, dia, sentimento, quantidade)
+SELECT r.classificador, r.versao, p.modelo, DATE(p.data), r.sentimento, COUNT(*)
+FROM tweets_resultados r
+JOIN tweets_processed p ON p.id = r.tweet_id
+WHERE r.sentimento IS NOT NULL
+GROUP BY r.classificador, r.versao, p.modelo, DATE(p.data), r.sentimento;
@@ -0,0 +1,58 @@
+-- Migração para bancos criados antes da chave de deduplicação de tweets_processed.
+-- Em instalações novas, db_schema.sql já contém estas alterações. Aplique-a depois da 004.
+--
+-- Cada tweet recebe a chave SHA-1 de (modelo, texto original, data), a mesma calculada por
+-- db_connector.chave_tweet; repetições gravadas por análises anteriores são removidas (com
+-- seus resultados) e as contagens diárias de sentimento dos dias ainda nas partições ativas
+-- são recalculadas. Depois, recalcule as contagens de aspectos com:
+--     python dashboard/aspectos.py --reconstruir
+-- A concordância entre classificadores não tem dimensão de dia e mantém as repetições já
+-- somadas; para zerá-la, esvazie concordancia_classificadores antes de re-pontuar.
+
+USE tcc_autos;
+
+ALTER TABLE tweets_processed
+    ADD COLUMN chave CHAR(40) NULL AFTER id,
+    ADD INDEX idx_processed_chave (chave, data);
+
+UPDATE tweets_processed
+SET chave = SHA1(CONCAT_WS(CHAR(31 USING utf8mb4), modelo, COALESCE(texto_original, ''),
+                           DATE_FORMAT(data, '%Y-%m-%d %H:%i:%s')));
+
+-- Mantém a primeira gravação de cada tweet
+DELETE r FROM tweets_resultados r
+JOIN tweets_processed d ON d.id = r.tweet_id
+JOIN tweets_processed k ON k.chave = d.chave AND k.data = d.data AND k.id < d.id;
+
+DELETE d FROM tweets_processed d
+JOIN tweets_processed k ON k.chave = d.chave AND k.data = d.data AND k.id < d.id;
+
+ALTER TABLE tweets_processed
+    MODIFY chave CHAR(40) NOT NULL,
+    DROP INDEX idx_processed_chave,
+    ADD UNIQUE KEY uk_processed_chave (chave, data);
+
+-- Dias recontados: todos, ou a partir do limite de p_antigo se a retenção já arquivou meses
+-- (as contagens dos meses arquivados não podem ser refeitas), como em retencao.inicio_dados_ativos
+SET @inicio = (
+    SELECT IF(EXISTS (SELECT 1 FROM retencao_compactacoes WHERE tabela = 'tweets_processed'),
+              STR_TO_DATE(TRIM(BOTH '''' FROM PARTITION_DESCRIPTION), '%Y-%m-%d'),
+              DATE('1000-01-01'))
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'tweets_processed' AND PARTITION_NAME = 'p_antigo'
+);
+
+DELETE FROM sentimentos_contagens WHERE dia >= @inicio;
+
+INSERT INTO sentimentos_contagens (classificador, versao, modelo, dia, sentimento, quantidade)
+SELECT '', '', modelo, DATE(data), sentimento, COUNT(*)
+FROM tweets_processed
+WHERE sentimento IS NOT NULL AND data >= @inicio
+GROUP BY modelo, DATE(data), sentimento;
+
+INSERT INTO sentimentos_contagens (classificador, versao, modelo, dia, sentimento, quantidade)
+SELECT r.classificador, r.versao, p.modelo, DATE(p.data), r.sentimento, COUNT(*)
+FROM tweets_resultados r
+JOIN tweets_processed p ON p.id = r.tweet_id
+WHERE r.sentimento IS NOT NULL AND p.data >= @inicio
+GROUP BY r.classificador, r.versao, p.modelo, DATE(p.data), r.sentimento;
@@ -1,17 +1,27 @@
+import os
+import joblib
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
 from sklearn.metrics import classification_report, confusion_matrix
 import numpy as np
 
 # Nome do arquivo CSV ROTULADO da etapa anterior
 NOME_ARQUIVO_ROTULADO = 'tweets_hb20_onix_2000_rotulado.csv'
 
+# Modelo treinado (TF-IDF + Naive Bayes), reaproveitado pelo dashboard como primeiro estágio da cascata
+ARQUIVO_MODELO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'modelos', 'modelo_nb_tfidf.joblib')
+# Linhas do conjunto de teste (fora do treino), para avaliar a cascata em dashboard/avaliar_cascata.py
+ARQUIVO_TESTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'modelos', 'modelo_nb_tfidf_teste.csv')
+
 # Carregar o DataFrame rotulado
 try:
     df = pd.read_csv(NOME_ARQUIVO_ROTULADO, encoding='utf-8')
-    TEXT_COLUMN = 'content_processado' # Coluna limpa e sem stopwords
+    # Coluna limpa, com stopwords: é o texto que o dashboard classifica (preprocessamento.limpar_texto),
+    # já que o modelo salvo é o primeiro estágio da cascata
+    TEXT_COLUMN = 'content_limpo'
     LABEL_COLUMN_BRUTA = 'sentiment_label'
     
     # Excluir linhas onde o texto processado está vazio
@@ -48,6 +58,7 @@ print(y.value_counts(normalize=True).mul(100).round(1).astype(str) + '%')
 
 # ----------------------------------------------------
 # 2. DIVISÃO DOS DADOS (TREINO E TESTE)
+# (validação cruzada e busca de hiperparâmetros: avaliacao_naive_bayes.py)
 # ----------------------------------------------------
 
 X_train, X_test, y_train, y_test = train_test_split(
@@ -64,11 +75,12 @@ X_train, X_test, y_train, y_test = train_test_split(
 print("\n--- Vetorização dos Dados (TF-IDF) ---")
 tfidf = TfidfVectorizer(max_features=5000) 
 
-# Ajustar e transformar (fit_transform) no treino
-X_train_vectorized = tfidf.fit_transform(X_train).toarray()
+# Ajustar e transformar (fit_transform) no treino; as matrizes ficam esparsas (o MultinomialNB
+# aceita CSR diretamente), então a memória cresce com o número de termos presentes, não com o vocabulário
+X_train_vectorized = tfidf.fit_transform(X_train)
 
 # Transformar (transform) no teste
-X_test_vectorized = tfidf.transform(X_test).toarray()
+X_test_vectorized = tfidf.transform(X_test)
 
 # ----------------------------------------------------
 # 4. TREINAMENTO DO CLASSIFICADOR (NAIVE BAYES)
@@ -106,7 +118,19 @@ print(f"\n[C] Precisão Global do Modelo (Accuracy): {accuracy:.4f}")
 print("=======================================================")
 
 # ----------------------------------------------------
-# 6. DEMONSTRAÇÃO PRÁTICA
+# 6. PERSISTÊNCIA DO MODELO
+# ----------------------------------------------------
+
+# Vetorizador e classificador salvos juntos, para classificar textos brutos (limpos) diretamente
+modelo_final = Pipeline([('tfidf', tfidf), ('nb', classifier)])
+os.makedirs(os.path.dirname(ARQUIVO_MODELO), exist_ok=True)
+joblib.dump(modelo_final, ARQUIVO_MODELO)
+print(f"\n✅ Modelo TF-IDF + Naive Bayes salvo em: '{ARQUIVO_MODELO}'")
+df.loc[X_test.index, ['content', LABEL_COLUMN_BRUTA]].to_csv(ARQUIVO_TESTE, index=False, encoding='utf-8')
+print(f"✅ {len(X_test)} textos de teste (fora do treino) salvos em: '{ARQUIVO_TESTE}'")
+
+# ----------------------------------------------------
+# 7. DEMONSTRAÇÃO PRÁTICA
 # ----------------------------------------------------
 
 print("\n--- Demonstração Prática (Teste de Novas Frases) ---")
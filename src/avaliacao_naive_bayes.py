@@ -0,0 +1,214 @@
+# avaliacao_naive_bayes.py
+#
+# Avaliação e busca de hiperparâmetros do pipeline TF-IDF + Naive Bayes com validação
+# cruzada estratificada (k-fold). Cada tarefa (parâmetros do vetorizador, fold) roda em
+# paralelo nos núcleos disponíveis e treina todas as combinações do classificador sobre a
+# mesma matriz TF-IDF. Os ajustes TF-IDF por fold ficam em cache em disco, então refazer a
+# busca alterando apenas o classificador não revetoriza o corpus. As matrizes são sempre
+# esparsas (nada é densificado), o que permite corpora muito maiores que a amostra de 2000.
+# As tarefas executadas pelos processos ficam em cv_naive_bayes.py.
+#
+# Uso: python avaliacao_naive_bayes.py [--arquivo CSV] [--folds 5] [--n-jobs -1] [--salvar-melhor]
+
+import argparse
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.pipeline import Pipeline
+
+from cv_naive_bayes import (
+    LABEL_COLUMN_BRUTA, TEXT_COLUMN, assinatura_arquivo, avaliar_tarefa, carregar_tabela, criar_classificador, dividir_treino_teste
+)
+
+DIRETORIO_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+ARQUIVO_ROTULADO = os.path.join(DIRETORIO_BASE, 'data', 'raw', 'tweets_hb20_onix_rotulado.csv')
+DIRETORIO_CACHE = os.path.join(DIRETORIO_BASE, 'data', 'cache', 'tfidf_folds')
+DIRETORIO_RELATORIO = os.path.join(DIRETORIO_BASE, 'data', 'metricas', 'avaliacao_nb')
+# Mesmo arquivo salvo por analise_sentimento_hb20_onix.py (primeiro estágio da cascata do dashboard),
+# e as linhas deixadas fora do treino desse modelo (usadas por dashboard/avaliar_cascata.py)
+ARQUIVO_MODELO = os.path.join(DIRETORIO_BASE, 'data', 'modelos', 'modelo_nb_tfidf.joblib')
+ARQUIVO_TESTE = os.path.join(DIRETORIO_BASE, 'data', 'modelos', 'modelo_nb_tfidf_teste.csv')
+
+# Grades de busca; a configuração atual do script de treino está incluída e é destacada no relatório
+GRADE_VETORIZADOR = {
+    'max_features': [5000, 20000, None],
+    'ngram_range': [(1, 1), (1, 2)],
+    'min_df': [1, 2],
+    'sublinear_tf': [False, True],
+}
+GRADE_CLASSIFICADOR = {
+    'modelo': ['multinomial', 'complement'],
+    'alpha': [0.1, 0.3, 1.0],
+    'fit_prior': [True, False],
+}
+CONFIGURACAO_ATUAL = (
+    {'max_features': 5000, 'ngram_range': (1, 1), 'min_df': 1, 'sublinear_tf': False},
+    {'modelo': 'multinomial', 'alpha': 1.0, 'fit_prior': True},
+)
+
+
+def expandir_grade(grade):
+    """Lista de dicionários com todas as combinações da grade."""
+    nomes = list(grade)
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*(grade[nome] for nome in nomes))]
+
+
+def _chave(params_vetorizador, params_classificador):
+    return json.dumps([params_vetorizador, params_classificador], sort_keys=True)
+
+
+def resumir_resultados(resultados, classes):
+    """Agrega os folds por configuração: médias/desvios das métricas e matriz de confusão somada."""
+    grupos = {}
+    for resultado in resultados:
+        grupos.setdefault(_chave(resultado['vetorizador'], resultado['classificador']), []).append(resultado)
+
+    linhas, matrizes = [], {}
+    for chave, folds in grupos.items():
+        vetorizador, classificador = folds[0]['vetorizador'], folds[0]['classificador']
+        linha = {f"tfidf_{nome}": str(valor) for nome, valor in vetorizador.items()}
+        linha.update({f"nb_{nome}": valor for nome, valor in classificador.items()})
+        for metrica in ['acuracia', 'f1_macro', 'f1_ponderado']:
+            valores = np.array([fold[metrica] for fold in folds])
+            linha[f"{metrica}_media"] = valores.mean()
+            linha[f"{metrica}_dp"] = valores.std()
+        linha['vocabulario_medio'] = np.mean([fold['vocabulario'] for fold in folds])
+        linha['tempo_treino_s'] = sum(fold['tempo_treino_s'] for fold in folds)
+        linha['configuracao_atual'] = (vetorizador, classificador) == CONFIGURACAO_ATUAL
+        linha['chave'] = chave
+        linhas.append(linha)
+        matrizes[chave] = pd.DataFrame(sum(fold['matriz'] for fold in folds), index=classes, columns=classes)
+
+    tabela = pd.DataFrame(linhas).sort_values('f1_macro_media', ascending=False).reset_index(drop=True)
+    tabela.insert(0, 'posicao', np.arange(1, len(tabela) + 1))
+    return tabela, matrizes
+
+
+def escrever_relatorio(diretorio, tabela, matrizes, contexto, top=5):
+    """Grava resultados.csv (todas as configurações), matrizes.json e relatorio.md (ranking + matrizes)."""
+    os.makedirs(diretorio, exist_ok=True)
+    tabela.drop(columns=['chave']).to_csv(os.path.join(diretorio, 'resultados.csv'), index=False)
+    with open(os.path.join(diretorio, 'matrizes.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'contexto': contexto,
+            'matrizes': {chave: matriz.to_dict(orient='split') for chave, matriz in matrizes.items()},
+        }, f, ensure_ascii=False, indent=1)
+
+    colunas = [c for c in tabela.columns if c.startswith(('tfidf_', 'nb_'))] + ['acuracia_media', 'f1_macro_media', 'f1_macro_dp']
+    destaque = tabela.head(top)
+    atual = tabela[tabela['configuracao_atual']]
+    linhas = [
+        "# Avaliação TF-IDF + Naive Bayes",
+        "",
+        *[f"- **{nome}:** {valor}" for nome, valor in contexto.items()],
+        "",
+        f"## Melhores {top} configurações (F1 macro, validação cruzada)",
+        "",
+        "```",
+        destaque[['posicao'] + colunas].to_string(index=False, float_format=lambda v: f"{v:.4f}"),
+        "```",
+    ]
+    if not atual.empty:
+        linhas += [
+            "",
+            "## Configuração atual de analise_sentimento_hb20_onix.py",
+            "",
+            "```",
+            atual[['posicao'] + colunas].to_string(index=False, float_format=lambda v: f"{v:.4f}"),
+            "```",
+        ]
+
+    linhas += ["", "## Matrizes de confusão (somadas nos folds; linhas = real, colunas = previsto)"]
+    for _, linha in pd.concat([destaque, atual]).drop_duplicates('chave').iterrows():
+        linhas += ["", f"### #{linha['posicao']}: {linha['chave']}", "", "```", matrizes[linha['chave']].to_string(), "```"]
+
+    with open(os.path.join(diretorio, 'relatorio.md'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(linhas) + '\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Validação cruzada e busca em grade do pipeline TF-IDF + Naive Bayes.")
+    parser.add_argument('--arquivo', default=ARQUIVO_ROTULADO)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Processos em paralelo (-1 = todos os núcleos).")
+    parser.add_argument('--saida', default=DIRETORIO_RELATORIO)
+    parser.add_argument('--cache', default=DIRETORIO_CACHE)
+    parser.add_argument('--salvar-melhor', action='store_true',
+                        help="Treina o melhor MultinomialNB sem o conjunto de teste e salva o modelo e o teste.")
+    args = parser.parse_args()
+
+    try:
+        corpus = carregar_tabela(args.arquivo)
+    except FileNotFoundError:
+        print(f"❌ ERRO: Arquivo '{args.arquivo}' não encontrado.")
+        exit()
+    textos, rotulos = corpus[TEXT_COLUMN].astype(str).to_numpy(dtype=object), corpus['sentiment_final'].to_numpy(dtype=str)
+
+    classes = sorted(str(classe) for classe in set(rotulos))
+    assinatura = assinatura_arquivo(args.arquivo)
+    grade_vetorizador = expandir_grade(GRADE_VETORIZADOR)
+    grade_classificador = expandir_grade(GRADE_CLASSIFICADOR)
+    print(f"✅ Corpus '{args.arquivo}' carregado: {len(textos)} textos, classes {classes} (assinatura {assinatura}).")
+    print(f"--- {len(grade_vetorizador)} vetorizadores x {len(grade_classificador)} classificadores x {args.folds} folds ---")
+
+    inicio = time.perf_counter()
+    saidas = Parallel(n_jobs=args.n_jobs)(
+        delayed(avaliar_tarefa)(
+            textos, rotulos, assinatura, args.folds, args.semente, fold, params_vetorizador, grade_classificador, classes, args.cache
+        )
+        for params_vetorizador in grade_vetorizador
+        for fold in range(args.folds)
+    )
+    duracao = time.perf_counter() - inicio
+
+    resultados = [resultado for resultados_tarefa, _ in saidas for resultado in resultados_tarefa]
+    tempo_vetorizacao = sum(tempo for _, tempo in saidas)
+    tabela, matrizes = resumir_resultados(resultados, classes)
+
+    contexto = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'arquivo': os.path.abspath(args.arquivo),
+        'assinatura do corpus': assinatura,
+        'textos': len(textos),
+        'distribuição': ', '.join(f"{classe}: {np.mean(rotulos == classe) * 100:.1f}%" for classe in classes),
+        'folds': f"{args.folds} (estratificados, semente {args.semente})",
+        'configurações': len(tabela),
+        'tempo total (s)': f"{duracao:.1f}",
+        'tempo de vetorização somado (s)': f"{tempo_vetorizacao:.1f} (próximo de 0 quando os folds vêm do cache)",
+    }
+    escrever_relatorio(args.saida, tabela, matrizes, contexto)
+
+    melhor = tabela.iloc[0]
+    print(f"\n✅ Busca concluída em {duracao:.1f}s (vetorização somada: {tempo_vetorizacao:.1f}s).")
+    print(f"Melhor configuração: {melhor['chave']}")
+    print(f"F1 macro: {melhor['f1_macro_media']:.4f} ± {melhor['f1_macro_dp']:.4f} | Acurácia: {melhor['acuracia_media']:.4f}")
+    print(f"Relatório salvo em: '{args.saida}'")
+
+    if args.salvar_melhor:
+        # O modelo salvo é o primeiro estágio da cascata, cujo limiar usa predict_proba: o
+        # ComplementNB não estima probabilidades calibradas, então vale o melhor MultinomialNB
+        melhor_multinomial = tabela[tabela['nb_modelo'] == 'multinomial'].iloc[0]
+        params_vetorizador, params_classificador = json.loads(melhor_multinomial['chave'])
+        if 'ngram_range' in params_vetorizador:
+            params_vetorizador['ngram_range'] = tuple(params_vetorizador['ngram_range'])
+        # Como em analise_sentimento_hb20_onix.py, o teste fica fora do treino: as confianças do
+        # primeiro estágio nos textos de treino seriam otimistas para avaliar a cascata
+        treino, teste = dividir_treino_teste(rotulos, args.semente)
+        modelo_final = Pipeline([
+            ('tfidf', TfidfVectorizer(dtype=np.float32, **params_vetorizador)),
+            ('nb', criar_classificador(params_classificador)),
+        ]).fit(textos[treino], rotulos[treino])
+        os.makedirs(os.path.dirname(ARQUIVO_MODELO), exist_ok=True)
+        joblib.dump(modelo_final, ARQUIVO_MODELO)
+        corpus.loc[teste, ['content', LABEL_COLUMN_BRUTA]].to_csv(ARQUIVO_TESTE, index=False, encoding='utf-8')
+        print(f"✅ Melhor MultinomialNB (#{melhor_multinomial['posicao']}) treinado em {len(treino)} textos e salvo em: '{ARQUIVO_MODELO}'")
+        print(f"✅ {len(teste)} textos de teste (fora do treino) salvos em: '{ARQUIVO_TESTE}'")
@@ -0,0 +1,130 @@
+# cv_naive_bayes.py
+#
+# Leitura do corpus e tarefas da validação cruzada do pipeline TF-IDF + Naive Bayes
+# (usadas por avaliacao_naive_bayes.py). Ficam em um módulo importável porque os
+# processos do joblib (loky) recebem as tarefas por referência e não conseguem
+# encontrá-las em um script executado como __main__.
+
+import hashlib
+import itertools
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Memory
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.naive_bayes import ComplementNB, MultinomialNB
+
+# Texto limpo com stopwords, como o dashboard classifica (preprocessamento.limpar_texto): o
+# modelo salvo é o primeiro estágio da cascata e recebe esse texto
+TEXT_COLUMN = 'content_limpo'
+LABEL_COLUMN_BRUTA = 'sentiment_label'
+PROPORCAO_TESTE = 0.2
+
+# Mesmo mapeamento de 4 para 3 classes de analise_sentimento_hb20_onix.py
+MAPEAMENTO_SENTIMENTO = {
+    'Positivo': 'Positivo',
+    'Negativo': 'Negativo',
+    'Neutro/Ruído': 'Neutro',
+    'Neutro/Conflito': 'Neutro'
+}
+
+CLASSIFICADORES = {'multinomial': MultinomialNB, 'complement': ComplementNB}
+
+
+def assinatura_arquivo(caminho):
+    """Hash do conteúdo do CSV (e do mapeamento de rótulos): muda o corpus, muda a chave do cache."""
+    sha1 = hashlib.sha1()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(bloco)
+    sha1.update(json.dumps([TEXT_COLUMN, MAPEAMENTO_SENTIMENTO], sort_keys=True).encode('utf-8'))
+    return sha1.hexdigest()[:12]
+
+
+def carregar_tabela(caminho):
+    """Linhas do CSV com texto e rótulo (3 classes, coluna sentiment_final)."""
+    df = pd.read_csv(caminho, encoding='utf-8')
+    df['sentiment_final'] = df[LABEL_COLUMN_BRUTA].map(MAPEAMENTO_SENTIMENTO)
+    return df.dropna(subset=[TEXT_COLUMN, 'sentiment_final']).reset_index(drop=True)
+
+
+def carregar_corpus(caminho):
+    """Textos e rótulos (3 classes) do CSV."""
+    df = carregar_tabela(caminho)
+    return df[TEXT_COLUMN].astype(str).to_numpy(dtype=object), df['sentiment_final'].to_numpy(dtype=str)
+
+
+def dividir_treino_teste(rotulos, semente=42, proporcao_teste=PROPORCAO_TESTE):
+    """
+    Índices (treino, teste) estratificados. O teste fica fora do modelo salvo e é gravado ao
+    lado dele, para avaliar a cascata (dashboard/avaliar_cascata.py) em textos não vistos.
+    """
+    return train_test_split(np.arange(len(rotulos)), test_size=proporcao_teste, random_state=semente, stratify=rotulos)
+
+
+def indices_fold(rotulos, n_folds, semente, fold):
+    """Índices (treino, teste) do fold, determinísticos para (n_folds, semente)."""
+    divisor = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=semente)
+    return next(itertools.islice(divisor.split(np.zeros(len(rotulos)), rotulos), fold, None))
+
+
+def _vetorizar_fold(assinatura, n_folds, semente, fold, params_vetorizador, textos, rotulos):
+    """Ajusta o TF-IDF no treino do fold e transforma treino e teste (matrizes esparsas float32)."""
+    treino, teste = indices_fold(rotulos, n_folds, semente, fold)
+    vetorizador = TfidfVectorizer(dtype=np.float32, **params_vetorizador)
+    return vetorizador.fit_transform(textos[treino]), vetorizador.transform(textos[teste])
+
+
+def criar_classificador(params_classificador):
+    params = dict(params_classificador)
+    return CLASSIFICADORES[params.pop('modelo')](**params)
+
+
+def metricas_da_matriz(matriz):
+    """Acurácia, F1 macro e F1 ponderado a partir da matriz de confusão (linhas = real)."""
+    acertos = np.diag(matriz).astype(float)
+    reais, previstos = matriz.sum(axis=1), matriz.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f1 = np.nan_to_num(2 * acertos / (reais + previstos))
+    return acertos.sum() / matriz.sum(), f1.mean(), (f1 * reais).sum() / reais.sum()
+
+
+def avaliar_tarefa(textos, rotulos, assinatura, n_folds, semente, fold, params_vetorizador, grade_classificador, classes, dir_cache):
+    """
+    Avalia todas as combinações do classificador em um fold, para um conjunto de parâmetros
+    do vetorizador. A chave do cache ignora o corpus em si: vale a assinatura do seu conteúdo.
+    """
+    vetorizar = Memory(dir_cache, verbose=0).cache(_vetorizar_fold, ignore=['textos', 'rotulos'])
+
+    inicio = time.perf_counter()
+    X_treino, X_teste = vetorizar(assinatura, n_folds, semente, fold, params_vetorizador, textos, rotulos)
+    tempo_vetorizacao = time.perf_counter() - inicio
+
+    treino, teste = indices_fold(rotulos, n_folds, semente, fold)
+    # Rótulos como índices em `classes`: a matriz de confusão sai de um único bincount
+    codigos = np.searchsorted(classes, rotulos)
+    y_treino, y_teste = codigos[treino], codigos[teste]
+    k = len(classes)
+
+    resultados = []
+    for params_classificador in grade_classificador:
+        inicio = time.perf_counter()
+        classificador = criar_classificador(params_classificador).fit(X_treino, y_treino)
+        previstos = classificador.predict(X_teste)
+        matriz = np.bincount(y_teste * k + previstos, minlength=k * k).reshape(k, k)
+        acuracia, f1_macro, f1_ponderado = metricas_da_matriz(matriz)
+        resultados.append({
+            'vetorizador': params_vetorizador,
+            'classificador': params_classificador,
+            'fold': fold,
+            'acuracia': acuracia,
+            'f1_macro': f1_macro,
+            'f1_ponderado': f1_ponderado,
+            'matriz': matriz,
+            'tempo_treino_s': time.perf_counter() - inicio,
+            'vocabulario': X_treino.shape[1],
+        })
+    return resultados, tempo_vetorizacao
@@ -4,15 +4,8 @@ import random
 # Nome do arquivo CSV PROCESSADO da etapa anterior
 NOME_ARQUIVO_PROCESSADO = 'tweets_hb20_onix_2000_processado.csv'
 
-# Carregar o DataFrame processado
-try:
-    df = pd.read_csv(NOME_ARQUIVO_PROCESSADO, encoding='utf-8')
-    # Usaremos a coluna limpa para a rotulação
-    TEXT_COLUMN = 'content_limpo'
-    print(f"✅ Arquivo processado '{NOME_ARQUIVO_PROCESSADO}' carregado com sucesso.")
-except FileNotFoundError:
-    print(f"❌ ERRO: Arquivo '{NOME_ARQUIVO_PROCESSADO}' não encontrado. Certifique-se de que a etapa anterior foi executada.")
-    exit()
+# Usaremos a coluna limpa para a rotulação
+TEXT_COLUMN = 'content_limpo'
 
 # ----------------------------------------------------
 # 1. LÉXICO HEURÍSTICO (SIMULAÇÃO)
@@ -77,39 +70,49 @@ def automatic_labeling(text):
     return 'Neutro/Ruído'
 
 
-# ----------------------------------------------------
-# 3. APLICAÇÃO DA ROTULAGEM
-# ----------------------------------------------------
+# Executado apenas como script; o módulo pode ser importado para reaproveitar automatic_labeling
+if __name__ == '__main__':
+    # Carregar o DataFrame processado
+    try:
+        df = pd.read_csv(NOME_ARQUIVO_PROCESSADO, encoding='utf-8')
+        print(f"✅ Arquivo processado '{NOME_ARQUIVO_PROCESSADO}' carregado com sucesso.")
+    except FileNotFoundError:
+        print(f"❌ ERRO: Arquivo '{NOME_ARQUIVO_PROCESSADO}' não encontrado. Certifique-se de que a etapa anterior foi executada.")
+        exit()
 
-print("\n--- Iniciando a Rotulação Automática ---")
+    # ----------------------------------------------------
+    # 3. APLICAÇÃO DA ROTULAGEM
+    # ----------------------------------------------------
 
-# Aplica a função de labeling à coluna limpa
-df['sentiment_label'] = df[TEXT_COLUMN].apply(automatic_labeling)
+    print("\n--- Iniciando a Rotulação Automática ---")
 
-print("--- Rotulação Concluída ---")
+    # Aplica a função de labeling à coluna limpa
+    df['sentiment_label'] = df[TEXT_COLUMN].apply(automatic_labeling)
 
-# ----------------------------------------------------
-# 4. VERIFICAÇÃO E SALVAMENTO
-# ----------------------------------------------------
+    print("--- Rotulação Concluída ---")
 
-# Exibir a distribuição dos rótulos
-print("\n--- Distribuição dos Rótulos Gerados ---")
-print(df['sentiment_label'].value_counts(normalize=True).mul(100).round(1).astype(str) + '%')
+    # ----------------------------------------------------
+    # 4. VERIFICAÇÃO E SALVAMENTO
+    # ----------------------------------------------------
 
-# Exibir amostras para verificação
-print("\n--- Amostra de Comparação (Limpo vs. Rótulo) ---")
-df_comparacao = df[['content_limpo', 'sentiment_label']].sample(5)
-pd.set_option('display.max_colwidth', None)
-print(df_comparacao)
-pd.set_option('display.max_colwidth', 50) # Reset
+    # Exibir a distribuição dos rótulos
+    print("\n--- Distribuição dos Rótulos Gerados ---")
+    print(df['sentiment_label'].value_counts(normalize=True).mul(100).round(1).astype(str) + '%')
 
-# Salvar o arquivo rotulado
-NOME_ARQUIVO_ROTULADO = 'tweets_hb20_onix_2000_rotulado.csv'
-df.to_csv(NOME_ARQUIVO_ROTULADO, index=False, encoding='utf-8')
+    # Exibir amostras para verificação
+    print("\n--- Amostra de Comparação (Limpo vs. Rótulo) ---")
+    df_comparacao = df[['content_limpo', 'sentiment_label']].sample(5)
+    pd.set_option('display.max_colwidth', None)
+    print(df_comparacao)
+    pd.set_option('display.max_colwidth', 50) # Reset
 
-print(f"\n✅ Rotulação Heurística Finalizada com sucesso!")
-print(f"Arquivo rotulado salvo como: '{NOME_ARQUIVO_ROTULADO}'")
+    # Salvar o arquivo rotulado
+    NOME_ARQUIVO_ROTULADO = 'tweets_hb20_onix_2000_rotulado.csv'
+    df.to_csv(NOME_ARQUIVO_ROTULADO, index=False, encoding='utf-8')
 
-# ----------------------------------------------------
-# 5. PRÓXIMO PASSO: MODELAGEM
-# ----------------------------------------------------
\ No newline at end of file
+    print(f"\n✅ Rotulação Heurística Finalizada com sucesso!")
+    print(f"Arquivo rotulado salvo como: '{NOME_ARQUIVO_ROTULADO}'")
+
+    # ----------------------------------------------------
+    # 5. PRÓXIMO PASSO: MODELAGEM
+    # ----------------------------------------------------
\ No newline at end of file
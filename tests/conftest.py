@@ -0,0 +1,5 @@
+# Os módulos do dashboard são importados pelo nome (como em `streamlit run dashboard/app.py`)
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
@@ -0,0 +1,86 @@
+# Testes do extrator de aspectos: termos, prefixos, expressões e os termos ambíguos do léxico padrão.
+
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from aspectos import ASPECTOS_PADRAO, ExtratorAspectos, contar_aspectos, tabela_aspectos
+
+
+@pytest.fixture(scope='module')
+def extrator():
+    return ExtratorAspectos(ASPECTOS_PADRAO)
+
+
+@pytest.mark.parametrize('texto, esperado', [
+    ('o motor é fraco mas o consumo é ótimo', ['consumo', 'motor']),
+    ('a aceleração decepciona', ['motor']),                 # prefixo aceler*
+    ('o sistema de som é ruim e o painel digital trava', ['tecnologia']),
+    ('ótimo custo benefício', ['preço']),
+    ('motorista de aplicativo', []),                             # 'motor' só casa a palavra inteira
+    ('', []),
+])
+def test_termos_prefixos_e_expressoes(extrator, texto, esperado):
+    assert extrator.aspectos(texto) == esperado
+
+
+@pytest.mark.parametrize('texto, esperado', [
+    ('o carro é muito seguro', ['segurança']),
+    ('o seguro do carro está caro', ['preço']),
+    ('fiz o seguro auto ontem', []),
+    ('seguro de vida', []),
+    ('gostei da cor vermelha', ['design']),
+    ('já sei de cor o manual', []),
+    ('a cortina do teto', []),
+    ('a central trava toda hora', ['tecnologia']),
+    ('liguei na central de atendimento', []),
+    ('o valor está alto', ['preço']),
+    ('aprendi a dar valor ao carro antigo', []),
+    ('tem valor sentimental', []),
+])
+def test_termos_ambiguos(extrator, texto, esperado):
+    assert extrator.aspectos(texto) == esperado
+
+
+def test_exclusao_nao_apaga_outras_mencoes(extrator):
+    # O trecho ignorado some, mas o restante do texto continua valendo
+    assert extrator.aspectos('o seguro é caro mas o carro é seguro') == ['preço', 'segurança']
+
+
+def test_lexico_proprio_e_versao():
+    lexico = {'conforto': ['banco*', 'espaço interno', '-banco do brasil']}
+    extrator = ExtratorAspectos(lexico)
+    assert extrator.aspectos('os bancos são duros') == ['conforto']
+    assert extrator.aspectos('sobra espaço interno') == ['conforto']
+    assert extrator.aspectos('financiei no banco do brasil') == []
+    assert extrator.versao == ExtratorAspectos(dict(lexico)).versao
+    assert extrator.versao != ExtratorAspectos({'conforto': ['banco*']}).versao
+
+
+def test_contar_aspectos(extrator):
+    tweets = [
+        ('hb20', datetime(2026, 5, 3, 14, 0), 'motor fraco e caro', 'NEGATIVO'),
+        ('HB20', date(2026, 5, 3), 'motor forte', 'POSITIVO'),
+        ('HB20', datetime(2026, 5, 3), 'motor sem sentimento', None),
+        ('ONIX', datetime(2026, 5, 4), 'nada a ver', 'NEUTRO'),
+    ]
+    assert contar_aspectos(extrator, tweets) == {
+        ('HB20', 'motor', 'NEGATIVO', date(2026, 5, 3)): 1,
+        ('HB20', 'preço', 'NEGATIVO', date(2026, 5, 3)): 1,
+        ('HB20', 'motor', 'POSITIVO', date(2026, 5, 3)): 1,
+    }
+
+
+def test_tabela_aspectos():
+    contagens = pd.DataFrame([
+        ('HB20', 'motor', 'POSITIVO', 3),
+        ('HB20', 'motor', 'NEGATIVO', 1),
+        ('HB20', 'preço', 'NEGATIVO', 5),
+        ('ONIX', 'preço', 'POSITIVO', 9),
+    ], columns=['modelo', 'aspecto', 'sentimento', 'quantidade'])
+    tabela = tabela_aspectos(contagens, 'hb20')
+    assert list(tabela.index) == ['preço', 'motor']
+    assert tabela.loc['preço', 'Índice Líquido (pp)'] == -100
+    assert tabela.loc['motor', 'Índice Líquido (pp)'] == 50
+    assert tabela_aspectos(contagens, 'Polo').empty
@@ -0,0 +1,199 @@
+# Testes do coletor multi-fonte, sem acesso às fontes reais: as respostas vêm das fixtures
+# gravadas (data/fixtures/coleta) ou de um servidor HTTP local.
+
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import coleta
+from coleta import datas_para_gravar
+from coletor import COLUNAS_SAIDA, Cassete, Coletor, LimitadorTaxa, carregar_coletados, chave_modelo, normalizar
+from conectores import ConectorReclameAqui, criar_conectores
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'fixtures', 'coleta')
+
+PAGINA_RECLAMACOES = """<html><body>
+  <div class="complain-item">
+    <a href="/empresa-teste/barulho-no-hb20_1/"><h4>Barulho no HB20</h4></a>
+    <p>Meu   HB20 faz barulho na suspensão.</p>
+    <span class="date">05/03/2025</span>
+  </div>
+  <div class="complain-item">
+    <a href="/empresa-teste/pintura-do-creta_2/"><h4>Pintura do Creta</h4></a>
+    <p>A pintura descascou.</p>
+    <span class="date">06/03/2025</span>
+  </div>
+</body></html>"""
+
+
+class ServidorFalho:
+    """
+    Servidor HTTP local: responde `falhas` (status, em ordem) às primeiras requisições e,
+    depois, a página de reclamações na página 1 e uma página vazia nas seguintes.
+    """
+
+    def __init__(self, falhas=()):
+        self.falhas = list(falhas)
+        self.requisicoes = []
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                servidor.requisicoes.append(self.path)
+                if servidor.falhas:
+                    self.send_response(servidor.falhas.pop(0))
+                    self.end_headers()
+                    return
+                corpo = PAGINA_RECLAMACOES if self.path.endswith('pagina=1') else "<html><body></body></html>"
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.end_headers()
+                self.wfile.write(corpo.encode('utf-8'))
+
+            def log_message(self, *args):
+                pass
+
+        self._http = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self._http.server_address[1]}/{{empresa}}/?pagina={{pagina}}"
+
+    def __enter__(self):
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self._http.shutdown()
+        self._http.server_close()
+
+
+def _coletor_local(servidor, diretorio, tentativas=4):
+    conector = ConectorReclameAqui(empresas={'HB20': 'empresa-teste'}, url=servidor.url, timeout=5)
+    limites = {'reclameaqui': {'taxa_por_segundo': None, 'concorrencia': 1, 'tentativas': tentativas}}
+    return Coletor([conector], str(diretorio), limites=limites, max_paginas=5, espera_base=0.01)
+
+
+def test_limitador_respeita_a_taxa():
+    taxa, n = 20.0, 6
+    limitador = LimitadorTaxa(taxa_por_segundo=taxa, rajada=1)
+
+    async def consumir():
+        for _ in range(n):
+            await limitador.aguardar()
+
+    inicio = time.monotonic()
+    asyncio.run(consumir())
+    # A primeira ficha é imediata (rajada = 1); as demais chegam a `taxa` por segundo
+    assert time.monotonic() - inicio >= (n - 1) / taxa
+
+
+def test_limitador_sem_taxa_nao_espera():
+    assert asyncio.run(LimitadorTaxa(None).aguardar()) == 0.0
+
+
+@pytest.mark.parametrize('falhas', [(429,), (503, 500), (429, 502)])
+def test_erros_transitorios_sao_repetidos(tmp_path, falhas):
+    with ServidorFalho(falhas) as servidor:
+        coletor = _coletor_local(servidor, tmp_path)
+        resumo = asyncio.run(coletor.coletar(['HB20'])).iloc[0]
+
+    assert resumo['retentativas'] == len(falhas)
+    assert resumo['falhas'] == 0
+    # A página 1 é pedida de novo a cada falha; a coleta termina na página 2, vazia
+    assert servidor.requisicoes == ['/empresa-teste/?pagina=1'] * (len(falhas) + 1) + ['/empresa-teste/?pagina=2']
+    assert resumo['gravados'] == 1
+
+
+def test_erro_permanente_nao_e_repetido(tmp_path):
+    with ServidorFalho([404]) as servidor:
+        coletor = _coletor_local(servidor, tmp_path)
+        resumo = asyncio.run(coletor.coletar(['HB20'])).iloc[0]
+
+    assert resumo['retentativas'] == 0
+    assert resumo['falhas'] == 1
+    assert len(servidor.requisicoes) == 1
+
+
+def test_tentativas_esgotadas_contam_como_falha(tmp_path):
+    with ServidorFalho([503, 503, 503]) as servidor:
+        coletor = _coletor_local(servidor, tmp_path, tentativas=3)
+        resumo = asyncio.run(coletor.coletar(['HB20'])).iloc[0]
+
+    assert resumo['retentativas'] == 2
+    assert resumo['falhas'] == 1
+    assert not os.path.exists(coletor.arquivo_saida)
+
+
+def _coletar_fixtures(diretorio):
+    coletor = Coletor(criar_conectores(['x', 'reclameaqui']), str(diretorio),
+                      cassete=Cassete(FIXTURES, 'reproduzir'), max_paginas=5)
+    resumo = asyncio.run(coletor.coletar(['HB20', 'Onix']))
+    return resumo.set_index('fonte')['gravados'].to_dict()
+
+
+def test_checkpoint_evita_itens_repetidos(tmp_path):
+    primeira = _coletar_fixtures(tmp_path)
+    assert primeira['x'] > 0 and primeira['reclameaqui'] > 0
+
+    segunda = _coletar_fixtures(tmp_path)
+    assert segunda == {'x': 0, 'reclameaqui': 0}
+
+    coletados = carregar_coletados(str(tmp_path))
+    assert len(coletados) == sum(primeira.values())
+    assert not coletados.duplicated(['source', 'modelo', 'item_id']).any()
+
+
+def test_saida_no_esquema_comum(tmp_path):
+    _coletar_fixtures(tmp_path)
+    coletados = carregar_coletados(str(tmp_path))
+
+    assert list(coletados.columns) == COLUNAS_SAIDA
+    assert COLUNAS_SAIDA[:4] == ['date', 'user', 'content', 'source']
+    assert set(coletados['source']) == {'x', 'reclameaqui'}
+    assert set(coletados['modelo']) == {'HB20', 'ONIX'}
+    # X traz o fuso e o Reclame Aqui não; a saída normaliza as duas fontes para UTC
+    assert coletados['date'].str.endswith('+00:00').all()
+    assert coletados.loc[coletados['source'] == 'reclameaqui', 'user'].isna().all()
+
+
+def test_normalizar():
+    item = {'item_id': '/x_1/', 'date': '05/03/2025', 'user': None, 'content': ' Barulho  no\nHB20 '}
+    assert normalizar(item, 'reclameaqui', 'HB20') == {
+        'date': '2025-03-05T00:00:00+00:00',
+        'user': None,
+        'content': 'Barulho no HB20',
+        'source': 'reclameaqui',
+        'modelo': 'HB20',
+        'item_id': '/x_1/',
+    }
+    assert normalizar({'item_id': '1', 'date': 'data inválida', 'content': None}, 'x', 'ONIX')['date'] is None
+    assert normalizar({'item_id': '2', 'date': '2025-03-05T10:00:00-03:00'}, 'x', 'ONIX')['date'] == '2025-03-05T13:00:00+00:00'
+
+
+def test_datas_de_fontes_diferentes_sao_gravadas(tmp_path):
+    # Mesmo caminho do dashboard: itens das duas fontes misturados, lidos por datas_para_gravar
+    _coletar_fixtures(tmp_path)
+    coletados = carregar_coletados(str(tmp_path)).sort_values('source', ascending=False)
+    datas = datas_para_gravar(coletados['date'])
+    assert None not in datas
+    assert all(data.tzinfo is None for data in datas)
+
+    # Datas sem fuso no meio de datas com fuso (arquivos anteriores à normalização) não viram NaT
+    lote = pd.Series(['2025-03-05T10:00:00+00:00', '2025-03-06T00:00:00', '2025-03-07T09:00:00-03:00', None, 'inválida'])
+    assert [d and d.isoformat() for d in datas_para_gravar(lote)] == [
+        '2025-03-05T10:00:00', '2025-03-06T00:00:00', '2025-03-07T12:00:00', None, None,
+    ]
+
+
+@pytest.mark.parametrize('modelo', ['HB20', 'hb20 sedan', 'Hb20 2020'])
+def test_modelo_com_complemento_usa_os_itens_coletados(tmp_path, monkeypatch, modelo):
+    _coletar_fixtures(tmp_path)
+    monkeypatch.setattr(coleta, 'carregar_coletados', lambda: carregar_coletados(str(tmp_path)))
+    assert chave_modelo(modelo) == 'HB20'
+
+    tweets = coleta.coletar_tweets(modelo, limite=5)
+    assert not tweets.empty
+    assert not tweets['demonstracao'].any()
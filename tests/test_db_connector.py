@@ -0,0 +1,90 @@
+# Testes da gravação de tweets processados com uma conexão falsa: só os tweets de fato
+# inseridos (chave nova) entram em tweets_resultados e nos agregados.
+
+from datetime import datetime
+
+import pandas as pd
+
+import coleta
+from db_connector import chave_tweet, insert_processed_tweets
+
+
+class CursorFalso:
+    def __init__(self, banco):
+        self.banco = banco
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql, parametros=()):
+        if 'INSERT IGNORE INTO tweets_processed' in sql:
+            chave_data = (parametros[0], parametros[2])
+            if chave_data in self.banco.chaves:
+                self.rowcount = 0
+                return
+            self.banco.chaves.add(chave_data)
+            self.lastrowid = len(self.banco.chaves)
+            self.rowcount = 1
+
+    def executemany(self, sql, linhas):
+        tabela = sql.split('INSERT INTO')[1].split()[0]
+        self.banco.gravados.setdefault(tabela, []).extend(linhas)
+
+
+class ConexaoFalsa:
+    def __init__(self):
+        self.chaves = set()
+        self.gravados = {}
+
+    def cursor(self):
+        return CursorFalso(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def _registro(texto, data=datetime(2025, 3, 5, 10, 0, 0, 123456), sentimento='POSITIVO'):
+    return ('hb20', data, '@usuario', texto, texto.lower(), sentimento, 0.9)
+
+
+def test_tweets_repetidos_nao_sao_contados_de_novo():
+    conn = ConexaoFalsa()
+    contados = []
+
+    def agregar(novos):
+        contados.extend(novos)
+        return {('HB20', 'motor', 'POSITIVO', novos[0][1].date()): len(novos)}
+
+    assert insert_processed_tweets(conn, [_registro('Motor bom'), _registro('Motor ruim', sentimento='NEGATIVO')],
+                                   classificador='bertimbau', versao='v1', agregar_aspectos=agregar) == 2
+    assert insert_processed_tweets(conn, [_registro('Motor bom'), _registro('Motor novo')],
+                                   classificador='bertimbau', versao='v1', agregar_aspectos=agregar) == 1
+
+    assert [tweet_id for tweet_id, *_ in conn.gravados['tweets_resultados']] == [1, 2, 3]
+    assert [registro[3] for registro in contados] == ['Motor bom', 'Motor ruim', 'Motor novo']
+    positivos_padrao = sum(q for (c, _, _, _, s, q) in conn.gravados['sentimentos_contagens'] if c == '' and s == 'POSITIVO')
+    assert positivos_padrao == 2
+
+
+def test_chave_usa_a_data_gravada():
+    conn = ConexaoFalsa()
+    insert_processed_tweets(conn, [_registro('Barulho')])
+    # Sem frações de segundo (DATETIME) e com o modelo em maiúsculas
+    assert conn.chaves == {(chave_tweet('HB20', datetime(2025, 3, 5, 10, 0, 0), 'Barulho'), datetime(2025, 3, 5, 10, 0, 0))}
+    assert insert_processed_tweets(conn, [_registro('Barulho', data=datetime(2025, 3, 5, 10, 0, 0))]) == 0
+
+
+def test_dados_de_demonstracao_sao_marcados(monkeypatch, tmp_path):
+    monkeypatch.setattr(coleta, 'carregar_coletados', lambda: pd.DataFrame(columns=['date', 'user', 'content', 'source', 'modelo', 'item_id']))
+    monkeypatch.chdir(tmp_path)  # sem o arquivo rotulado local: simulação
+    simulados = coleta.coletar_tweets('HB20', limite=5)
+    assert len(simulados) == 5
+    assert simulados['demonstracao'].all()
@@ -0,0 +1,78 @@
+# Testes do armazenamento de embeddings: deduplicação, ordem do top-k e releitura do índice IVF.
+
+import numpy as np
+import pytest
+
+from embeddings import EmbeddingStore
+
+DIM = 8
+
+
+def _vetores(n, semente=0):
+    return np.random.default_rng(semente).normal(size=(n, DIM)).astype(np.float32)
+
+
+def _metadados(modelo, textos):
+    return [{'modelo': modelo, 'texto': texto} for texto in textos]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EmbeddingStore(str(tmp_path), dim=DIM)
+
+
+def test_tweets_repetidos_nao_sao_armazenados(store):
+    vetores = _vetores(3)
+    assert store.adicionar(vetores, _metadados('HB20', ['a', 'b', 'a'])) == 2
+    assert store.adicionar(vetores[:2], _metadados('hb20', ['a', 'c'])) == 1
+    # O mesmo texto para outro modelo é outro tweet
+    assert store.adicionar(vetores[:1], _metadados('ONIX', ['a'])) == 1
+
+    assert len(store) == 4
+    assert store.modelos() == ['HB20', 'ONIX']
+    assert [m['texto'] for m in store.metadados(range(4))] == ['a', 'b', 'c', 'a']
+
+
+def test_vetor_com_dimensao_errada(store):
+    with pytest.raises(ValueError):
+        store.adicionar(np.zeros((1, DIM + 1)), _metadados('HB20', ['a']))
+
+
+def test_topk_em_ordem_de_similaridade(store):
+    vetores = _vetores(200)
+    store.adicionar(vetores, _metadados('HB20', [f"t{i}" for i in range(200)]))
+    consulta = _vetores(1, semente=1)[0]
+
+    resultado = store.buscar(consulta, k=5, bloco=64)
+
+    normalizados = vetores / np.linalg.norm(vetores, axis=1, keepdims=True)
+    esperados = np.argsort(-(normalizados @ (consulta / np.linalg.norm(consulta))))[:5]
+    assert [item['texto'] for item in resultado] == [f"t{i}" for i in esperados]
+    similaridades = [item['similaridade'] for item in resultado]
+    assert similaridades == sorted(similaridades, reverse=True)
+
+
+def test_filtro_por_modelo(store):
+    vetores = _vetores(20)
+    store.adicionar(vetores[:10], _metadados('HB20', [f"h{i}" for i in range(10)]))
+    store.adicionar(vetores[10:], _metadados('ONIX', [f"o{i}" for i in range(10)]))
+
+    resultado = store.buscar(vetores[3], k=20, modelo='onix')
+    assert len(resultado) == 10
+    assert all(item['modelo'] == 'ONIX' for item in resultado)
+    assert store.buscar(vetores[3], k=5, modelo='CRETA') == []
+
+
+def test_indice_treinado_por_outro_processo_e_usado(store, tmp_path):
+    vetores = _vetores(300)
+    store.adicionar(vetores, _metadados('HB20', [f"t{i}" for i in range(300)]))
+    assert store.indice is None
+
+    EmbeddingStore(str(tmp_path), dim=DIM).treinar_indice(n_listas=4, iteracoes=3)
+
+    assert store.indice is not None and store.indice.n_indexado == 300
+    # Com todas as listas sondadas, a busca pelo índice é exata
+    consulta = vetores[7]
+    com_indice = store.buscar(consulta, k=3, n_sondas=4)
+    assert [item['texto'] for item in com_indice] == [item['texto'] for item in store.buscar(consulta, k=3, usar_indice=False)]
+    assert com_indice[0]['texto'] == 't7'
@@ -0,0 +1,83 @@
+# Testes da aritmética de meses da retenção e da recusa em arquivar tweets sem contagens.
+
+from datetime import date
+
+import pytest
+
+import retencao
+from retencao import _somar_meses, corte_retencao, particoes_a_compactar, particoes_a_criar
+
+
+def _particoes(*limites):
+    """Partições no formato de listar_particoes: p_antigo, meses e p_futuro (MAXVALUE)."""
+    particoes = [('p_antigo', limites[0], 0)]
+    particoes += [(f"p{_somar_meses(limite, -1):%Y%m}", limite, 10) for limite in limites[1:]]
+    return particoes + [('p_futuro', None, 0)]
+
+
+@pytest.mark.parametrize('dia, meses, esperado', [
+    (date(2026, 10, 19), 0, date(2026, 10, 1)),
+    (date(2026, 10, 19), 3, date(2027, 1, 1)),
+    (date(2026, 12, 31), 1, date(2027, 1, 1)),
+    (date(2026, 1, 15), -1, date(2025, 12, 1)),
+    (date(2026, 10, 19), -12, date(2025, 10, 1)),
+    (date(2026, 3, 1), -27, date(2023, 12, 1)),
+])
+def test_somar_meses(dia, meses, esperado):
+    assert _somar_meses(dia, meses) == esperado
+
+
+def test_corte_retencao():
+    assert corte_retencao(date(2026, 10, 19), 12) == date(2025, 10, 1)
+    assert corte_retencao(date(2026, 1, 1), 1) == date(2025, 12, 1)
+
+
+def test_particoes_a_compactar():
+    particoes = _particoes(date(2025, 9, 1), date(2025, 10, 1), date(2025, 11, 1), date(2025, 12, 1))
+    # p202509 termina em 2025-10-01 (o corte) e sai; p202510 ainda tem dias depois dele
+    assert particoes_a_compactar(particoes, date(2025, 10, 1)) == [
+        ('p_antigo', date(2025, 9, 1)),
+        ('p202509', date(2025, 10, 1)),
+    ]
+    assert particoes_a_compactar(particoes, date(2025, 8, 1)) == []
+
+
+def test_particoes_a_criar_na_virada_do_ano():
+    particoes = _particoes(date(2024, 1, 1), date(2026, 12, 1), date(2027, 1, 1))
+    # Em 2026-10-19, com 3 meses à frente, é preciso ter partições até janeiro de 2027 inclusive
+    assert particoes_a_criar(particoes, date(2026, 10, 19), 3) == [('p202701', date(2027, 2, 1))]
+    assert particoes_a_criar(particoes, date(2026, 12, 5), 3) == [
+        ('p202701', date(2027, 2, 1)),
+        ('p202702', date(2027, 3, 1)),
+        ('p202703', date(2027, 4, 1)),
+    ]
+
+
+def test_particoes_a_criar_sem_falta_ou_sem_limites():
+    particoes = _particoes(date(2024, 1, 1), date(2026, 12, 1), date(2027, 1, 1))
+    assert particoes_a_criar(particoes, date(2026, 9, 1), 3) == []
+    assert particoes_a_criar([('p_futuro', None, 0)], date(2026, 10, 19), 3) == []
+
+
+def test_retencao_recusa_particao_sem_contagens(monkeypatch):
+    particoes = _particoes(date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1))
+    destacadas = []
+    monkeypatch.setattr(retencao, 'listar_particoes', lambda conn, tabela: particoes)
+    monkeypatch.setattr(retencao, '_lotes_pendentes', lambda cur, tabela: [])
+    monkeypatch.setattr(retencao, '_tem_linhas', lambda cur, tabela, particao: True)
+    monkeypatch.setattr(retencao, 'dias_sem_contagem', lambda conn, origem: [('HB20', date(2025, 1, 7))])
+    monkeypatch.setattr(retencao, 'destacar_particao', lambda conn, tabela, particao: destacadas.append(particao))
+
+    class Conexao:
+        def cursor(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+    with pytest.raises(RuntimeError, match='004'):
+        retencao.aplicar_retencao(Conexao(), 'tweets_processed', meses=12, hoje=date(2026, 10, 19))
+    assert destacadas == []
@@ -0,0 +1,119 @@
+# Testes do Coalescedor do serviço de inferência: fechamento dos micro-lotes por tamanho e
+# por prazo, e entrega dos resultados (ou do erro) a cada requisição do lote.
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from servidor_inferencia import Coalescedor, MetricasServico
+
+
+class FuncaoLote:
+    """Registra os lotes recebidos e devolve cada texto em maiúsculas."""
+
+    def __init__(self, falhar_com=None):
+        self.lotes = []
+        self.falhar_com = falhar_com
+
+    def __call__(self, textos):
+        self.lotes.append(list(textos))
+        if self.falhar_com and self.falhar_com in textos:
+            raise RuntimeError("falha no lote")
+        return [texto.upper() for texto in textos]
+
+
+def _executar(funcao, corotina, **parametros):
+    async def principal():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            coalescedor = Coalescedor(funcao, executor, MetricasServico(), **parametros)
+            coalescedor.iniciar()
+            try:
+                return await corotina(coalescedor)
+            finally:
+                await coalescedor.encerrar()
+    return asyncio.run(principal())
+
+
+def test_lote_fecha_no_tamanho_maximo():
+    funcao = FuncaoLote()
+
+    async def enviar(coalescedor):
+        return await asyncio.gather(*(coalescedor.submeter(f"t{i}") for i in range(10)))
+
+    resultados = _executar(funcao, enviar, tamanho_max=4, espera_max_ms=100)
+
+    assert resultados == [f"T{i}" for i in range(10)]
+    assert [len(lote) for lote in funcao.lotes] == [4, 4, 2]
+    assert [texto for lote in funcao.lotes for texto in lote] == [f"t{i}" for i in range(10)]
+
+
+def test_lote_incompleto_fecha_no_prazo():
+    funcao = FuncaoLote()
+    espera_ms = 50
+
+    async def enviar(coalescedor):
+        inicio = time.perf_counter()
+        resultado = await coalescedor.submeter('sozinho')
+        return resultado, time.perf_counter() - inicio
+
+    resultado, duracao = _executar(funcao, enviar, tamanho_max=32, espera_max_ms=espera_ms)
+
+    assert resultado == 'SOZINHO'
+    assert funcao.lotes == [['sozinho']]
+    assert espera_ms / 1000 * 0.9 <= duracao < 1.0
+
+
+def test_chegadas_dentro_do_prazo_entram_no_mesmo_lote():
+    funcao = FuncaoLote()
+
+    async def enviar(coalescedor):
+        primeira = asyncio.create_task(coalescedor.submeter('a'))
+        await asyncio.sleep(0.02)
+        segunda = asyncio.create_task(coalescedor.submeter('b'))
+        await asyncio.gather(primeira, segunda)
+        # Depois de o lote fechar, um novo texto abre outro lote
+        return await coalescedor.submeter('c')
+
+    assert _executar(funcao, enviar, tamanho_max=32, espera_max_ms=150) == 'C'
+    assert funcao.lotes == [['a', 'b'], ['c']]
+
+
+def test_erro_do_lote_chega_a_todas_as_requisicoes():
+    funcao = FuncaoLote(falhar_com='ruim')
+
+    async def enviar(coalescedor):
+        lote = await asyncio.gather(coalescedor.submeter('ok'), coalescedor.submeter('ruim'), return_exceptions=True)
+        # O laço continua atendendo depois da falha
+        return lote, await coalescedor.submeter('depois')
+
+    lote, depois = _executar(funcao, enviar, tamanho_max=2, espera_max_ms=50)
+
+    assert all(isinstance(erro, RuntimeError) for erro in lote)
+    assert depois == 'DEPOIS'
+
+
+def test_metricas_registram_o_tamanho_dos_lotes():
+    metricas = MetricasServico()
+
+    async def principal():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            coalescedor = Coalescedor(FuncaoLote(), executor, metricas, tamanho_max=3, espera_max_ms=20)
+            coalescedor.iniciar()
+            await asyncio.gather(*(coalescedor.submeter(str(i)) for i in range(5)))
+            await coalescedor.encerrar()
+
+    asyncio.run(principal())
+    assert metricas.tamanhos_lote == {3: 1, 2: 1}
+
+
+@pytest.mark.parametrize('tamanho_max', [1, 2])
+def test_tamanho_maximo_pequeno(tamanho_max):
+    funcao = FuncaoLote()
+
+    async def enviar(coalescedor):
+        return await asyncio.gather(*(coalescedor.submeter(f"t{i}") for i in range(4)))
+
+    assert _executar(funcao, enviar, tamanho_max=tamanho_max, espera_max_ms=100) == ['T0', 'T1', 'T2', 'T3']
+    assert all(len(lote) <= tamanho_max for lote in funcao.lotes)